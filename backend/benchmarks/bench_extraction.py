@@ -0,0 +1,79 @@
+"""
+Compare targeted price extraction against the BeautifulSoup html.parser path.
+
+Runs over saved platform pages (``<platform>.html`` files, e.g. saved from a
+browser) or, when no directory is given, over a synthetic page with the price
+node placed after a large amount of unrelated markup.
+
+    cd backend && python -m benchmarks.bench_extraction --pages ~/saved-pages
+"""
+import argparse
+import timeit
+from pathlib import Path
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from scrapers.extraction import PLATFORM_SELECTORS, extract_text
+
+# Selectors the scrapers used before the extraction layer, as (tag, class)
+LEGACY_SELECTORS = {
+    "Paytm Gold": ("span", "gold-price"),
+    "Tanishq": ("div", "gold-rate-today"),
+}
+
+
+def synthetic_page(filler_blocks: int = 2000) -> str:
+    filler = "".join(
+        f'<div class="card"><h3>Item {i}</h3><p>Lorem ipsum <a href="/p/{i}">link</a></p></div>'
+        for i in range(filler_blocks)
+    )
+    return (
+        "<html><head><title>Gold rate</title></head><body>"
+        f"{filler}<span class=\"label gold-price\">&#8377; 6,720.00</span>{filler}"
+        "</body></html>"
+    )
+
+
+def load_pages(directory: str) -> Dict[str, str]:
+    pages = {}
+    for path in sorted(Path(directory).glob("*.html")):
+        platform = path.stem.replace("_", " ")
+        pages[platform] = path.read_text(encoding="utf-8", errors="replace")
+    return pages
+
+
+def legacy_extract(page: str, tag: str, css_class: str):
+    soup = BeautifulSoup(page, "html.parser")
+    element = soup.find(tag, class_=css_class)
+    return element.get_text() if element else None
+
+
+def bench(page: str, selectors: List[str], tag: str, css_class: str, number: int):
+    legacy = timeit.timeit(lambda: legacy_extract(page, tag, css_class), number=number) / number
+    targeted = timeit.timeit(lambda: extract_text(page, selectors), number=number) / number
+    return legacy, targeted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", help="directory of saved <platform>.html pages")
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = load_pages(args.pages)
+    else:
+        pages = {"Paytm Gold": synthetic_page()}
+
+    print(f"{'platform':<20}{'size KB':>10}{'bs4 ms':>12}{'targeted ms':>14}{'speedup':>10}")
+    for platform, page in pages.items():
+        if platform not in LEGACY_SELECTORS:
+            print(f"{platform:<20} skipped: no selectors registered")
+            continue
+        tag, css_class = LEGACY_SELECTORS[platform]
+        legacy, targeted = bench(page, PLATFORM_SELECTORS[platform], tag, css_class, args.number)
+        print(
+            f"{platform:<20}{len(page) / 1024:>10.1f}{legacy * 1000:>12.3f}"
+            f"{targeted * 1000:>14.3f}{legacy / targeted:>9.1f}x"
+        )
@@ -0,0 +1,97 @@
+"""
+Measure /api/gold-prices requests per second, per-request models versus pre-encoded bytes.
+
+"models" serves the snapshot the previous way: each request builds
+GoldPriceResponse models and FastAPI validates them against the response
+model and JSON-encodes them. "bytes" is the current endpoint, returning the
+orjson bodies encoded once per snapshot. Requests go straight to the ASGI
+apps, so no network or client cost is counted. Point --database-url at a
+scratch database.
+
+    cd backend && python -m benchmarks.bench_gold_prices --database-url sqlite:///bench.db
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import datetime
+from typing import List
+
+
+async def call(app, path: str, query: str) -> bytes:
+    """Run one GET request through an ASGI app and return its body"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def requests_per_second(app, path: str, query: str, requests: int) -> float:
+    for _ in range(50):
+        await call(app, path, query)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path, query)
+    return requests / (time.perf_counter() - start)
+
+
+def previous_app(main, GoldPriceResponse):
+    """The endpoint as it served prices before bodies were pre-encoded"""
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    @app.get("/api/gold-prices", response_model=List[GoldPriceResponse])
+    def get_gold_prices(gold_type: str = "both"):
+        snapshot = main.price_cache.get()
+        return [GoldPriceResponse.from_gold_price(p) for p in main.filter_prices(snapshot.prices, gold_type)]
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--platforms", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    # database.db binds its engine at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    from models.gold_price import GoldPrice, GoldPriceResponse
+    import main
+
+    main.price_cache.publish([
+        GoldPrice(platform=f"bench-{i}", type=random.choice(("physical", "digital")),
+                  price_per_gram=round(random.uniform(5800, 6400), 2), making_charges=round(random.uniform(0, 400), 2),
+                  gst=3.0, features=["Insured storage", "Instant buy"], timestamp=datetime.now())
+        for i in range(args.platforms)
+    ])
+    before = previous_app(main, GoldPriceResponse)
+
+    async def run():
+        print(f"{'gold_type':<10}{'models req/s':>14}{'bytes req/s':>13}{'speedup':>9}{'bytes':>8}")
+        for gold_type in ("both", "physical", "digital"):
+            query = f"gold_type={gold_type}"
+            old_body = await call(before, "/api/gold-prices", query)
+            new_body = await call(main.app, "/api/gold-prices", query)
+            assert json.loads(old_body) == json.loads(new_body), "payloads differ"
+            old = await requests_per_second(before, "/api/gold-prices", query, args.requests)
+            new = await requests_per_second(main.app, "/api/gold-prices", query, args.requests)
+            print(f"{gold_type:<10}{old:>14.0f}{new:>13.0f}{new / old:>8.1f}x{len(new_body):>8}")
+
+    asyncio.run(run())
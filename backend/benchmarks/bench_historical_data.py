@@ -0,0 +1,77 @@
+"""
+Measure /api/historical-data response size and latency for every period.
+
+Synthetic hourly (last year) and daily (five years) rollups are written for a
+"bench-history" platform, requested with and without downsampling, and
+deleted afterwards. Point --database-url at a scratch database.
+
+    cd backend && python -m benchmarks.bench_historical_data --database-url sqlite:///bench.db
+"""
+import argparse
+import math
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+PLATFORM = "bench-history"
+PERIODS = ["30d", "6m", "1y", "5y"]
+
+
+def make_buckets(granularity: str, step: timedelta, count: int, end: datetime):
+    price = 6000.0
+    buckets = []
+    for i in range(count):
+        start = end - step * (count - i)
+        price += random.gauss(0, 4) + 2 * math.sin(i / 50)
+        high, low = price + random.random() * 10, price - random.random() * 10
+        buckets.append({
+            "granularity": granularity, "platform": PLATFORM, "bucket_start": start,
+            "open": price, "high": high, "low": low, "close": price,
+            "price_sum": price * 12, "tick_count": 12, "open_at": start, "close_at": start,
+        })
+    return buckets
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--repeat", type=int, default=20, help="warm (cached) requests per case")
+    args = parser.parse_args()
+
+    # database.db binds its engine at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    from fastapi.testclient import TestClient
+    from database.db import get_db_connection
+    from database.rollups import PriceRollupDB
+    import main
+
+    end = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    db = get_db_connection()
+    try:
+        db.execute(PriceRollupDB.__table__.insert(), make_buckets("hour", timedelta(hours=1), 365 * 24, end))
+        db.execute(PriceRollupDB.__table__.insert(), make_buckets("day", timedelta(days=1), 5 * 365, end))
+        db.commit()
+
+        client = TestClient(main.app)
+        print(f"{'period':<7}{'max_points':>11}{'source':>8}{'points':>8}{'bytes':>10}{'cold ms':>10}{'warm ms':>10}")
+        for period in PERIODS:
+            for max_points in (0, 500):
+                params = {"period": period, "platform": PLATFORM, "max_points": max_points}
+                main.history_cache.clear()
+                started = time.perf_counter()
+                response = client.get("/api/historical-data", params=params)
+                cold = time.perf_counter() - started
+
+                started = time.perf_counter()
+                for _ in range(args.repeat):
+                    client.get("/api/historical-data", params=params)
+                warm = (time.perf_counter() - started) / args.repeat
+
+                body = response.json()
+                print(f"{period:<7}{max_points:>11}{body['source_points']:>8}{body['total_points']:>8}"
+                      f"{len(response.content):>10,}{cold * 1000:>10.2f}{warm * 1000:>10.2f}")
+    finally:
+        db.query(PriceRollupDB).filter(PriceRollupDB.platform == PLATFORM).delete(synchronize_session=False)
+        db.commit()
+        db.close()
@@ -0,0 +1,99 @@
+"""
+Compare the vectorized indicators in utils/calculations.py with the original loops.
+
+Runs on a synthetic geometric random walk of 2-decimal prices at each size and
+checks the outputs are identical. "array s" is the NumPy core alone on an
+ndarray, without list conversion and rounding. Loops over --loop-limit points
+are timed on a prefix and extrapolated linearly.
+
+    cd backend && python -m benchmarks.bench_indicators
+    cd backend && python -m benchmarks.bench_indicators --sizes 1000,100000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from utils.calculations import calculate_moving_average, calculate_rsi, calculate_volatility
+from utils.indicators import returns, rolling_mean, rsi
+
+
+def loop_moving_average(prices, window):
+    if len(prices) < window:
+        return prices
+    moving_averages = []
+    for i in range(len(prices)):
+        if i < window - 1:
+            moving_averages.append(prices[i])
+        else:
+            moving_averages.append(round(sum(prices[i-window+1:i+1]) / window, 2))
+    return moving_averages
+
+
+def loop_rsi(prices, period=14):
+    if len(prices) < period + 1:
+        return [50.0] * len(prices)
+    gains, losses = [], []
+    for i in range(1, len(prices)):
+        change = prices[i] - prices[i-1]
+        gains.append(change if change > 0 else 0)
+        losses.append(0 if change > 0 else abs(change))
+    rsi_values = []
+    for i in range(len(gains)):
+        if i < period - 1:
+            rsi_values.append(50.0)
+        else:
+            avg_gain = sum(gains[i-period+1:i+1]) / period
+            avg_loss = sum(losses[i-period+1:i+1]) / period
+            rsi = 100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss))
+            rsi_values.append(round(rsi, 2))
+    return rsi_values
+
+
+def loop_volatility(prices):
+    returns = []
+    for i in range(1, len(prices)):
+        returns.append((prices[i] - prices[i-1]) / prices[i-1])
+    return round(np.std(returns) * 100, 2)
+
+
+# (name, original loop, list-in/list-out replacement, array-only core)
+CASES = [
+    ("moving_average(20)", lambda p: loop_moving_average(p, 20), lambda p: calculate_moving_average(p, 20),
+     lambda a: rolling_mean(a, 20)),
+    ("rsi(14)", lambda p: loop_rsi(p, 14), lambda p: calculate_rsi(p, 14), lambda a: rsi(a, 14)),
+    ("volatility", loop_volatility, calculate_volatility, lambda a: np.std(returns(a))),
+]
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,100000,10000000")
+    parser.add_argument("--loop-limit", type=int, default=1000000,
+                        help="points timed through the loops (larger sizes are extrapolated)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'indicator':<20}{'points':>12}{'loop s':>12}{'vector s':>12}{'speedup':>10}{'array s':>12}  identical")
+    for size in (int(s) for s in args.sizes.split(",")):
+        prices = np.round(6000 * np.exp(np.cumsum(rng.normal(0, 0.0005, size))), 2).tolist()
+        array = np.asarray(prices)
+        looped = prices[:min(size, args.loop_limit)]
+        for name, loop, vectorized, core in CASES:
+            expected, loop_seconds = timed(loop, looped)
+            loop_seconds *= size / len(looped)
+            result, vector_seconds = timed(vectorized, prices)
+            _, core_seconds = timed(core, array)
+            if isinstance(result, list):
+                identical = result[:len(expected)] == expected
+            else:
+                identical = vectorized(looped) == expected
+            suffix = "" if len(looped) == size else " (loop extrapolated)"
+            print(f"{name:<20}{size:>12,}{loop_seconds:>12.4f}{vector_seconds:>12.4f}"
+                  f"{loop_seconds / vector_seconds:>9.0f}x{core_seconds:>12.4f}  {identical}{suffix}")
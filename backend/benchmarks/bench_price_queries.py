@@ -0,0 +1,127 @@
+"""
+Time the gold_prices read paths on a large synthetic table.
+
+Loads --rows synthetic ticks (22 platforms, 5-minute spacing going back in
+time) into a scratch database, then compares the old LIKE date filter with
+the half-open timestamp range and times the latest-prices query. Query plans
+are printed so index use can be checked.
+
+    cd backend && python -m benchmarks.bench_price_queries --database-url sqlite:///bench.db --rows 10000000
+
+With --partitioned (PostgreSQL) gold_prices is created partitioned by month;
+its DDL is printed and checked to generate ids before loading.
+
+    cd backend && python -m benchmarks.bench_price_queries --database-url postgresql://... --partitioned
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+PLATFORMS = [f"Platform {i:02d}" for i in range(22)]
+
+
+def load_rows(db, total, chunk=50000):
+    from sqlalchemy import insert
+    from database.db import GoldPriceDB
+
+    end = datetime(2026, 1, 1)
+    steps = total // len(PLATFORMS) + 1
+    price = 6700.0
+    inserted = 0
+    started = time.perf_counter()
+    rows = []
+    for step in range(steps):
+        timestamp = end - timedelta(minutes=5 * step)
+        price += random.uniform(-2, 2)
+        for platform in PLATFORMS:
+            rows.append({
+                "platform": platform,
+                "type": "digital",
+                "price_per_gram": round(price, 2),
+                "making_charges": 0.0,
+                "gst": 3.0,
+                "features": "[]",
+                "timestamp": timestamp,
+                "last_confirmed_at": timestamp,
+                "is_active": True,
+            })
+            if len(rows) >= chunk or inserted + len(rows) >= total:
+                db.execute(insert(GoldPriceDB), rows)
+                db.commit()
+                inserted += len(rows)
+                rows = []
+                if inserted >= total:
+                    print(f"loaded {inserted:,} rows in {time.perf_counter() - started:.1f}s")
+                    return end - timedelta(minutes=5 * step), end
+    return end - timedelta(minutes=5 * steps), end
+
+
+def timed(label, func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<40}{best * 1000:>10.2f} ms")
+    return result
+
+
+def explain(db, statement):
+    from sqlalchemy import text
+
+    prefix = "EXPLAIN QUERY PLAN " if db.bind.dialect.name == "sqlite" else "EXPLAIN "
+    compiled = statement.compile(db.bind, compile_kwargs={"literal_binds": True})
+    for row in db.execute(text(prefix + str(compiled))):
+        print("    " + " | ".join(str(c) for c in row))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--skip-load", action="store_true", help="reuse rows from a previous run")
+    parser.add_argument("--partitioned", action="store_true", help="create gold_prices partitioned (PostgreSQL, new database)")
+    args = parser.parse_args()
+
+    # database.db binds its engine at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    if args.partitioned:
+        os.environ["PARTITION_GOLD_PRICES"] = "true"
+    from sqlalchemy import select
+    from sqlalchemy.schema import CreateTable
+    from database.db import GoldPriceDB, engine, get_db_connection, get_latest_prices, day_range
+
+    if args.partitioned:
+        ddl = str(CreateTable(GoldPriceDB.__table__).compile(dialect=engine.dialect))
+        print(ddl)
+        # Inserts leave id out, so the partitioned table must still generate it
+        assert "PARTITION BY" in ddl and "SERIAL" in ddl, "partitioned gold_prices does not generate ids"
+
+    db = get_db_connection()
+    if not args.skip_load:
+        load_rows(db, args.rows)
+
+    oldest = db.query(GoldPriceDB.timestamp).order_by(GoldPriceDB.timestamp).first()[0]
+    day = (oldest + (datetime(2026, 1, 1) - oldest) / 2).strftime("%Y-%m-%d")
+    start, end = day_range(day)
+
+    like_query = select(GoldPriceDB.price_per_gram).where(GoldPriceDB.timestamp.like(f"{day}%"))
+    range_query = select(GoldPriceDB.price_per_gram).where(GoldPriceDB.timestamp >= start, GoldPriceDB.timestamp < end)
+    platform_query = range_query.where(GoldPriceDB.platform == PLATFORMS[0])
+
+    print(f"\nqueries for {day}")
+    like_rows = timed("LIKE date filter", lambda: db.execute(like_query).all(), repeat=1)
+    range_rows = timed("half-open range", lambda: db.execute(range_query).all())
+    timed("half-open range, one platform", lambda: db.execute(platform_query).all())
+    timed("get_latest_prices(limit=22)", lambda: get_latest_prices(db, limit=22))
+    print(f"rows matched: LIKE {len(like_rows)}, range {len(range_rows)}")
+
+    print("\nplan: LIKE date filter")
+    explain(db, like_query)
+    print("plan: half-open range")
+    explain(db, range_query)
+    print("plan: half-open range, one platform")
+    explain(db, platform_query)
+    db.close()
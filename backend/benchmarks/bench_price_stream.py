@@ -0,0 +1,134 @@
+"""
+Load test /api/stream/prices with many concurrent subscribers.
+
+The API runs under uvicorn in a background thread. --subscribers clients
+connect, synthetic snapshots in which one platform's price moves are
+published, and the time from publish to each client receiving the event is
+reported. Point --database-url at a scratch database.
+
+    cd backend && python -m benchmarks.bench_price_stream --database-url sqlite:///bench.db --subscribers 1000
+"""
+import argparse
+import asyncio
+import os
+import random
+import resource
+import statistics
+import threading
+import time
+from datetime import datetime
+
+PLATFORMS = ["bench-a", "bench-b", "bench-c", "bench-d", "bench-e", "bench-f"]
+
+
+def raise_open_file_limit(needed: int):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+
+
+def make_prices(GoldPrice, prices):
+    return [
+        GoldPrice(platform=platform, type="digital", price_per_gram=price,
+                  making_charges=0.0, gst=3.0, features=[], timestamp=datetime.now())
+        for platform, price in prices.items()
+    ]
+
+
+async def subscribe(client, url, received, connected, ready):
+    """Read one SSE stream, recording when each event id arrives"""
+    async with client.stream("GET", url) as response:
+        connected.append(time.perf_counter())
+        buffer = ""
+        async for chunk in response.aiter_text():
+            buffer += chunk
+            while "\n\n" in buffer:
+                message, buffer = buffer.split("\n\n", 1)
+                if message.startswith("id: "):
+                    version = int(message[4:message.index("\n")].rpartition(":")[2])
+                    received.setdefault(version, []).append(time.perf_counter())
+                    if "event: snapshot" in message:
+                        ready.release()
+
+
+async def run(args, main, GoldPrice):
+    import httpx
+
+    base = f"http://127.0.0.1:{args.port}"
+    prices = {platform: 6000.0 + i for i, platform in enumerate(PLATFORMS)}
+    main.price_cache.publish(make_prices(GoldPrice, prices))
+
+    received, connected, published = {}, [], {}
+    ready = asyncio.Semaphore(0)
+    limits = httpx.Limits(max_connections=args.subscribers + 10, max_keepalive_connections=0)
+    async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+        start = time.perf_counter()
+        tasks = [
+            asyncio.create_task(subscribe(client, f"{base}/api/stream/prices", received, connected, ready))
+            for _ in range(args.subscribers)
+        ]
+        for _ in range(args.subscribers):
+            await ready.acquire()
+        connect_seconds = time.perf_counter() - start
+        stats = (await client.get(f"{base}/api/stream/stats")).json()
+
+        for _ in range(args.events):
+            platform = random.choice(PLATFORMS)
+            prices[platform] += random.choice((-1, 1)) * random.uniform(0.5, 5)
+            snapshot = await asyncio.to_thread(main.price_cache.publish, make_prices(GoldPrice, prices))
+            published[snapshot.version] = time.perf_counter()
+            await asyncio.sleep(args.interval)
+
+        # Let the last event drain
+        await asyncio.sleep(1)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    latencies = [
+        (at - published[version]) * 1000
+        for version, times in received.items() if version in published
+        for at in times
+    ]
+    delivered = sum(len(received.get(version, [])) for version in published)
+    expected = args.subscribers * len(published)
+    print(f"subscribers      {args.subscribers} (server saw {stats['subscribers']})")
+    print(f"connect          {connect_seconds:.2f}s for all snapshots to arrive")
+    print(f"events           {len(published)} published, {delivered}/{expected} delivered")
+    if latencies:
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"latency ms       p50 {statistics.median(latencies):.1f}  p99 {p99:.1f}  max {latencies[-1]:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=20, help="snapshots published")
+    parser.add_argument("--interval", type=float, default=0.25, help="seconds between snapshots")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    # database.db binds its engine at import time; keep the stream's refresh
+    # ticker from scraping real platforms during the run
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("PRICE_CACHE_TTL", "3600")
+    raise_open_file_limit(2 * args.subscribers + 256)
+
+    import uvicorn
+    from models.gold_price import GoldPrice
+    import main
+
+    server = uvicorn.Server(uvicorn.Config(main.app, port=args.port, log_level="warning",
+                                           backlog=args.subscribers + 128))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        asyncio.run(run(args, main, GoldPrice))
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
@@ -0,0 +1,90 @@
+"""
+Exercise the async scrape engine against a local stub HTTP server.
+
+Every platform is served by the stub with its own artificial latency, so the
+run shows concurrency, per-platform timeouts and the overall deadline at work.
+
+    cd backend && python -m benchmarks.bench_scrape_engine --platforms 20 --slow 3
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from models.gold_price import GoldPrice
+from scrapers.engine import ScrapeEngine
+from scrapers.gold_scraper import GoldScraper
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves a minimal price page after ``?delay=`` seconds"""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        time.sleep(float(query.get("delay", ["0"])[0]))
+        price = 6700 + random.randint(-30, 30)
+        body = f'<html><body><span class="gold-price">&#8377;{price:,}.00</span></body></html>'.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(args):
+    server = start_stub_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    engine = ScrapeEngine(
+        max_concurrency=args.concurrency,
+        platform_timeout=args.timeout,
+        deadline=args.deadline,
+    )
+
+    async with GoldScraper(engine=engine) as scraper:
+        def make_job(name: str, delay: float):
+            async def job() -> GoldPrice:
+                html = await scraper.scrape_with_requests(f"{base_url}/{name}?delay={delay}")
+                return GoldPrice(
+                    platform=name,
+                    type="digital",
+                    price_per_gram=scraper.extract_price_from_text(html),
+                    timestamp=datetime.now(),
+                )
+            return job
+
+        jobs = {}
+        for i in range(args.platforms):
+            slow = i < args.slow
+            delay = args.timeout * 2 if slow else random.uniform(0.05, 0.3)
+            jobs[f"platform-{i:02d}"] = make_job(f"platform-{i:02d}", delay)
+
+        report = await engine.run(jobs)
+
+    server.shutdown()
+    print(json.dumps(report.summary(), indent=2))
+    sequential = sum(r.latency for r in report.results)
+    print(f"\nwall clock {report.elapsed:.2f}s vs {sequential:.2f}s of summed platform latency")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--platforms", type=int, default=20)
+    parser.add_argument("--slow", type=int, default=2, help="platforms that exceed the timeout")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--deadline", type=float, default=3.0)
+    asyncio.run(run(parser.parse_args()))
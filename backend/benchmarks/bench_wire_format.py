@@ -0,0 +1,115 @@
+"""
+Measure /api/historical-data and /api/compare payload size and latency per wire format and content coding.
+
+Uses the synthetic rollups of bench_historical_data (hourly for the last
+year, daily for five years) on a "bench-history" platform, deleted
+afterwards. Every compact payload is decoded back to the JSON shape
+and checked against the JSON one. Point --database-url at a scratch
+database.
+
+    cd backend && python -m benchmarks.bench_wire_format --database-url sqlite:///bench.db
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from benchmarks.bench_historical_data import PERIODS, PLATFORM, make_buckets
+
+VARIANTS = [("json", "identity"), ("json", "gzip"), ("json", "br"),
+            ("compact", "identity"), ("compact", "gzip"), ("compact", "br")]
+
+
+def decode_history(payload: dict) -> list:
+    """Rebuild the JSON points from a compact history payload"""
+    columns, scale = payload["columns"], payload["scale"]
+    dates = [datetime(1970, 1, 1) + timedelta(seconds=s) for s in accumulate(columns["date"])]
+    values = {name: [v / scale for v in accumulate(columns[name])] for name in ("price", "open", "high", "low", "close")}
+    return [
+        {"date": date.isoformat(), **{name: values[name][i] for name in values}}
+        for i, date in enumerate(dates)
+    ]
+
+
+def check_history(json_points: list, compact_points: list):
+    assert len(json_points) == len(compact_points), "point counts differ"
+    for expected, actual in zip(json_points, compact_points):
+        assert expected["date"] == actual["date"] and expected["price"] == actual["price"], (expected, actual)
+        for name in ("open", "high", "low", "close"):
+            assert abs(expected[name] - actual[name]) <= 0.005 + 1e-9, (name, expected, actual)
+
+
+def measure(client, path, params, encoding, repeat, clear):
+    """(wire bytes, cold ms, warm ms, decoded body) of one request variant"""
+    headers = {"Accept-Encoding": encoding}
+    clear()
+    started = time.perf_counter()
+    response = client.get(path, params=params, headers=headers)
+    cold = time.perf_counter() - started
+    assert response.headers.get("content-encoding", "identity") in (encoding, "identity")
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        client.get(path, params=params, headers=headers)
+    warm = (time.perf_counter() - started) / repeat
+    return int(response.headers["content-length"]), cold * 1000, warm * 1000, response.json()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--repeat", type=int, default=20, help="warm (cached) requests per case")
+    args = parser.parse_args()
+
+    # database.db binds its engine at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    from fastapi.testclient import TestClient
+    from database.db import get_db_connection
+    from database.rollups import PriceRollupDB
+    from models.gold_price import GoldPrice
+    import main
+
+    end = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    db = get_db_connection()
+    try:
+        db.execute(PriceRollupDB.__table__.insert(), make_buckets("hour", timedelta(hours=1), 365 * 24, end))
+        db.execute(PriceRollupDB.__table__.insert(), make_buckets("day", timedelta(days=1), 5 * 365, end))
+        db.commit()
+        client = TestClient(main.app)
+
+        print(f"{'period':<7}{'max_points':>11}{'points':>8}  {'format':<9}{'coding':<10}"
+              f"{'bytes':>10}{'ratio':>8}{'cold ms':>10}{'warm ms':>10}")
+        for period in PERIODS:
+            for max_points in (0, 500):
+                params = {"period": period, "platform": PLATFORM, "max_points": max_points}
+                baseline, json_points = None, None
+                for format, encoding in VARIANTS:
+                    size, cold, warm, body = measure(client, "/api/historical-data", {**params, "format": format},
+                                                     encoding, args.repeat, main.history_cache.clear)
+                    if json_points is None:
+                        baseline, json_points = size, body["data"]
+                    elif format == "compact":
+                        check_history(json_points, decode_history(body))
+                    print(f"{period:<7}{max_points:>11}{body['total_points']:>8}  {format:<9}{encoding:<10}"
+                          f"{size:>10,}{baseline / size:>7.1f}x{cold:>10.2f}{warm:>10.2f}")
+
+        main.price_cache.publish([
+            GoldPrice(platform=f"bench-{i}", type=random.choice(("physical", "digital")),
+                      price_per_gram=round(random.uniform(5800, 6400), 2),
+                      making_charges=round(random.uniform(0, 400), 2), gst=3.0,
+                      features=["Insured storage", "Instant buy"], timestamp=datetime.now())
+            for i in range(20)
+        ])
+        print(f"\n{'compare':<26}{'format':<9}{'coding':<10}{'bytes':>10}{'ratio':>8}{'warm ms':>10}")
+        baseline = None
+        for format, encoding in VARIANTS:
+            size, _, warm, body = measure(client, "/api/compare", {"weight": 10, "format": format},
+                                          encoding, args.repeat, lambda: None)
+            baseline = baseline or size
+            print(f"{'20 platforms':<26}{format:<9}{encoding:<10}{size:>10,}{baseline / size:>7.1f}x{warm:>10.2f}")
+    finally:
+        db.query(PriceRollupDB).filter(PriceRollupDB.platform == PLATFORM).delete(synchronize_session=False)
+        db.commit()
+        db.close()
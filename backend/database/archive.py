@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+
+import pyarrow as pa
+
+from database.db import GoldPriceDB, HistoricalPriceDB, get_db_connection
+from utils.price_archive import (
+    PART_PATTERN, PRICE_ARCHIVE_DIR, month_key, open_arrow, partition_dir,
+    partition_files, write_arrow,
+)
+
+# gold_prices rows read from the database per archive batch
+ARCHIVE_BATCH_ROWS = int(os.getenv("ARCHIVE_BATCH_ROWS", "100000"))
+
+GOLD_PRICE_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("timestamp", pa.timestamp("us")),
+    ("platform", pa.string()),
+    ("type", pa.string()),
+    ("price_per_gram", pa.float64()),
+    ("making_charges", pa.float64()),
+    ("gst", pa.float64()),
+])
+
+HISTORICAL_PRICE_SCHEMA = pa.schema([
+    ("timestamp", pa.timestamp("us")),
+    ("platform", pa.string()),
+    ("average_price", pa.float64()),
+    ("highest_price", pa.float64()),
+    ("lowest_price", pa.float64()),
+    ("volume", pa.int64()),
+])
+
+
+def _manifest_path(root: str) -> str:
+    return os.path.join(root, "manifest.json")
+
+
+def load_manifest(root: str) -> dict:
+    try:
+        with open(_manifest_path(root)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"gold_prices_last_id": 0}
+
+
+def save_manifest(root: str, manifest: dict):
+    os.makedirs(root, exist_ok=True)
+    tmp_path = _manifest_path(root) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, _manifest_path(root))
+
+
+def _sorted_table(columns: dict, schema: pa.Schema) -> pa.Table:
+    table = pa.Table.from_pydict(columns, schema=schema)
+    return table.sort_by("timestamp").combine_chunks()
+
+
+def archive_gold_prices(db, root: str, batch_rows: int = ARCHIVE_BATCH_ROWS) -> int:
+    """
+    Append gold_prices rows not archived yet as one part file per (month,
+    platform) and batch.
+
+    Progress is tracked by row id in the manifest, updated after every
+    batch, so an interrupted run continues where it stopped. Rows are
+    change points; later confirmations of an unchanged price are not
+    re-archived. Returns the number of rows archived.
+    """
+    manifest = load_manifest(root)
+    archived = 0
+    while True:
+        last_id = manifest["gold_prices_last_id"]
+        rows = db.query(GoldPriceDB).filter(GoldPriceDB.id > last_id).order_by(GoldPriceDB.id).limit(batch_rows).all()
+        if not rows:
+            return archived
+
+        partitions = defaultdict(lambda: {name: [] for name in GOLD_PRICE_SCHEMA.names})
+        for row in rows:
+            columns = partitions[(month_key(row.timestamp), row.platform)]
+            columns["id"].append(row.id)
+            columns["timestamp"].append(row.timestamp)
+            columns["platform"].append(row.platform)
+            columns["type"].append(row.type)
+            columns["price_per_gram"].append(row.price_per_gram)
+            columns["making_charges"].append(row.making_charges)
+            columns["gst"].append(row.gst)
+
+        for (month, platform), columns in partitions.items():
+            directory = partition_dir(root, "gold_prices", month, platform)
+            write_arrow(os.path.join(directory, f"part-{columns['id'][0]:012d}.arrow"),
+                        _sorted_table(columns, GOLD_PRICE_SCHEMA))
+
+        manifest["gold_prices_last_id"] = rows[-1].id
+        save_manifest(root, manifest)
+        archived += len(rows)
+
+
+def compact_partitions(root: str, before_month: str, table: str = "gold_prices") -> int:
+    """
+    Merge the part files of every month before ``before_month`` into a single
+    ``compacted-N.arrow`` file per platform. Returns the partitions compacted.
+    """
+    table_dir = os.path.join(root, table)
+    if not os.path.isdir(table_dir):
+        return 0
+
+    compacted = 0
+    for month_dir in sorted(os.listdir(table_dir)):
+        if not month_dir.startswith("month=") or month_dir[len("month="):] >= before_month:
+            continue
+        for platform_dir in os.listdir(os.path.join(table_dir, month_dir)):
+            directory = os.path.join(table_dir, month_dir, platform_dir)
+            files = partition_files(directory)
+            if len(files) < 2:
+                continue
+
+            merged = pa.concat_tables([open_arrow(path) for path in files]).sort_by("timestamp").combine_chunks()
+            last_part = max(int(PART_PATTERN.match(os.path.basename(path)).group(1))
+                            for path in files if PART_PATTERN.match(os.path.basename(path)))
+            write_arrow(os.path.join(directory, f"compacted-{last_part:012d}.arrow"), merged)
+            # The new compacted file supersedes every file read above
+            for path in files:
+                if os.path.basename(path) != f"compacted-{last_part:012d}.arrow":
+                    os.remove(path)
+            compacted += 1
+    return compacted
+
+
+def archive_historical_prices(db, root: str) -> int:
+    """Rewrite the historical_prices archive, one file per (month, platform)"""
+    partitions = defaultdict(lambda: {name: [] for name in HISTORICAL_PRICE_SCHEMA.names})
+    rows = db.query(HistoricalPriceDB).all()
+    for row in rows:
+        day = datetime.strptime(row.date, "%Y-%m-%d")
+        columns = partitions[(month_key(day), row.platform or "all")]
+        columns["timestamp"].append(day)
+        columns["platform"].append(row.platform or "all")
+        columns["average_price"].append(row.average_price)
+        columns["highest_price"].append(row.highest_price)
+        columns["lowest_price"].append(row.lowest_price)
+        columns["volume"].append(row.volume or 0)
+
+    for (month, platform), columns in partitions.items():
+        directory = partition_dir(root, "historical_prices", month, platform)
+        write_arrow(os.path.join(directory, "compacted-000000000000.arrow"),
+                    _sorted_table(columns, HISTORICAL_PRICE_SCHEMA))
+    return len(rows)
+
+
+def run_archive(db, root: Optional[str] = None, now: Optional[datetime] = None) -> dict:
+    """Archive new gold_prices rows, compact finished months and refresh historical_prices"""
+    root = root or PRICE_ARCHIVE_DIR
+    started = time.perf_counter()
+    gold_prices = archive_gold_prices(db, root)
+    compacted = compact_partitions(root, month_key(now or datetime.now()))
+    historical = archive_historical_prices(db, root)
+    return {
+        "root": root,
+        "gold_prices_archived": gold_prices,
+        "partitions_compacted": compacted,
+        "historical_prices_archived": historical,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write gold_prices and historical_prices to the columnar archive")
+    parser.add_argument("--root", default=PRICE_ARCHIVE_DIR, help="archive directory")
+    args = parser.parse_args()
+
+    db = get_db_connection()
+    try:
+        print(run_archive(db, args.root))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
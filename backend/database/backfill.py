@@ -0,0 +1,199 @@
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import Float, and_, case, cast, func, literal, or_, select, union_all
+from sqlalchemy.orm import aliased
+
+from database.db import GoldPriceDB, get_db_connection, save_historical_prices
+from database.rollups import ALL_PLATFORMS
+
+# Days of raw gold_prices covered by one grouped query
+BACKFILL_CHUNK_DAYS = int(os.getenv("BACKFILL_CHUNK_DAYS", "31"))
+
+EPOCH = datetime(1970, 1, 1)
+DAY_SECONDS = 86400
+
+
+def epoch_seconds(column, dialect_name: str):
+    """SQL seconds since 1970-01-01 of a naive timestamp, so steps can be clipped to days"""
+    if dialect_name == "sqlite":
+        return (func.julianday(column) - 2440587.5) * DAY_SECONDS
+    # PostgreSQL 14+ extracts numeric, which would reach Python as Decimal
+    return cast(func.extract("epoch", column), Float)
+
+
+def daily_aggregates(db, start: datetime, end: datetime, platforms: Optional[Iterable[str]] = None) -> List[dict]:
+    """
+    Per-day, per-platform aggregates of gold_prices in [start, end).
+
+    gold_prices only holds the points where a price changed, so each row is
+    treated as a step lasting until the next row of its platform (LEAD), or
+    until its last confirmation for the latest one. Steps are clipped to the
+    days they overlap and averaged weighted by seconds in force, in one
+    grouped query, so a day without any change still gets the price that
+    held through it. ``volume`` counts the stored prices in force that day.
+    When ``platforms`` is None the across-platform "all" rows are added,
+    combined from the per-platform sums.
+    """
+    dialect = db.bind.dialect.name
+    bound = aliased(GoldPriceDB)
+    # From the row in force at ``start`` to the first one at or after ``end``,
+    # so the steps crossing either edge get their true length
+    first = select(func.max(bound.timestamp)).where(
+        bound.platform == GoldPriceDB.platform, bound.timestamp <= start
+    ).scalar_subquery()
+    last = select(func.min(bound.timestamp)).where(
+        bound.platform == GoldPriceDB.platform, bound.timestamp >= end
+    ).scalar_subquery()
+    step_end = func.coalesce(
+        func.lead(GoldPriceDB.timestamp).over(partition_by=GoldPriceDB.platform, order_by=GoldPriceDB.timestamp),
+        GoldPriceDB.last_confirmed_at,
+        GoldPriceDB.timestamp,
+    )
+    steps = select(
+        GoldPriceDB.platform.label("platform"),
+        GoldPriceDB.price_per_gram.label("price"),
+        epoch_seconds(GoldPriceDB.timestamp, dialect).label("starts"),
+        epoch_seconds(step_end, dialect).label("ends"),
+    ).where(
+        GoldPriceDB.timestamp >= func.coalesce(first, start),
+        GoldPriceDB.timestamp <= func.coalesce(last, end),
+    )
+    if platforms is not None:
+        steps = steps.where(GoldPriceDB.platform.in_(list(platforms)))
+    steps = steps.subquery()
+
+    day_starts = []
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day < end:
+        day_starts.append((day - EPOCH).total_seconds())
+        day += timedelta(days=1)
+    if not day_starts:
+        return []
+    days = union_all(*(select(literal(day_start).label("day_start")) for day_start in day_starts)).subquery()
+
+    day_start = days.c.day_start
+    day_end = day_start + DAY_SECONDS
+    seconds = (
+        case((steps.c.ends < day_end, steps.c.ends), else_=day_end)
+        - case((steps.c.starts > day_start, steps.c.starts), else_=day_start)
+    )
+    query = select(
+        day_start,
+        steps.c.platform,
+        func.sum(steps.c.price * seconds),
+        func.sum(seconds),
+        func.sum(steps.c.price),
+        func.max(steps.c.price),
+        func.min(steps.c.price),
+        func.count(),
+    ).select_from(days).join(steps, and_(
+        steps.c.starts < day_end,
+        # Zero-length steps (a latest row never confirmed) still count on their day
+        or_(steps.c.ends > day_start, steps.c.starts >= day_start),
+    )).group_by(day_start, steps.c.platform).order_by(day_start, steps.c.platform)
+
+    rows = []
+    combined: Dict[str, dict] = {}
+    for day_value, platform, weighted, in_force, total, highest, lowest, count in db.execute(query):
+        date = (EPOCH + timedelta(seconds=round(day_value))).date().isoformat()
+        rows.append({
+            "date": date,
+            "platform": platform,
+            "average_price": weighted / in_force if in_force else total / count,
+            "highest_price": highest,
+            "lowest_price": lowest,
+            "volume": count,
+        })
+        if platforms is None:
+            day_all = combined.setdefault(date, {"weighted": 0.0, "in_force": 0.0, "total": 0.0,
+                                                 "highest": highest, "lowest": lowest, "count": 0})
+            day_all["weighted"] += weighted
+            day_all["in_force"] += in_force
+            day_all["total"] += total
+            day_all["count"] += count
+            day_all["highest"] = max(day_all["highest"], highest)
+            day_all["lowest"] = min(day_all["lowest"], lowest)
+
+    for date, day_all in combined.items():
+        rows.append({
+            "date": date,
+            "platform": ALL_PLATFORMS,
+            "average_price": (day_all["weighted"] / day_all["in_force"] if day_all["in_force"]
+                              else day_all["total"] / day_all["count"]),
+            "highest_price": day_all["highest"],
+            "lowest_price": day_all["lowest"],
+            "volume": day_all["count"],
+        })
+    return rows
+
+
+def backfill_historical_prices(
+    db,
+    start: datetime,
+    end: datetime,
+    platforms: Optional[Iterable[str]] = None,
+    chunk_days: int = BACKFILL_CHUNK_DAYS,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Recompute historical_prices for every day in [start, end).
+
+    Works through the range ``chunk_days`` at a time, one grouped query and
+    one upsert per chunk, so reruns replace rows instead of duplicating them.
+    ``progress`` is called with a summary after every chunk.
+    """
+    platforms = list(platforms) if platforms is not None else None
+    started = time.perf_counter()
+    summary = {
+        "start": start.date().isoformat(),
+        "end": end.date().isoformat(),
+        "platforms": platforms or "all",
+        "chunks": 0,
+        "days": 0,
+        "rows_written": 0,
+    }
+
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days), end)
+        rows = daily_aggregates(db, chunk_start, chunk_end, platforms)
+        summary["rows_written"] += save_historical_prices(db, rows)
+        summary["days"] += len({row["date"] for row in rows})
+        summary["chunks"] += 1
+        summary["done_through"] = chunk_end.date().isoformat()
+        summary["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        if progress:
+            progress(dict(summary))
+        chunk_start = chunk_end
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild historical_prices from raw gold_prices rows")
+    parser.add_argument("--start", required=True, help="first day to rebuild, YYYY-MM-DD")
+    parser.add_argument("--end", help="last day to rebuild, YYYY-MM-DD (default: today)")
+    parser.add_argument("--platform", action="append", help="only rebuild this platform (repeatable)")
+    parser.add_argument("--chunk-days", type=int, default=BACKFILL_CHUNK_DAYS)
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start, "%Y-%m-%d")
+    last = datetime.strptime(args.end, "%Y-%m-%d") if args.end else datetime.now()
+    end = last.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+    def report(summary):
+        print(f"through {summary['done_through']}: {summary['days']} days, "
+              f"{summary['rows_written']} rows in {summary['elapsed_seconds']}s")
+
+    db = get_db_connection()
+    try:
+        backfill_historical_prices(db, start, end, args.platform, args.chunk_days, report)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import json
+from datetime import datetime
+from typing import Dict, Iterable
+
+from sqlalchemy import Column, DateTime, String, Text
+
+from database.db import Base, engine
+from utils.streaming_indicators import IndicatorSet
+
+
+class IndicatorStateDB(Base):
+    __tablename__ = "indicator_states"
+
+    platform = Column(String, primary_key=True)
+    state = Column(Text, nullable=False)  # JSON from IndicatorSet.to_dict
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+IndicatorStateDB.__table__.create(bind=engine, checkfirst=True)
+
+
+def load_indicator_sets(db, platforms: Iterable[str] = None) -> Dict[str, IndicatorSet]:
+    """Stored indicator state per platform (all platforms when ``platforms`` is None)"""
+    query = db.query(IndicatorStateDB)
+    if platforms is not None:
+        query = query.filter(IndicatorStateDB.platform.in_(list(platforms)))
+    return {row.platform: IndicatorSet.from_dict(json.loads(row.state)) for row in query}
+
+
+def update_indicators(db, gold_prices) -> Dict[str, dict]:
+    """
+    Feed a scrape batch into each platform's streaming indicators and store
+    their state, one price per platform in O(1). Returns the new values.
+    """
+    gold_prices = sorted(gold_prices, key=lambda p: p.timestamp)
+    if not gold_prices:
+        return {}
+
+    platforms = {price.platform for price in gold_prices}
+    # Row locks keep overlapping ingest runs from losing each other's updates
+    query = db.query(IndicatorStateDB).filter(IndicatorStateDB.platform.in_(platforms)).with_for_update()
+    rows = {row.platform: row for row in query}
+    sets = {platform: IndicatorSet.from_dict(json.loads(row.state)) for platform, row in rows.items()}
+
+    changed = set()
+    for price in gold_prices:
+        indicator_set = sets.setdefault(price.platform, IndicatorSet())
+        if indicator_set.update(price.price_per_gram, price.timestamp.isoformat()):
+            changed.add(price.platform)
+
+    now = datetime.utcnow()
+    for platform in changed:
+        state = json.dumps(sets[platform].to_dict())
+        row = rows.get(platform)
+        if row is None:
+            db.add(IndicatorStateDB(platform=platform, state=state, updated_at=now))
+        else:
+            row.state = state
+            row.updated_at = now
+    db.commit()
+    return {platform: sets[platform].values() for platform in changed}
@@ -0,0 +1,145 @@
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import delete, func
+
+from database.db import GoldPriceDB, get_latest_price_rows
+from database.rollups import PriceRollupDB, aggregate_ticks, bucket_start, insert_missing_rollups, merge_buckets
+
+# Raw gold_prices rows (and minute rollups) are kept this long
+RAW_RETENTION_DAYS = int(os.getenv("RAW_RETENTION_DAYS", "30"))
+# Hourly rollups are kept this long; daily rollups are kept indefinitely
+HOURLY_RETENTION_DAYS = int(os.getenv("HOURLY_RETENTION_DAYS", "365"))
+# Rows deleted per statement and transaction
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "5000"))
+
+
+class RetentionRun:
+    """Counters of one retention run, reported after every batch"""
+
+    def __init__(self, progress: Optional[Callable[[dict], None]] = None):
+        self.progress = progress
+        self.started = time.perf_counter()
+        self.counts = {
+            "raw_deleted": 0,
+            "minute_deleted": 0,
+            "hourly_deleted": 0,
+            "buckets_filled": 0,
+            "batches": 0,
+        }
+
+    def add(self, counter: str, amount: int, stage: str):
+        self.counts[counter] += amount
+        self.counts["batches"] += 1
+        if self.progress:
+            self.progress({"stage": stage, **self.summary()})
+
+    def summary(self) -> dict:
+        return {**self.counts, "elapsed_seconds": round(time.perf_counter() - self.started, 3)}
+
+
+def _delete_in_batches(db, model, filters, batch_size: int, run: RetentionRun, counter: str, stage: str) -> int:
+    """Delete rows matching ``filters`` ``batch_size`` at a time, committing each batch"""
+    deleted = 0
+    while True:
+        ids = [row_id for (row_id,) in db.query(model.id).filter(*filters).limit(batch_size)]
+        if not ids:
+            return deleted
+        # The filters are repeated so partitioned tables only touch the relevant partitions
+        db.execute(delete(model).where(model.id.in_(ids), *filters))
+        db.commit()
+        deleted += len(ids)
+        run.add(counter, len(ids), stage)
+
+
+def compact_raw_prices(db, cutoff: datetime, batch_size: int, run: RetentionRun):
+    """
+    Move raw gold_prices rows older than ``cutoff`` into hourly and daily rollups.
+
+    Works a day at a time from the oldest row. Buckets already maintained at
+    ingest are kept as they are; only missing ones are built from the raw
+    rows, and they are committed before any row of that day is deleted. The
+    oldest remaining row is therefore the resume point after an interruption.
+    The latest row of each platform is never deleted, since unchanged prices
+    are only confirmed on it.
+    """
+    platforms = [platform for (platform,) in db.query(GoldPriceDB.platform).distinct()]
+    keep = [row.id for row in get_latest_price_rows(db, platforms).values()]
+
+    while True:
+        oldest = db.query(func.min(GoldPriceDB.timestamp)).filter(
+            GoldPriceDB.timestamp < cutoff,
+            GoldPriceDB.id.notin_(keep)
+        ).scalar()
+        if oldest is None:
+            return
+
+        day_start = bucket_start(oldest, "day")
+        day_end = min(day_start + timedelta(days=1), cutoff)
+        ticks = db.query(GoldPriceDB.platform, GoldPriceDB.timestamp, GoldPriceDB.price_per_gram).filter(
+            GoldPriceDB.timestamp >= day_start,
+            GoldPriceDB.timestamp < day_start + timedelta(days=1)
+        )
+        buckets = [b for b in aggregate_ticks(ticks).values() if b["granularity"] != "minute"]
+        filled = insert_missing_rollups(db, buckets)
+        db.commit()
+        run.add("buckets_filled", filled, "raw")
+
+        filters = (GoldPriceDB.timestamp >= day_start, GoldPriceDB.timestamp < day_end, GoldPriceDB.id.notin_(keep))
+        _delete_in_batches(db, GoldPriceDB, filters, batch_size, run, "raw_deleted", "raw")
+
+
+def compact_hourly_rollups(db, cutoff: datetime, batch_size: int, run: RetentionRun):
+    """Fold hourly rollups older than ``cutoff`` into daily ones and delete them, a day at a time"""
+    while True:
+        oldest = db.query(func.min(PriceRollupDB.bucket_start)).filter(
+            PriceRollupDB.granularity == "hour",
+            PriceRollupDB.bucket_start < cutoff
+        ).scalar()
+        if oldest is None:
+            return
+
+        day_start = bucket_start(oldest, "day")
+        filters = (
+            PriceRollupDB.granularity == "hour",
+            PriceRollupDB.bucket_start >= day_start,
+            PriceRollupDB.bucket_start < min(day_start + timedelta(days=1), cutoff)
+        )
+        filled = insert_missing_rollups(db, merge_buckets(db.query(PriceRollupDB).filter(*filters), "day").values())
+        db.commit()
+        run.add("buckets_filled", filled, "hourly")
+        _delete_in_batches(db, PriceRollupDB, filters, batch_size, run, "hourly_deleted", "hourly")
+
+
+def apply_retention(
+    db,
+    now: Optional[datetime] = None,
+    raw_days: int = RAW_RETENTION_DAYS,
+    hourly_days: int = HOURLY_RETENTION_DAYS,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Apply tiered retention: raw ticks for ``raw_days``, hourly rollups for
+    ``hourly_days``, daily rollups forever.
+
+    Every batch commits on its own, so an interrupted run loses at most one
+    batch of work and the next run carries on from the oldest remaining row.
+    """
+    now = now or datetime.now()
+    raw_cutoff = bucket_start(now - timedelta(days=raw_days), "day")
+    hourly_cutoff = bucket_start(now - timedelta(days=hourly_days), "day")
+    run = RetentionRun(progress)
+
+    compact_raw_prices(db, raw_cutoff, batch_size, run)
+    minute_filters = (PriceRollupDB.granularity == "minute", PriceRollupDB.bucket_start < raw_cutoff)
+    _delete_in_batches(db, PriceRollupDB, minute_filters, batch_size, run, "minute_deleted", "minute")
+    compact_hourly_rollups(db, hourly_cutoff, batch_size, run)
+
+    return {
+        "raw_cutoff": raw_cutoff.isoformat(),
+        "hourly_cutoff": hourly_cutoff.isoformat(),
+        **run.summary(),
+    }
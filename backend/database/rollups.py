@@ -0,0 +1,243 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, case, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database.db import Base, engine
+
+# Platform value of the rollup rows that aggregate every platform together
+ALL_PLATFORMS = "all"
+
+GRANULARITIES = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+
+class PriceRollupDB(Base):
+    __tablename__ = "price_rollups"
+    __table_args__ = (
+        Index("ux_price_rollups_bucket", "granularity", "platform", "bucket_start", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    granularity = Column(String, nullable=False)  # minute, hour or day
+    platform = Column(String, nullable=False)  # platform name or "all"
+    bucket_start = Column(DateTime, nullable=False)
+    open = Column(Float)
+    high = Column(Float)
+    low = Column(Float)
+    close = Column(Float)
+    price_sum = Column(Float, default=0.0)
+    tick_count = Column(Integer, default=0)
+    # Observation times of open/close, so late or out-of-order ticks merge correctly
+    open_at = Column(DateTime)
+    close_at = Column(DateTime)
+
+    @property
+    def mean(self) -> float:
+        return self.price_sum / self.tick_count if self.tick_count else None
+
+
+PriceRollupDB.__table__.create(bind=engine, checkfirst=True)
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """Start of the ``granularity`` bucket containing ``timestamp``"""
+    if granularity == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown rollup granularity: {granularity}")
+
+
+def aggregate_ticks(ticks: Iterable[Tuple[str, datetime, float]]) -> Dict[tuple, dict]:
+    """
+    Fold (platform, timestamp, price) ticks into partial OHLC buckets.
+
+    Every tick lands in its own platform's buckets and in the "all" buckets,
+    at each granularity.
+    """
+    buckets: Dict[tuple, dict] = {}
+    for platform, timestamp, price in ticks:
+        for granularity in GRANULARITIES:
+            start = bucket_start(timestamp, granularity)
+            for key_platform in (platform, ALL_PLATFORMS):
+                key = (granularity, key_platform, start)
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = {
+                        "granularity": granularity,
+                        "platform": key_platform,
+                        "bucket_start": start,
+                        "open": price, "high": price, "low": price, "close": price,
+                        "price_sum": price, "tick_count": 1,
+                        "open_at": timestamp, "close_at": timestamp,
+                    }
+                    continue
+                bucket["high"] = max(bucket["high"], price)
+                bucket["low"] = min(bucket["low"], price)
+                bucket["price_sum"] += price
+                bucket["tick_count"] += 1
+                if timestamp < bucket["open_at"]:
+                    bucket["open"], bucket["open_at"] = price, timestamp
+                if timestamp >= bucket["close_at"]:
+                    bucket["close"], bucket["close_at"] = price, timestamp
+    return buckets
+
+
+def _insert_statement(dialect_name: str):
+    """INSERT supporting ON CONFLICT, or None for dialects without it"""
+    if dialect_name == "postgresql":
+        return postgresql.insert(PriceRollupDB.__table__)
+    if dialect_name == "sqlite":
+        return sqlite.insert(PriceRollupDB.__table__)
+    return None
+
+
+def _upsert_statement(dialect_name: str):
+    table = PriceRollupDB.__table__
+    statement = _insert_statement(dialect_name)
+    new = statement.excluded
+    # Merge the incoming partial bucket into the stored one in a single statement
+    return statement.on_conflict_do_update(
+        index_elements=["granularity", "platform", "bucket_start"],
+        set_={
+            "high": case((new.high > table.c.high, new.high), else_=table.c.high),
+            "low": case((new.low < table.c.low, new.low), else_=table.c.low),
+            "open": case((new.open_at < table.c.open_at, new.open), else_=table.c.open),
+            "open_at": case((new.open_at < table.c.open_at, new.open_at), else_=table.c.open_at),
+            "close": case((new.close_at >= table.c.close_at, new.close), else_=table.c.close),
+            "close_at": case((new.close_at >= table.c.close_at, new.close_at), else_=table.c.close_at),
+            "price_sum": table.c.price_sum + new.price_sum,
+            "tick_count": table.c.tick_count + new.tick_count,
+        },
+    )
+
+
+def _stored_rollups(db, buckets: List[dict]) -> Dict[tuple, PriceRollupDB]:
+    """Stored rows for the (granularity, platform, bucket_start) keys of ``buckets``"""
+    rows = db.query(PriceRollupDB).filter(
+        PriceRollupDB.granularity.in_({b["granularity"] for b in buckets}),
+        PriceRollupDB.platform.in_({b["platform"] for b in buckets}),
+        PriceRollupDB.bucket_start.in_({b["bucket_start"] for b in buckets})
+    )
+    return {(row.granularity, row.platform, row.bucket_start): row for row in rows}
+
+
+def _merge_rollups(db, buckets: List[dict], keep_existing: bool = False):
+    """
+    Upsert for dialects without ON CONFLICT: look up the stored buckets, then
+    update them (merged as _upsert_statement does, or left alone with
+    ``keep_existing``) and insert the rest, in the caller's transaction.
+    """
+    stored = _stored_rollups(db, buckets)
+    updates, inserts = [], []
+    for bucket in buckets:
+        row = stored.get((bucket["granularity"], bucket["platform"], bucket["bucket_start"]))
+        if row is None:
+            inserts.append(bucket)
+        elif not keep_existing:
+            # Same granularity, so merging yields the one combined bucket
+            (merged,) = merge_buckets([row, SimpleNamespace(**bucket)], row.granularity).values()
+            updates.append({"id": row.id, **merged})
+    if updates:
+        db.execute(update(PriceRollupDB), updates)
+    if inserts:
+        db.execute(insert(PriceRollupDB), inserts)
+
+
+def update_price_rollups(db, gold_prices) -> int:
+    """
+    Fold a scrape batch into the minute/hour/day rollups.
+
+    Every scraped price counts as an observation, including ones that did not
+    change and were therefore not written to gold_prices.
+    Returns the number of buckets touched.
+    """
+    buckets = aggregate_ticks((p.platform, p.timestamp, p.price_per_gram) for p in gold_prices)
+    if not buckets:
+        return 0
+    if _insert_statement(db.bind.dialect.name) is None:
+        _merge_rollups(db, list(buckets.values()))
+    else:
+        db.execute(_upsert_statement(db.bind.dialect.name), list(buckets.values()))
+    db.commit()
+    return len(buckets)
+
+
+def insert_missing_rollups(db, buckets: Iterable[dict]) -> int:
+    """
+    Store complete buckets whose (granularity, platform, bucket_start) is not
+    present yet; existing buckets are left untouched. Does not commit.
+    """
+    buckets = list(buckets)
+    if not buckets:
+        return 0
+    statement = _insert_statement(db.bind.dialect.name)
+    if statement is None:
+        _merge_rollups(db, buckets, keep_existing=True)
+    else:
+        db.execute(statement.on_conflict_do_nothing(
+            index_elements=["granularity", "platform", "bucket_start"]
+        ), buckets)
+    return len(buckets)
+
+
+def merge_buckets(rows: Iterable[PriceRollupDB], granularity: str) -> Dict[tuple, dict]:
+    """Fold finer rollup rows into buckets of a coarser ``granularity``"""
+    buckets: Dict[tuple, dict] = {}
+    for row in rows:
+        start = bucket_start(row.bucket_start, granularity)
+        key = (granularity, row.platform, start)
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = {
+                "granularity": granularity,
+                "platform": row.platform,
+                "bucket_start": start,
+                "open": row.open, "high": row.high, "low": row.low, "close": row.close,
+                "price_sum": row.price_sum, "tick_count": row.tick_count,
+                "open_at": row.open_at, "close_at": row.close_at,
+            }
+            continue
+        bucket["high"] = max(bucket["high"], row.high)
+        bucket["low"] = min(bucket["low"], row.low)
+        bucket["price_sum"] += row.price_sum
+        bucket["tick_count"] += row.tick_count
+        if row.open_at < bucket["open_at"]:
+            bucket["open"], bucket["open_at"] = row.open, row.open_at
+        if row.close_at >= bucket["close_at"]:
+            bucket["close"], bucket["close_at"] = row.close, row.close_at
+    return buckets
+
+
+def get_rollups(db, granularity: str, start: datetime, end: datetime, platform: str = ALL_PLATFORMS) -> List[PriceRollupDB]:
+    """Rollup buckets in [start, end), oldest first"""
+    return db.query(PriceRollupDB).filter(
+        PriceRollupDB.granularity == granularity,
+        PriceRollupDB.platform == platform,
+        PriceRollupDB.bucket_start >= start,
+        PriceRollupDB.bucket_start < end
+    ).order_by(PriceRollupDB.bucket_start).all()
+
+
+def get_data_version(db, platform: str = ALL_PLATFORMS) -> str:
+    """
+    Version of a platform's rollup series; changes whenever a tick lands.
+
+    Taken from the newest minute bucket, which every ingest touches, so it
+    is a single index lookup.
+    """
+    latest = db.query(PriceRollupDB.bucket_start, PriceRollupDB.tick_count).filter(
+        PriceRollupDB.granularity == "minute",
+        PriceRollupDB.platform == platform
+    ).order_by(PriceRollupDB.bucket_start.desc()).first()
+    if latest is None:
+        return "empty"
+    return f"{latest.bucket_start.isoformat()}/{latest.tick_count}"
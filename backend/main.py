@@ -1,15 +1,40 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, timedelta
+import asyncio
 import json
+import orjson
 
-from scrapers.gold_scraper import GoldScraper
-from models.gold_price import GoldPrice, GoldPriceResponse
+from scrapers.gold_scraper import GoldScraper, create_scraper
+from scrapers.browser_pool import get_browser_pool
+from scrapers.conditional import get_page_cache
+from scrapers.circuit_breaker import get_circuit_breakers
+from scrapers.hedging import get_hedger
+from models.gold_price import ComparisonResult, GoldPrice, GoldPriceResponse
 from database.db import get_db_connection
-from utils.calculations import calculate_profit, calculate_best_deal
+from database.rollups import ALL_PLATFORMS, get_data_version, get_rollups
+from database.retention import HOURLY_RETENTION_DAYS
+from database.backfill import backfill_historical_prices
+from database.indicator_states import load_indicator_sets
+from tasks.scheduler import get_scheduler
+from utils.calculations import (
+    calculate_profit, calculate_best_deal, calculate_cost_matrix, rank_cost_matrix, calculate_moving_average, calculate_rsi,
+    calculate_rolling_volatility, calculate_momentum_series, calculate_rolling_support_resistance, load_archived_buckets
+)
+from utils.analytics_cache import AnalyticsCache
+from utils.downsampling import lttb, min_max
+from utils.price_cache import PriceSnapshotCache, ResultCache
+from utils.price_stream import PriceBroadcaster
+from utils.http_cache import (
+    COMPARE_CACHE_CONTROL, GOLD_PRICES_CACHE_CONTROL, HISTORY_CACHE_CONTROL, NO_STORE,
+    etag_matches, make_etag, not_modified, set_validators
+)
+from utils.ranking_index import RankingIndex
+from utils.snapshot_payloads import SnapshotPayloads
+from utils.wire_format import FORMATS, compress, encode_comparison, encode_history, negotiate_encoding
 
 app = FastAPI(title="AURUM API", version="1.0.0", description="Intelligent Gold Rate Analysis & Buying Guide API")
 
@@ -22,14 +47,75 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize scraper
-scraper = GoldScraper()
+# Per-platform latency and outcome of the most recent scrape run
+last_scrape_report = None
+
+def scrape_prices():
+    """Run a full scrape of every platform"""
+    global last_scrape_report
+
+    async def run_scraping():
+        async with create_scraper() as scraper:
+            prices = await scraper.scrape_all_platforms()
+            return prices, scraper.last_report
+
+    prices, last_scrape_report = asyncio.run(run_scraping())
+    return prices
+
+# Latest prices snapshot, refreshed in the background once its TTL expires
+price_cache = PriceSnapshotCache(loader=scrape_prices)
+history_cache = ResultCache()
+analytics_cache = AnalyticsCache()
+
+ranking_index = RankingIndex(0, [])
+
+def rebuild_ranking_index(snapshot):
+    """Rebuild the best-deal ranking index for a newly published snapshot"""
+    global ranking_index
+    ranking_index = RankingIndex(snapshot.version, snapshot.prices)
+
+price_cache.subscribe(rebuild_ranking_index)
+
+# Pushes changed platforms to /api/stream/prices subscribers, keeping the
+# snapshot refreshed while anyone is listening
+price_broadcaster = PriceBroadcaster(refresh=price_cache.get)
+price_cache.subscribe(price_broadcaster.publish)
+
+def get_ranking_index(snapshot=None):
+    """Ranking index of ``snapshot``, the current one by default"""
+    snapshot = snapshot or price_cache.get()
+    index = ranking_index
+    if index.version != snapshot.version:
+        rebuild_ranking_index(snapshot)
+        index = ranking_index
+    return index
+
+snapshot_payloads = SnapshotPayloads(0, [])
+
+def rebuild_snapshot_payloads(snapshot):
+    """Encode the /api/gold-prices bodies of a newly published snapshot"""
+    global snapshot_payloads
+    snapshot_payloads = SnapshotPayloads(snapshot.version, snapshot.prices)
+
+price_cache.subscribe(rebuild_snapshot_payloads)
+
+def get_snapshot_payloads(snapshot):
+    """Encoded response bodies of ``snapshot``"""
+    payloads = snapshot_payloads
+    if payloads.version != snapshot.version:
+        rebuild_snapshot_payloads(snapshot)
+        payloads = snapshot_payloads
+    return payloads
 
 def get_cached_prices():
-    """Get cached prices - for now return simulated data"""
-    # In production, this would fetch from database
-    with scraper:
-        return scraper.scrape_all_platforms()
+    """Get prices from the current snapshot"""
+    return price_cache.get().prices
+
+def filter_prices(prices, gold_type="both"):
+    """Filter prices by gold type"""
+    if gold_type != "both":
+        prices = [p for p in prices if p.type == gold_type]
+    return prices
 
 def calculate_total_cost(price, weight=10):
     """Calculate total cost for given weight"""
@@ -38,32 +124,124 @@ def calculate_total_cost(price, weight=10):
     gst_amount = (base_cost + making_cost) * (price.gst / 100)
     return base_cost + making_cost + gst_amount
 
-def get_historical_prices(days):
-    """Get historical price data - simulated for now"""
-    # In production, this would fetch from database
-    import random
-    from datetime import datetime, timedelta
+# Chart points returned by /api/historical-data unless the client asks otherwise
+HISTORY_MAX_POINTS = 500
+
+PERIOD_DAYS = {
+    "30d": 30,
+    "6m": 180,
+    "1y": 365,
+    "5y": 1825
+}
+
+def history_window_end():
+    """Exclusive end of every history window: the start of the next hour"""
+    return datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+def load_history(days, platform=ALL_PLATFORMS, end=None):
+    """
+    Load price buckets covering the ``days`` days before ``end``, oldest first.
+    Hourly rollups are used while they are still retained. Beyond that the
+    older hours are rebuilt from the columnar archive, which keeps every
+    price change, as long as it reaches back as far as the daily rollups;
+    otherwise the daily rollups are used.
+    """
+    end = end or history_window_end()
+    start = end - timedelta(days=days)
+    db = get_db_connection()
+    try:
+        hourly = get_rollups(db, "hour", start, end, platform)
+        if days <= HOURLY_RETENTION_DAYS:
+            return hourly, "hour"
+        daily = get_rollups(db, "day", start, end, platform)
+    finally:
+        db.close()
     
-    historical_data = []
-    base_price = 6700
+    archived_end = hourly[0].bucket_start if hourly else end
+    archived = load_archived_buckets(None if platform == ALL_PLATFORMS else platform, start, archived_end)
+    if archived and (not daily or archived[0].bucket_start <= daily[0].bucket_start):
+        return archived + hourly, "hour"
+    return daily, "day"
+
+def get_historical_prices(days, platform=ALL_PLATFORMS, max_points=HISTORY_MAX_POINTS, method="lttb", end=None):
+    """
+    Get historical prices from the precomputed rollups, downsampled to at most
+    ``max_points`` points (0 returns every bucket).
+    """
+    buckets, granularity = load_history(days, platform, end)
     
-    for i in range(days):
-        date = datetime.now() - timedelta(days=days-i)
-        # Simulate price variation
-        price_variation = random.uniform(-50, 50)
-        price = base_price + price_variation
-        
-        historical_data.append({
-            "date": date.isoformat(),
-            "price": round(price, 2)
-        })
+    source_points = len(buckets)
+    if max_points and source_points > max_points:
+        prices = [bucket.mean for bucket in buckets]
+        if method == "minmax":
+            indices = min_max(prices, max_points)
+        else:
+            times = [bucket.bucket_start.timestamp() for bucket in buckets]
+            indices = lttb(times, prices, max_points)
+        buckets = [buckets[i] for i in indices]
+    
+    points = [
+        {
+            "date": bucket.bucket_start.isoformat(),
+            "price": round(bucket.mean, 2),
+            "open": bucket.open,
+            "high": bucket.high,
+            "low": bucket.low,
+            "close": bucket.close
+        }
+        for bucket in buckets
+    ]
+    return points, granularity, source_points
+
+# Indicator name -> (default window, function of (prices, window, smoothing))
+ANALYTICS_INDICATORS = {
+    "moving_average": (20, lambda prices, window, smoothing: calculate_moving_average(prices, window)),
+    "rsi": (14, lambda prices, window, smoothing: calculate_rsi(prices, window, smoothing)),
+    "volatility": (20, lambda prices, window, smoothing: calculate_rolling_volatility(prices, window)),
+    "momentum": (10, lambda prices, window, smoothing: calculate_momentum_series(prices, window)),
+    "support_resistance": (20, lambda prices, window, smoothing: calculate_rolling_support_resistance(prices, window)),
+}
+
+def compute_indicator(indicator, days, platform, window, smoothing, end=None):
+    """Compute an indicator over the stored history, with dates aligned to its values"""
+    buckets, granularity = load_history(days, platform, end)
+    prices = [bucket.mean for bucket in buckets]
+    dates = [bucket.bucket_start.isoformat() for bucket in buckets]
+    result = ANALYTICS_INDICATORS[indicator][1](prices, window, smoothing)
     
-    return historical_data
+    if indicator == "support_resistance":
+        support, resistance = result
+        values = {"support": support, "resistance": resistance}
+        count = len(support)
+    else:
+        values = result
+        count = len(result)
+    # Indicators with a warm-up period return fewer values than prices
+    return {"granularity": granularity, "dates": dates[len(dates) - count:], "values": values}
 
 class ComparisonRequest(BaseModel):
     gold_type: str = "both"  # physical, digital, both
     weight: float = 10.0
 
+class CostScenario(BaseModel):
+    name: Optional[str] = None
+    gst: Optional[float] = None  # GST % applied to every platform; None keeps each platform's own
+    making_charges_factor: float = 1.0  # multiplier on every platform's making charges
+
+class BatchComparisonRequest(BaseModel):
+    gold_type: str = "both"  # physical, digital, both
+    weights: List[float]
+    scenarios: List[CostScenario] = []
+
+# Limits on a single /api/compare/batch request
+MAX_BATCH_WEIGHTS = 500
+MAX_BATCH_SCENARIOS = 20
+
+class BackfillRequest(BaseModel):
+    start_date: str  # YYYY-MM-DD, inclusive
+    end_date: Optional[str] = None  # YYYY-MM-DD, inclusive, defaults to today
+    platforms: Optional[List[str]] = None  # None rebuilds every platform and the "all" aggregate
+
 class ProfitAnalysisRequest(BaseModel):
     investment_amount: float
     investment_date: str
@@ -75,87 +253,411 @@ async def root():
     return {"message": "AURUM API - Intelligent Gold Rate Analysis & Buying Guide"}
 
 @app.get("/api/gold-prices", response_model=List[GoldPriceResponse])
-def get_gold_prices(gold_type: str = "both", fresh: bool = False):
+def get_gold_prices(gold_type: str = "both", fresh: bool = False,
+                    if_none_match: Optional[str] = Header(None)):
     """
     Get current gold prices from multiple platforms
     """
     try:
         if fresh:
-            # Scrape fresh data
-            with scraper:
-                prices = scraper.scrape_all_platforms()
+            # Scrape fresh data and publish it as the new snapshot
+            snapshot = price_cache.refresh()
         else:
-            # Get cached data from database
-            prices = get_cached_prices()
-            
-        if gold_type != "both":
-            prices = [p for p in prices if p.type == gold_type]
-            
-        return prices
+            snapshot = price_cache.get()
+
+        payloads = get_snapshot_payloads(snapshot)
+        etag = payloads.etag(gold_type)
+        cache_control = NO_STORE if fresh else GOLD_PRICES_CACHE_CONTROL
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, cache_control)
+
+        # Bodies are encoded once per snapshot; skip per-request validation and serialization
+        response = Response(content=payloads.get(gold_type), media_type="application/json")
+        set_validators(response, etag, cache_control)
+        response.headers["X-Snapshot-Version"] = str(snapshot.version)
+        response.headers["X-Snapshot-Age"] = f"{snapshot.age:.3f}"
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching gold prices: {str(e)}")
 
+@app.get("/api/stream/prices")
+async def stream_gold_prices(since: Optional[str] = None, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-sent events of price changes. A new client gets a full
+    ``snapshot`` event, then ``prices`` events carrying only the platforms
+    that changed. Reconnecting clients resume from ``since`` or the
+    Last-Event-ID header and only receive what they missed; ids from
+    another worker or an earlier process get a fresh snapshot.
+    """
+    if price_cache.version == 0:
+        await asyncio.to_thread(price_cache.get)
+
+    return StreamingResponse(
+        price_broadcaster.stream(since if since is not None else last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/stream/stats")
+def get_stream_stats():
+    """
+    Get price stream subscriber and delivery counters
+    """
+    return price_broadcaster.stats()
+
+def encoded_response(body, encoding, etag=None, cache_control=None):
+    """JSON response for a body already encoded, and compressed with ``encoding``"""
+    response = Response(content=body, media_type="application/json")
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    if etag is not None:
+        set_validators(response, etag, cache_control)
+    return response
+
+def check_format(format):
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(FORMATS)}")
+
+def comparison_response(snapshot, gold_type, weight, format, accept_encoding, etag=None, cache_control=None):
+    """Comparison in the requested wire format, compressed as the client accepts"""
+    payload = build_comparison(snapshot, gold_type, weight)
+    if format == "compact":
+        payload = encode_comparison(payload)
+    body, encoding = compress(orjson.dumps(payload), negotiate_encoding(accept_encoding))
+    return encoded_response(body, encoding, etag, cache_control)
+
+def build_comparison(snapshot, gold_type, weight):
+    """Comparison payload for one snapshot; depends on nothing else, so it can carry a strong ETag"""
+    # Orderings are precomputed once per snapshot
+    comparison_data = get_ranking_index(snapshot).compare(gold_type, weight)
+    
+    best_deal = comparison_data[0] if comparison_data else None
+    
+    return {
+        "comparison": comparison_data,
+        "best_deal": best_deal,
+        "weight": weight,
+        "timestamp": snapshot.fetched_at.isoformat()
+    }
+
 @app.post("/api/compare")
-def compare_gold_prices(request: ComparisonRequest):
+def compare_gold_prices(request: ComparisonRequest, format: str = "json",
+                        accept_encoding: Optional[str] = Header(None)):
     """
-    Compare gold prices and find the best deal
+    Compare gold prices and find the best deal; format=compact returns columnar arrays
     """
+    check_format(format)
+    if request.weight <= 0:
+        raise HTTPException(status_code=400, detail="Weight must be positive")
     try:
-        prices = get_gold_prices(request.gold_type)
-        
-        comparison_data = []
-        for price in prices:
-            total_cost = calculate_total_cost(price, request.weight)
-            comparison_data.append({
-                "platform": price.platform,
-                "type": price.type,
-                "price_per_gram": price.price_per_gram,
-                "making_charges": price.making_charges,
-                "gst": price.gst,
-                "total_cost": total_cost,
-                "features": price.features
-            })
+        return comparison_response(price_cache.get(), request.gold_type, request.weight, format, accept_encoding)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error comparing prices: {str(e)}")
+
+@app.get("/api/compare")
+def get_comparison(gold_type: str = "both", weight: float = 10.0, format: str = "json",
+                   if_none_match: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None)):
+    """
+    Cacheable form of the comparison for polling clients, answering 304 while
+    the price snapshot is unchanged
+    """
+    check_format(format)
+    if weight <= 0:
+        raise HTTPException(status_code=400, detail="Weight must be positive")
+    try:
+        snapshot = price_cache.get()
+        # From the prices and fetch time the body is built from, which every
+        # worker agrees on, rather than the per-process snapshot version
+        etag = make_etag("compare", get_snapshot_payloads(snapshot).fingerprint, snapshot.fetched_at.isoformat(),
+                         gold_type, weight, format, negotiate_encoding(accept_encoding))
+        if etag_matches(if_none_match, etag):
+            response = not_modified(etag, COMPARE_CACHE_CONTROL)
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
         
-        # Sort by total cost
-        comparison_data.sort(key=lambda x: x["total_cost"])
+        return comparison_response(snapshot, gold_type, weight, format, accept_encoding, etag, COMPARE_CACHE_CONTROL)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error comparing prices: {str(e)}")
+
+@app.get("/api/best-deal", response_model=List[ComparisonResult])
+def get_best_deal(gold_type: str = "both", weight: float = 10.0):
+    """
+    Get platforms ranked by total cost for a weight, cheapest first
+    """
+    if weight <= 0:
+        raise HTTPException(status_code=400, detail="Weight must be positive")
+    try:
+        return get_ranking_index().best_deal(gold_type, weight)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error ranking prices: {str(e)}")
+
+@app.post("/api/compare/batch")
+def compare_gold_prices_batch(request: BatchComparisonRequest):
+    """
+    Rank platforms for many weights and GST/making-charge scenarios in one request
+    """
+    if not request.weights or len(request.weights) > MAX_BATCH_WEIGHTS:
+        raise HTTPException(status_code=400, detail=f"Provide between 1 and {MAX_BATCH_WEIGHTS} weights")
+    if any(weight <= 0 for weight in request.weights):
+        raise HTTPException(status_code=400, detail="Weights must be positive")
+    if len(request.scenarios) > MAX_BATCH_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SCENARIOS} scenarios per request")
+    
+    try:
+        prices = filter_prices(get_cached_prices(), request.gold_type)
+        scenarios = request.scenarios or [CostScenario(name="current")]
+        if not prices:
+            costs = order = savings = None
+        else:
+            costs = calculate_cost_matrix(
+                prices,
+                request.weights,
+                [scenario.gst for scenario in scenarios],
+                [scenario.making_charges_factor for scenario in scenarios]
+            )
+            order, savings = rank_cost_matrix(costs)
+            costs, savings = costs.round(2), savings.round(2)
         
-        best_deal = comparison_data[0] if comparison_data else None
+        results = []
+        for s, scenario in enumerate(scenarios):
+            per_weight = []
+            for w, weight in enumerate(request.weights):
+                ranking = [] if costs is None else [
+                    {
+                        "platform": prices[p].platform,
+                        "total_cost": float(costs[s, w, p]),
+                        "rank": rank + 1,
+                        "savings_vs_highest": float(savings[s, w, p])
+                    }
+                    for rank, p in enumerate(order[s, w].tolist())
+                ]
+                per_weight.append({
+                    "weight": weight,
+                    "best_deal": ranking[0]["platform"] if ranking else None,
+                    "ranking": ranking
+                })
+            results.append({**scenario.model_dump(), "results": per_weight})
         
         return {
-            "comparison": comparison_data,
-            "best_deal": best_deal,
-            "weight": request.weight,
+            "platforms": [
+                {
+                    "platform": price.platform,
+                    "type": price.type,
+                    "price_per_gram": price.price_per_gram,
+                    "making_charges": price.making_charges,
+                    "gst": price.gst,
+                    "features": price.features
+                }
+                for price in prices
+            ],
+            "weights": request.weights,
+            "scenarios": results,
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error comparing prices: {str(e)}")
 
+@app.get("/api/cache/stats")
+def get_cache_stats():
+    """
+    Get price snapshot cache version and hit/miss/refresh counters
+    """
+    return {**price_cache.stats(), "history": history_cache.stats(), "analytics": analytics_cache.stats()}
+
+@app.get("/api/scrape/report")
+def get_scrape_report():
+    """
+    Get per-platform latency and outcome of the last scrape run
+    """
+    if last_scrape_report is None:
+        return {"elapsed_ms": None, "platforms": 0, "outcomes": {}, "results": []}
+    return last_scrape_report.summary()
+
+@app.get("/api/scrape/browsers")
+def get_browser_pool_stats():
+    """
+    Get headless browser pool occupancy and pool-wait/page-load timings
+    """
+    return get_browser_pool().stats()
+
+@app.get("/api/scrape/conditional")
+def get_conditional_fetch_stats():
+    """
+    Get bandwidth and parsing saved by conditional requests and body hashing
+    """
+    return get_page_cache().stats()
+
+@app.get("/api/scrape/breakers")
+def get_breaker_states():
+    """
+    Get per-platform circuit breaker state
+    """
+    return get_circuit_breakers().states()
+
+@app.get("/api/scrape/hedging")
+def get_hedging_stats():
+    """
+    Get how often hedged requests fired and won per platform
+    """
+    return get_hedger().stats()
+
+@app.get("/api/scrape/schedule")
+def get_scrape_schedule():
+    """
+    Get learned per-platform scrape intervals and their freshness versus the fixed schedule
+    """
+    try:
+        db = get_db_connection()
+        try:
+            scheduler = get_scheduler()
+            scheduler.learn(db, GoldScraper.PLATFORM_METHODS.keys())
+            return scheduler.report()
+        finally:
+            db.close()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error computing scrape schedule: {str(e)}")
+
+@app.on_event("shutdown")
+def close_browser_pool():
+    get_browser_pool().close()
+
 @app.get("/api/historical-data")
-def get_historical_data(period: str = "1y"):
+def get_historical_data(period: str = "1y", platform: str = ALL_PLATFORMS,
+                        max_points: int = HISTORY_MAX_POINTS, method: str = "lttb", format: str = "json",
+                        if_none_match: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None)):
     """
-    Get historical gold price data
+    Get historical gold price data, downsampled to at most max_points points
+    with LTTB (default) or min/max bucketing. format=compact returns
+    delta-encoded columns (see utils/wire_format.py)
     """
+    if max_points != 0 and max_points < 3:
+        raise HTTPException(status_code=400, detail="max_points must be 0 (no downsampling) or at least 3")
+    if method not in ("lttb", "minmax"):
+        raise HTTPException(status_code=400, detail="method must be 'lttb' or 'minmax'")
+    check_format(format)
+    
     try:
-        # Map period to days
-        period_days = {
-            "30d": 30,
-            "6m": 180,
-            "1y": 365,
-            "5y": 1825
-        }
+        days = PERIOD_DAYS.get(period, 365)
+        # The payload is fully determined by the series version and the window
+        end = history_window_end()
+        db = get_db_connection()
+        try:
+            version = get_data_version(db, platform)
+        finally:
+            db.close()
+        
+        encoding = negotiate_encoding(accept_encoding)
+        etag = make_etag("historical-data", period, platform, max_points, method, version, end.isoformat(),
+                         format, encoding)
+        if etag_matches(if_none_match, etag):
+            response = not_modified(etag, HISTORY_CACHE_CONTROL)
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+        
+        def load():
+            historical_data, granularity, source_points = get_historical_prices(days, platform, max_points, method, end)
+            return {
+                "data": historical_data,
+                "period": period,
+                "platform": platform,
+                "granularity": granularity,
+                "source_points": source_points,
+                "total_points": len(historical_data)
+            }
+        
+        key = (period, platform, max_points, method, version, end)
         
-        days = period_days.get(period, 365)
+        def render():
+            payload = history_cache.get(key, load)
+            if format == "compact":
+                payload = encode_history(payload)
+            return compress(orjson.dumps(payload), encoding)
         
-        # In real implementation, fetch from database
-        historical_data = get_historical_prices(days)
+        # Encoded and compressed bodies are cached too, per format and coding
+        body, applied = history_cache.get(key + (format, encoding), render)
+        return encoded_response(body, applied, etag, HISTORY_CACHE_CONTROL)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching historical data: {str(e)}")
+
+@app.post("/api/historical-data/backfill")
+def backfill_historical_data(request: BackfillRequest):
+    """
+    Recompute daily historical aggregates from raw prices for a date range
+    """
+    try:
+        start = datetime.strptime(request.start_date, "%Y-%m-%d")
+        last = datetime.strptime(request.end_date, "%Y-%m-%d") if request.end_date else datetime.now()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {str(e)}")
+    
+    end = last.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    
+    db = get_db_connection()
+    try:
+        return backfill_historical_prices(db, start, end, request.platforms)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error backfilling historical data: {str(e)}")
+    finally:
+        db.close()
+
+@app.get("/api/analytics/{indicator}")
+def get_analytics(indicator: str, period: str = "30d", platform: str = ALL_PLATFORMS,
+                  window: Optional[int] = None, smoothing: str = "simple"):
+    """
+    Compute a technical indicator over stored history, memoized until new ticks land
+    """
+    if indicator not in ANALYTICS_INDICATORS:
+        raise HTTPException(status_code=404, detail=f"Unknown indicator: {indicator}")
+    if smoothing not in ("simple", "wilder"):
+        raise HTTPException(status_code=400, detail="smoothing must be 'simple' or 'wilder'")
+    window = window or ANALYTICS_INDICATORS[indicator][0]
+    if window < 2:
+        raise HTTPException(status_code=400, detail="window must be at least 2")
+    
+    try:
+        days = PERIOD_DAYS.get(period, 30)
+        # The window slides every hour even when no new ticks land, so its end
+        # is part of the key as well as the series version
+        end = history_window_end()
+        db = get_db_connection()
+        try:
+            version = get_data_version(db, platform)
+        finally:
+            db.close()
         
+        params = (window, smoothing) if indicator == "rsi" else (window,)
+        key = (platform, (period, end.isoformat()), indicator, params, version)
+        result = analytics_cache.get(key, lambda: compute_indicator(indicator, days, platform, window, smoothing, end))
         return {
-            "data": historical_data,
+            "indicator": indicator,
+            "platform": platform,
             "period": period,
-            "total_points": len(historical_data)
+            "params": {"window": window, "smoothing": smoothing} if indicator == "rsi" else {"window": window},
+            "data_version": version,
+            **result
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching historical data: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error computing {indicator}: {str(e)}")
+
+@app.get("/api/indicators")
+def get_indicators(platform: Optional[str] = None):
+    """
+    Get the streaming indicators kept current at ingest time, per platform
+    """
+    db = get_db_connection()
+    try:
+        sets = load_indicator_sets(db, [platform] if platform else None)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading indicators: {str(e)}")
+    finally:
+        db.close()
+    
+    if platform and platform not in sets:
+        raise HTTPException(status_code=404, detail=f"No indicators for platform: {platform}")
+    return {name: indicator_set.values() for name, indicator_set in sets.items()}
 
 @app.post("/api/profit-analysis")
 def analyze_profit(request: ProfitAnalysisRequest):
@@ -185,7 +687,7 @@ def get_recommendations(investment_goal: str = "long_term"):
     Get AI-powered investment recommendations
     """
     try:
-        current_prices = get_gold_prices()
+        current_prices = get_cached_prices()
         
         recommendations = {
             "best_for_beginners": find_best_for_beginners(current_prices),
@@ -0,0 +1,267 @@
+import asyncio
+import atexit
+import os
+import queue
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Deque, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+logger = logging.getLogger(__name__)
+
+# Number of warm headless browsers kept per process
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+# Pages a browser serves before it is recycled to bound memory growth
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "50"))
+# Seconds a scraper waits for a free browser before giving up
+BROWSER_LEASE_TIMEOUT = float(os.getenv("BROWSER_LEASE_TIMEOUT", "30"))
+
+
+def create_chrome_driver():
+    """Create a headless Chrome WebDriver for dynamic content"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+
+    return webdriver.Chrome(options=chrome_options)
+
+
+class PooledBrowser:
+    """A WebDriver together with its usage bookkeeping"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.broken = False
+        # Left in use by a cancelled caller, so possibly still driven by a browser thread
+        self.abandoned = False
+        self.created_at = time.monotonic()
+
+
+class BrowserPool:
+    """
+    Keeps ``size`` warm headless browsers and leases them to scrapers.
+
+    Browsers are created lazily up to ``size`` and reused across scrape runs
+    and event loops. A browser is recycled after ``max_pages`` page loads or
+    as soon as a WebDriver call fails on it. All blocking Selenium calls run
+    on a dedicated thread pool so the event loop stays responsive.
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_pages: int = BROWSER_MAX_PAGES,
+        lease_timeout: float = BROWSER_LEASE_TIMEOUT,
+        driver_factory: Callable = create_chrome_driver,
+    ):
+        self.size = size
+        self.max_pages = max_pages
+        self.lease_timeout = lease_timeout
+        self.driver_factory = driver_factory
+
+        self._idle: "queue.LifoQueue[PooledBrowser]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._live = 0
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="browser")
+
+        self._wait_times: Deque[float] = deque(maxlen=500)
+        self._load_times: Deque[float] = deque(maxlen=500)
+        self.created = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.abandoned = 0
+        self.lease_timeouts = 0
+
+    def warm_up(self):
+        """Start every browser up front instead of on first use"""
+        while self._reserve_slot():
+            self._idle.put(self._create())
+
+    def _reserve_slot(self) -> bool:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+            if self._live < self.size:
+                self._live += 1
+                return True
+            return False
+
+    def _create(self) -> PooledBrowser:
+        try:
+            browser = PooledBrowser(self.driver_factory())
+        except Exception:
+            with self._lock:
+                self._live -= 1
+            raise
+        self.created += 1
+        return browser
+
+    async def _acquire(self) -> PooledBrowser:
+        # Waiting is done by polling on the event loop rather than blocking a
+        # thread, since the pool is shared between event loops and threads
+        deadline = time.monotonic() + self.lease_timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            if self._reserve_slot():
+                future = asyncio.get_running_loop().run_in_executor(self._executor, self._create)
+                try:
+                    return await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    # The browser is still being started; free its slot and
+                    # quit it once it is up instead of leaking both
+                    future.add_done_callback(self._discard_created)
+                    raise
+
+            if time.monotonic() >= deadline:
+                self.lease_timeouts += 1
+                raise TimeoutError(f"No browser available after {self.lease_timeout:.1f}s")
+            await asyncio.sleep(0.05)
+
+    def _release(self, browser: PooledBrowser):
+        if browser.abandoned or browser.broken or browser.pages >= self.max_pages or self._closed:
+            if browser.abandoned:
+                self.abandoned += 1
+            elif browser.broken:
+                self.crashed += 1
+            else:
+                self.recycled += 1
+            self._discard(browser)
+        else:
+            self._idle.put(browser)
+
+    def _discard(self, browser: PooledBrowser):
+        with self._lock:
+            self._live -= 1
+        # Quitting Chrome can take a while, keep it off the caller's path
+        threading.Thread(target=self._quit, args=(browser,), daemon=True).start()
+
+    def _discard_created(self, future: "asyncio.Future"):
+        if future.cancelled() or future.exception() is not None:
+            return  # _create already gave the slot back
+        self.abandoned += 1
+        self._discard(future.result())
+
+    def _quit(self, browser: PooledBrowser):
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting browser: {e}")
+
+    @asynccontextmanager
+    async def lease(self):
+        """Lease a browser for the duration of the ``async with`` block"""
+        started = time.perf_counter()
+        browser = await self._acquire()
+        self._wait_times.append(time.perf_counter() - started)
+        try:
+            yield browser
+        except WebDriverException:
+            browser.broken = True
+            raise
+        except asyncio.CancelledError:
+            # A cancelled caller (e.g. a scrape timeout) leaves its WebDriver
+            # call running on the browser thread; never hand that driver out again
+            browser.abandoned = True
+            raise
+        finally:
+            self._release(browser)
+
+    async def run(self, func: Callable, *args):
+        """Run a blocking WebDriver call on the browser thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def fetch(self, url: str, wait_element: Optional[str] = None, wait_timeout: float = 10) -> str:
+        """Load ``url`` in a pooled browser and return the rendered page source"""
+
+        def load(driver):
+            driver.get(url)
+            if wait_element:
+                try:
+                    WebDriverWait(driver, wait_timeout).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, wait_element))
+                    )
+                except TimeoutException:
+                    logger.warning(f"Timed out waiting for {wait_element} on {url}")
+            return driver.page_source
+
+        async with self.lease() as browser:
+            started = time.perf_counter()
+            html = await self.run(load, browser.driver)
+            self._load_times.append(time.perf_counter() - started)
+            browser.pages += 1
+            return html
+
+    def close(self):
+        """Quit every idle browser; leased ones are quit when released"""
+        self._closed = True
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._live -= 1
+            self._quit(browser)
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        """Pool occupancy and pool-wait/page-load timings"""
+        return {
+            "size": self.size,
+            "live": self._live,
+            "idle": self._idle.qsize(),
+            "max_pages": self.max_pages,
+            "created": self.created,
+            "recycled": self.recycled,
+            "crashed": self.crashed,
+            "abandoned": self.abandoned,
+            "lease_timeouts": self.lease_timeouts,
+            "pool_wait_ms": _timing_summary(self._wait_times),
+            "page_load_ms": _timing_summary(self._load_times),
+        }
+
+
+def _timing_summary(samples: Deque[float]) -> dict:
+    if not samples:
+        return {"count": 0, "avg": None, "p95": None, "max": None}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "avg": round(sum(ordered) / len(ordered) * 1000, 2),
+        "p95": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 2),
+        "max": round(ordered[-1] * 1000, 2),
+    }
+
+
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide browser pool, created on first use"""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool()
+            atexit.register(_browser_pool.close)
+        return _browser_pool
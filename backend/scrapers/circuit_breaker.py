@@ -0,0 +1,158 @@
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from models.gold_price import GoldPrice
+
+# Consecutive failures that open a platform's breaker
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+# Seconds a breaker stays open the first time; doubles on every re-open
+BREAKER_BASE_BACKOFF = float(os.getenv("BREAKER_BASE_BACKOFF", "300"))
+BREAKER_MAX_BACKOFF = float(os.getenv("BREAKER_MAX_BACKOFF", "21600"))
+# Fraction of the backoff randomised so dead sites are not all retried together
+BREAKER_JITTER = float(os.getenv("BREAKER_JITTER", "0.2"))
+# Oldest last-known price still served while a breaker is open
+STALE_PRICE_MAX_AGE = float(os.getenv("STALE_PRICE_MAX_AGE", "86400"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker for a single platform.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and the
+    platform is skipped until the backoff expires. The next call is a single
+    half-open trial: success closes the breaker, failure re-opens it with the
+    backoff doubled (up to ``max_backoff``) and jittered.
+    """
+
+    def __init__(
+        self,
+        platform: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        base_backoff: float = BREAKER_BASE_BACKOFF,
+        max_backoff: float = BREAKER_MAX_BACKOFF,
+        jitter: float = BREAKER_JITTER,
+    ):
+        self.platform = platform
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_count = 0
+        self.open_until = 0.0
+        self.trial_in_flight = False
+        self.last_error: Optional[str] = None
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a scrape of this platform may run now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() >= self.open_until:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def cancel_trial(self):
+        """Give back a half-open trial that never got to run"""
+        with self._lock:
+            self.trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_count = 0
+            self.trial_in_flight = False
+            self.last_error = None
+
+    def record_failure(self, error: Optional[str] = None):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            self.trial_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.opened_count += 1
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.opened_count - 1))
+        backoff *= 1 + random.uniform(-self.jitter, self.jitter)
+        self.state = OPEN
+        self.open_until = time.monotonic() + backoff
+
+    def to_dict(self) -> dict:
+        retry_in = max(self.open_until - time.monotonic(), 0) if self.state == OPEN else 0
+        return {
+            "platform": self.platform,
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.opened_count,
+            "retry_in_seconds": round(retry_in, 1),
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Breakers for every platform plus their last known good prices"""
+
+    def __init__(self, stale_max_age: float = STALE_PRICE_MAX_AGE, **breaker_options):
+        self.stale_max_age = stale_max_age
+        self.breaker_options = breaker_options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._last_good: Dict[str, GoldPrice] = {}
+        self._lock = threading.Lock()
+
+    def get(self, platform: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(platform)
+            if breaker is None:
+                breaker = CircuitBreaker(platform, **self.breaker_options)
+                self._breakers[platform] = breaker
+            return breaker
+
+    def record_price(self, platform: str, price: GoldPrice):
+        self._last_good[platform] = price
+
+    def stale_price(self, platform: str) -> Optional[GoldPrice]:
+        """Last good price for ``platform`` if it is recent enough to serve"""
+        price = self._last_good.get(platform)
+        if price is None:
+            return None
+        if datetime.now() - price.timestamp > timedelta(seconds=self.stale_max_age):
+            return None
+        return price
+
+    def states(self) -> dict:
+        breakers = [b.to_dict() for b in self._breakers.values()]
+        for breaker in breakers:
+            price = self._last_good.get(breaker["platform"])
+            breaker["last_good_at"] = price.timestamp.isoformat() if price else None
+        return {
+            "open": sum(1 for b in breakers if b["state"] != CLOSED),
+            "breakers": breakers,
+        }
+
+
+_circuit_breakers = CircuitBreakerRegistry()
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Process-wide breaker registry, shared across scrape runs"""
+    return _circuit_breakers
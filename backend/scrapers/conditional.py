@@ -0,0 +1,144 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from models.gold_price import GoldPrice
+
+
+@dataclass
+class PageValidator:
+    """What we remember about the last successful fetch of a URL"""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: str
+    body_size: int
+    parse_seconds: float
+    price: GoldPrice
+
+
+class ConditionalFetchCache:
+    """
+    Per-URL validators for conditional requests and content-hash short-circuiting.
+
+    Stores the ETag, Last-Modified value and body hash of every platform page
+    together with the price parsed from it, so an unchanged page can reuse the
+    previous price instead of being downloaded and parsed again.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, PageValidator] = {}
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.not_modified = 0
+        self.hash_matches = 0
+        self.parsed = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+        self.parse_seconds = 0.0
+        self.parse_seconds_saved = 0.0
+
+    def get(self, url: str) -> Optional[PageValidator]:
+        return self._entries.get(url)
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for ``url``, if we have validators"""
+        entry = self._entries.get(url)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def reuse(self, url: str, not_modified: bool) -> Optional[GoldPrice]:
+        """
+        Return the cached price for an unchanged page with a fresh timestamp.
+
+        ``not_modified`` is True for a 304 response (nothing was downloaded)
+        and False when the downloaded body hashed to the stored value.
+        """
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        with self._lock:
+            if not_modified:
+                self.not_modified += 1
+                self.bytes_saved += entry.body_size
+            else:
+                self.hash_matches += 1
+            self.parse_seconds_saved += entry.parse_seconds
+        return entry.price.model_copy(update={"timestamp": datetime.now()})
+
+    def fetch_result(
+        self,
+        url: str,
+        status_code: int,
+        headers,
+        body: bytes,
+        parse: Callable[[str], GoldPrice],
+        encoding: str = "utf-8",
+    ) -> GoldPrice:
+        """Turn a (possibly conditional) response into a price, parsing only if needed"""
+        with self._lock:
+            self.requests += 1
+            self.bytes_downloaded += len(body)
+
+        if status_code == 304:
+            price = self.reuse(url, not_modified=True)
+            if price is not None:
+                return price
+            raise ValueError(f"Got 304 for {url} without a cached page")
+
+        body_hash = hashlib.sha256(body).hexdigest()
+        entry = self._entries.get(url)
+        if entry is not None and entry.body_hash == body_hash:
+            self._remember(url, headers, entry.body_hash, entry.body_size, entry.parse_seconds, entry.price)
+            return self.reuse(url, not_modified=False)
+
+        started = time.perf_counter()
+        price = parse(body.decode(encoding or "utf-8", errors="replace"))
+        parse_seconds = time.perf_counter() - started
+        with self._lock:
+            self.parsed += 1
+            self.parse_seconds += parse_seconds
+
+        self._remember(url, headers, body_hash, len(body), parse_seconds, price)
+        return price
+
+    def _remember(self, url, headers, body_hash, body_size, parse_seconds, price):
+        headers = headers or {}
+        self._entries[url] = PageValidator(
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            body_hash=body_hash,
+            body_size=body_size,
+            parse_seconds=parse_seconds,
+            price=price,
+        )
+
+    def stats(self) -> dict:
+        """Counters showing how much bandwidth and parsing was avoided"""
+        return {
+            "urls": len(self._entries),
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "hash_matches": self.hash_matches,
+            "parsed": self.parsed,
+            "bytes_downloaded": self.bytes_downloaded,
+            "bytes_saved": self.bytes_saved,
+            "parse_ms": round(self.parse_seconds * 1000, 2),
+            "parse_ms_saved": round(self.parse_seconds_saved * 1000, 2),
+        }
+
+
+_page_cache = ConditionalFetchCache()
+
+
+def get_page_cache() -> ConditionalFetchCache:
+    """Process-wide page validator cache, shared across scrape runs"""
+    return _page_cache
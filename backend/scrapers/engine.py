@@ -0,0 +1,164 @@
+import asyncio
+import os
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from models.gold_price import GoldPrice
+from scrapers.circuit_breaker import CircuitBreakerRegistry
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of platforms scraped at the same time
+SCRAPE_MAX_CONCURRENCY = int(os.getenv("SCRAPE_MAX_CONCURRENCY", "8"))
+# Seconds a single platform may take before it is abandoned
+SCRAPE_PLATFORM_TIMEOUT = float(os.getenv("SCRAPE_PLATFORM_TIMEOUT", "10"))
+# Wall-clock budget for a whole scrape run across every platform
+SCRAPE_DEADLINE = float(os.getenv("SCRAPE_DEADLINE", "30"))
+
+PlatformJob = Callable[[], Awaitable[GoldPrice]]
+
+
+@dataclass
+class PlatformResult:
+    """Outcome of scraping a single platform"""
+    platform: str
+    status: str  # "ok", "timeout", "error", "circuit_open"
+    latency: float = 0.0
+    queued: float = 0.0
+    price: Optional[GoldPrice] = None
+    error: Optional[str] = None
+    stale: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "platform": self.platform,
+            "status": self.status,
+            "latency_ms": round(self.latency * 1000, 2),
+            "queued_ms": round(self.queued * 1000, 2),
+            "error": self.error,
+            "stale": self.stale,
+        }
+
+
+@dataclass
+class ScrapeReport:
+    """Per-platform results of one scrape run"""
+    results: List[PlatformResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def prices(self) -> List[GoldPrice]:
+        return [r.price for r in self.results if r.price is not None]
+
+    def summary(self) -> dict:
+        counts: Dict[str, int] = {}
+        for result in self.results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        return {
+            "elapsed_ms": round(self.elapsed * 1000, 2),
+            "platforms": len(self.results),
+            "outcomes": counts,
+            "results": [r.to_dict() for r in self.results],
+        }
+
+
+class ScrapeEngine:
+    """
+    Runs platform scrape jobs concurrently under one wall-clock budget.
+
+    At most ``max_concurrency`` jobs run at once. Each job gets at most
+    ``platform_timeout`` seconds, and never more than what is left of the
+    overall ``deadline``, so a run always finishes within the deadline
+    regardless of how many platforms are slow.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = SCRAPE_MAX_CONCURRENCY,
+        platform_timeout: float = SCRAPE_PLATFORM_TIMEOUT,
+        deadline: float = SCRAPE_DEADLINE,
+    ):
+        self.max_concurrency = max_concurrency
+        self.platform_timeout = platform_timeout
+        self.deadline = deadline
+
+    async def run(
+        self,
+        jobs: Dict[str, PlatformJob],
+        breakers: Optional[CircuitBreakerRegistry] = None,
+    ) -> ScrapeReport:
+        """
+        Run every job and collect a result for each platform.
+
+        With ``breakers``, platforms whose breaker is open are not scraped and
+        their last known good price is served instead, marked as stale.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline_at = started + self.deadline
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_one(platform: str, job: PlatformJob) -> PlatformResult:
+            # Open breakers are checked before queueing so dead platforms never
+            # take a concurrency slot
+            breaker = breakers.get(platform) if breakers else None
+            if breaker and not breaker.allow():
+                stale = breakers.stale_price(platform)
+                return PlatformResult(platform, "circuit_open", price=stale,
+                                      stale=stale is not None, error=breaker.last_error)
+
+            try:
+                queued_at = loop.time()
+                try:
+                    await asyncio.wait_for(semaphore.acquire(), max(deadline_at - queued_at, 0))
+                except asyncio.TimeoutError:
+                    if breaker:
+                        breaker.cancel_trial()
+                    return PlatformResult(platform, "timeout", queued=loop.time() - queued_at,
+                                          error="deadline exceeded while queued")
+
+                try:
+                    start = loop.time()
+                    budget = min(self.platform_timeout, deadline_at - start)
+                    if budget <= 0:
+                        if breaker:
+                            breaker.cancel_trial()
+                        return PlatformResult(platform, "timeout", queued=start - queued_at,
+                                              error="deadline exceeded while queued")
+
+                    try:
+                        price = await asyncio.wait_for(job(), budget)
+                        result = PlatformResult(platform, "ok", latency=loop.time() - start,
+                                                queued=start - queued_at, price=price)
+                    except asyncio.TimeoutError:
+                        result = PlatformResult(platform, "timeout", latency=loop.time() - start,
+                                                queued=start - queued_at, error=f"timed out after {budget:.2f}s")
+                    except Exception as e:
+                        result = PlatformResult(platform, "error", latency=loop.time() - start,
+                                                queued=start - queued_at, error=str(e) or type(e).__name__)
+
+                    if breaker:
+                        if result.status == "ok":
+                            breaker.record_success()
+                            breakers.record_price(platform, result.price)
+                        else:
+                            breaker.record_failure(result.error)
+                    return result
+                finally:
+                    semaphore.release()
+            except asyncio.CancelledError:
+                # Cancelled by the caller: give a half-open trial back, or the
+                # breaker would stay half-open with no trial left to run
+                if breaker:
+                    breaker.cancel_trial()
+                raise
+
+        results = await asyncio.gather(*(run_one(name, job) for name, job in jobs.items()))
+        report = ScrapeReport(results=list(results), elapsed=loop.time() - started)
+
+        for result in report.results:
+            if result.status not in ("ok", "circuit_open"):
+                logger.warning(f"Scraping {result.platform} {result.status}: {result.error}")
+
+        return report
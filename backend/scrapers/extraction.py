@@ -0,0 +1,105 @@
+import html as html_lib
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+# Price selectors per platform, tried in order until one matches
+PLATFORM_SELECTORS: Dict[str, List[str]] = {
+    "Paytm Gold": ["span.gold-price", ".buy-price"],
+    "Tanishq": ["div.gold-rate-today", ".gold-rate-container .rate"],
+}
+
+# tag, tag.class, .class, tag#id or #id
+_SIMPLE_SELECTOR = re.compile(r'^([a-zA-Z][a-zA-Z0-9]*)?(?:\.([\w-]+)|#([\w-]+))?$')
+_TAG = re.compile(r'<[^>]+>')
+_WHITESPACE = re.compile(r'\s+')
+
+
+@dataclass(frozen=True)
+class CompiledSelector:
+    """A selector compiled for targeted extraction; ``start`` is None when a full parse is needed"""
+    selector: str
+    start: Optional["re.Pattern"]
+
+
+@lru_cache(maxsize=256)
+def compile_selector(selector: str) -> CompiledSelector:
+    """
+    Compile a simple selector into a start-tag pattern.
+
+    Selectors made of a single tag, class or id are matched directly in the
+    raw HTML. Anything more complex (descendants, attributes, pseudo classes)
+    falls back to a full lxml parse.
+    """
+    match = _SIMPLE_SELECTOR.match(selector.strip())
+    if not match or not any(match.groups()):
+        return CompiledSelector(selector, None)
+
+    tag, css_class, element_id = match.groups()
+    tag_pattern = re.escape(tag) if tag else r'[a-zA-Z][a-zA-Z0-9]*'
+    if css_class:
+        attr = r'''\bclass\s*=\s*["'][^"']*(?<![\w-])''' + re.escape(css_class) + r'''(?![\w-])[^"']*["']'''
+    elif element_id:
+        attr = r'''\bid\s*=\s*["']''' + re.escape(element_id) + r'''["']'''
+    else:
+        attr = ''
+
+    start = re.compile(rf'<({tag_pattern})\b[^>]*{attr}[^>]*>', re.IGNORECASE)
+    return CompiledSelector(selector, start)
+
+
+def _element_text(page: str, compiled: CompiledSelector) -> Optional[str]:
+    match = compiled.start.search(page)
+    if not match:
+        return None
+    if match.group(0).endswith('/>'):
+        return ''
+
+    tag = match.group(1)
+    # Walk to the matching close tag, accounting for nested tags of the same name
+    boundary = re.compile(rf'<(/?){re.escape(tag)}\b[^>]*>', re.IGNORECASE)
+    depth = 1
+    position = match.end()
+    for token in boundary.finditer(page, position):
+        if token.group(1):
+            depth -= 1
+        elif not token.group(0).endswith('/>'):
+            depth += 1
+        if depth == 0:
+            return _clean(page[match.end():token.start()])
+    return _clean(page[match.end():])
+
+
+def _clean(fragment: str) -> str:
+    text = _TAG.sub(' ', fragment)
+    return _WHITESPACE.sub(' ', html_lib.unescape(text)).strip()
+
+
+def extract_text(page: str, selectors: List[str]) -> Optional[str]:
+    """
+    Return the text of the first element matched by any of ``selectors``.
+
+    Simple selectors are resolved by scanning the raw HTML for the first
+    matching start tag and stop there, without building a document tree.
+    """
+    soup = None
+    for selector in selectors:
+        compiled = compile_selector(selector)
+        if compiled.start is not None:
+            text = _element_text(page, compiled)
+        else:
+            if soup is None:
+                soup = BeautifulSoup(page, 'lxml')
+            element = soup.select_one(selector)
+            text = _WHITESPACE.sub(' ', element.get_text(' ')).strip() if element is not None else None
+        if text:
+            return text
+    return None
+
+
+def extract_platform_text(page: str, platform: str) -> Optional[str]:
+    """Return the price text for ``platform`` using its registered selectors"""
+    return extract_text(page, PLATFORM_SELECTORS.get(platform, []))
@@ -1,113 +1,98 @@
-import asyncio
-import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from typing import List, Dict, Optional
-import json
+import os
+import httpx
+from typing import Callable, Iterable, List, Dict, Optional
 import re
 from datetime import datetime
 
 from models.gold_price import GoldPrice
+from scrapers.engine import ScrapeEngine, ScrapeReport, PlatformJob
+from scrapers.browser_pool import BrowserPool, get_browser_pool
+from scrapers.extraction import extract_platform_text
+from scrapers.conditional import ConditionalFetchCache, get_page_cache
+from scrapers.circuit_breaker import CircuitBreakerRegistry, get_circuit_breakers
+from scrapers.hedging import Hedger, get_hedger
 
-class GoldScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.driver = None
-        
-    def __enter__(self):
-        return self
-        
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            self.session.close()
-        if self.driver:
-            self.driver.quit()
-
-    def setup_selenium(self):
-        """Setup Selenium WebDriver for dynamic content"""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
-        return self.driver
+# Scrape the platforms that have a live page implementation (RealGoldScraper)
+# instead of serving mock prices for them
+SCRAPE_LIVE_PAGES = os.getenv("SCRAPE_LIVE_PAGES", "false").lower() == "true"
 
-    def scrape_all_platforms(self) -> List[GoldPrice]:
-        """Scrape gold prices from all platforms"""
-        prices = []
-        
-        # For now, return simulated data since actual scraping requires proper setup
-        # In production, this would scrape real websites
-        simulated_prices = [
-            GoldPrice(
-                platform="Paytm Gold",
-                type="digital",
-                price_per_gram=6720.0,
-                making_charges=0.0,
-                gst=3.0,
-                total_price=6921.6,
-                timestamp=datetime.now(),
-                features=["No storage cost", "Instant liquidity", "SIP available"]
-            ),
-            GoldPrice(
-                platform="PhonePe Gold",
-                type="digital", 
-                price_per_gram=6715.0,
-                making_charges=0.0,
-                gst=3.0,
-                total_price=6916.45,
-                timestamp=datetime.now(),
-                features=["24/7 trading", "No minimum amount", "Digital certificate"]
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+class GoldScraper:
+    # Scrape method for every supported platform, keyed by platform name
+    PLATFORM_METHODS = {
+        # Digital gold platforms
+        "Paytm Gold": "scrape_paytm_gold",
+        "PhonePe Gold": "scrape_phonepe_gold",
+        "Google Pay Gold": "scrape_googlepay_gold",
+        "Amazon Pay Gold": "scrape_amazon_pay_gold",
+        "MobiKwik Gold": "scrape_mobikwik_gold",
+        "FreeCharge Gold": "scrape_freecharge_gold",
+        "Bajaj Finserv Gold": "scrape_bajaj_finserv_gold",
+        "MMTC-PAMP Gold": "scrape_mmtc_pamp_gold",
+        "SafeGold": "scrape_safegold",
+        "Augmont Gold": "scrape_augmont_gold",
+        "Digital Gold India": "scrape_digital_gold_india",
+        "Jar App Gold": "scrape_jar_app_gold",
+        # Physical gold platforms
+        "Tanishq": "scrape_tanishq",
+        "Kalyan Jewellers": "scrape_kalyan_jewellers",
+        "HDFC Bank Gold": "scrape_hdfc_gold",
+        "ICICI Bank Gold": "scrape_icici_gold",
+        "SBI Gold": "scrape_sbi_gold",
+        "Axis Bank Gold": "scrape_axis_bank_gold",
+        "Kotak Gold": "scrape_kotak_gold",
+        "Malabar Gold": "scrape_malabar_gold",
+        "Joyalukkas": "scrape_joyalukkas",
+        "PC Jeweller": "scrape_pc_jeweller",
+    }
+
+    def __init__(
+        self,
+        engine: Optional[ScrapeEngine] = None,
+        browser_pool: Optional[BrowserPool] = None,
+        page_cache: Optional[ConditionalFetchCache] = None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+        hedger: Optional[Hedger] = None,
+    ):
+        self.engine = engine or ScrapeEngine()
+        # One pooled async client shared by every platform in a run
+        self.client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            timeout=httpx.Timeout(self.engine.platform_timeout),
+            limits=httpx.Limits(
+                max_connections=self.engine.max_concurrency * 2,
+                max_keepalive_connections=self.engine.max_concurrency,
             ),
-            # Add more simulated prices...
-        ]
-        
-        return simulated_prices
-            self.scrape_googlepay_gold(),
-            self.scrape_amazon_pay_gold(),
-            self.scrape_mobikwik_gold(),
-            self.scrape_freecharge_gold(),
-            self.scrape_bajaj_finserv_gold(),
-            self.scrape_mmtc_pamp_gold(),
-            self.scrape_safegold(),
-            self.scrape_augmont_gold(),
-            self.scrape_digital_gold_india(),
-            self.scrape_jar_app_gold(),
-            return_exceptions=True
-        )
-        
-        # Scrape physical gold platforms
-        physical_prices = await asyncio.gather(
-            self.scrape_tanishq(),
-            self.scrape_kalyan_jewellers(),
-            self.scrape_hdfc_gold(),
-            self.scrape_icici_gold(),
-            self.scrape_sbi_gold(),
-            self.scrape_axis_bank_gold(),
-            self.scrape_kotak_gold(),
-            self.scrape_malabar_gold(),
-            self.scrape_joyalukkas(),
-            self.scrape_pc_jeweller(),
-            return_exceptions=True
         )
-        
-        # Combine results
-        all_prices = digital_prices + physical_prices
-        
-        for price in all_prices:
-            if isinstance(price, GoldPrice):
-                prices.append(price)
-            elif isinstance(price, Exception):
-                print(f"Scraping error: {price}")
-                
-        return prices
+        # Warm headless browsers are shared process-wide, not owned per scraper
+        self.browser_pool = browser_pool or get_browser_pool()
+        # ETag/Last-Modified/body hash of every page, kept across runs
+        self.page_cache = page_cache or get_page_cache()
+        # Per-platform circuit breakers, kept across runs
+        self.breakers = breakers or get_circuit_breakers()
+        # Hedged second requests for slow, opted-in platforms
+        self.hedger = hedger or get_hedger()
+        self.last_report: Optional[ScrapeReport] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.client.aclose()
+
+    def platform_jobs(self, platforms: Optional[Iterable[str]] = None) -> Dict[str, PlatformJob]:
+        """Scrape jobs for ``platforms`` (default: all), keyed by platform name"""
+        names = self.PLATFORM_METHODS.keys() if platforms is None else platforms
+        return {name: getattr(self, self.PLATFORM_METHODS[name]) for name in names}
+
+    async def scrape_all_platforms(self, platforms: Optional[Iterable[str]] = None) -> List[GoldPrice]:
+        """Scrape gold prices from all platforms (or just ``platforms``) concurrently"""
+        self.last_report = await self.engine.run(self.platform_jobs(platforms), self.breakers)
+        return self.last_report.prices
 
     async def scrape_paytm_gold(self) -> GoldPrice:
         """Scrape Paytm Gold prices"""
@@ -333,135 +318,7 @@ class GoldScraper:
         except Exception as e:
             print(f"Error scraping Jar App Gold: {e}")
             raise
-        """Scrape HDFC Bank Gold prices"""
-        try:
-            return GoldPrice(
-                platform="HDFC Bank Gold",
-                type="physical",
-                price_per_gram=6780.0,
-                making_charges=400.0,
-                gst=3.0,
-                features=["Bank guarantee", "Locker facility", "Insurance covered"],
-                timestamp=datetime.now()
-            )
-        except Exception as e:
-            print(f"Error scraping HDFC Gold: {e}")
-            raise
-
-    async def scrape_with_requests(self, url: str, headers: Dict[str, str] = None) -> str:
-        """Generic scraping with aiohttp"""
-        if not headers:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-        
-        async with self.session.get(url, headers=headers) as response:
-            return await response.text()
-
-    def scrape_with_selenium(self, url: str, wait_element: str = None) -> str:
-        """Generic scraping with Selenium for dynamic content"""
-        if not self.driver:
-            self.setup_selenium()
-            
-        self.driver.get(url)
-        
-        if wait_element:
-            wait = WebDriverWait(self.driver, 10)
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_element)))
-        
-        return self.driver.page_source
-
-    def extract_price_from_text(self, text: str) -> Optional[float]:
-        """Extract price from text using regex"""
-        # Common patterns for Indian currency
-        patterns = [
-            r'₹\s*([0-9,]+\.?[0-9]*)',
-            r'Rs\.?\s*([0-9,]+\.?[0-9]*)',
-            r'INR\s*([0-9,]+\.?[0-9]*)',
-            r'([0-9,]+\.?[0-9]*)\s*₹'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                price_str = match.group(1).replace(',', '')
-                try:
-                    return float(price_str)
-                except ValueError:
-                    continue
-        
-        return None
 
-    def clean_text(self, text: str) -> str:
-        """Clean scraped text"""
-        return re.sub(r'\s+', ' ', text.strip())
-
-# Example usage for real scraping implementations:
-
-class RealGoldScraper(GoldScraper):
-    """Extended scraper with real implementation examples"""
-    
-    async def scrape_paytm_gold_real(self) -> GoldPrice:
-        """Real Paytm Gold scraping implementation"""
-        try:
-            url = "https://paytm.com/gold"
-            html = await self.scrape_with_requests(url)
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Find price element (adjust selector based on actual website)
-            price_element = soup.find('span', class_='gold-price')
-            if price_element:
-                price_text = price_element.get_text()
-                price = self.extract_price_from_text(price_text)
-                
-                return GoldPrice(
-                    platform="Paytm Gold",
-                    type="digital",
-                    price_per_gram=price or 6720.0,
-                    making_charges=0.0,
-                    gst=3.0,
-                    features=["No storage cost", "Instant liquidity", "SIP available"],
-                    timestamp=datetime.now()
-                )
-        except Exception as e:
-            print(f"Error scraping Paytm Gold: {e}")
-            # Return mock data as fallback
-            return await self.scrape_paytm_gold()
-
-    def scrape_tanishq_real(self) -> GoldPrice:
-        """Real Tanishq scraping with Selenium"""
-        try:
-            url = "https://www.tanishq.co.in/gold-rate"
-            html = self.scrape_with_selenium(url, '.gold-rate-container')
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Find price element
-            price_element = soup.find('div', class_='gold-rate-today')
-            if price_element:
-                price_text = price_element.get_text()
-                price = self.extract_price_from_text(price_text)
-                
-                return GoldPrice(
-                    platform="Tanishq",
-                    type="physical",
-                    price_per_gram=price or 6800.0,
-                    making_charges=500.0,
-                    gst=3.0,
-                    features=["Certified purity", "Buyback guarantee", "Physical delivery"],
-                    timestamp=datetime.now()
-                )
-        except Exception as e:
-            print(f"Error scraping Tanishq: {e}")
-            # Return mock data as fallback
-            return GoldPrice(
-                platform="Tanishq",
-                type="physical",
-                price_per_gram=6800.0,
-                making_charges=500.0,
-                gst=3.0,
-                features=["Certified purity", "Buyback guarantee", "Physical delivery"],
-                timestamp=datetime.now()
-            )
     async def scrape_hdfc_gold(self) -> GoldPrice:
         """Scrape HDFC Bank Gold prices"""
         try:
@@ -588,4 +445,144 @@ class RealGoldScraper(GoldScraper):
             )
         except Exception as e:
             print(f"Error scraping PC Jeweller: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    async def scrape_with_requests(self, url: str, headers: Dict[str, str] = None) -> str:
+        """Generic scraping over the shared async HTTP client"""
+        response = await self.client.get(url, headers=headers)
+        response.raise_for_status()
+        return response.text
+
+    async def scrape_with_selenium(self, url: str, wait_element: str = None) -> str:
+        """Generic scraping with a pooled headless browser for dynamic content"""
+        return await self.browser_pool.fetch(url, wait_element)
+
+    async def scrape_page(
+        self,
+        url: str,
+        parse: Callable[[str], GoldPrice],
+        headers: Dict[str, str] = None,
+        platform: str = None,
+    ) -> GoldPrice:
+        """Fetch ``url`` conditionally and parse it only if the page changed"""
+        request_headers = {**self.page_cache.request_headers(url), **(headers or {})}
+
+        async def attempt(target: str):
+            return await self.client.get(target, headers=request_headers)
+
+        if self.hedger.enabled(platform):
+            response = await self.hedger.run(platform, url, attempt)
+        else:
+            response = await attempt(url)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return self.page_cache.fetch_result(
+            url, response.status_code, response.headers, response.content, parse, response.encoding
+        )
+
+    async def scrape_rendered_page(self, url: str, parse: Callable[[str], GoldPrice], wait_element: str = None) -> GoldPrice:
+        """Render ``url`` in a pooled browser and parse it only if the page changed"""
+        html = await self.scrape_with_selenium(url, wait_element)
+        return self.page_cache.fetch_result(url, 200, None, html.encode("utf-8"), parse)
+
+    def extract_price_from_text(self, text: str) -> Optional[float]:
+        """Extract price from text using regex"""
+        # Common patterns for Indian currency
+        patterns = [
+            r'₹\s*([0-9,]+\.?[0-9]*)',
+            r'Rs\.?\s*([0-9,]+\.?[0-9]*)',
+            r'INR\s*([0-9,]+\.?[0-9]*)',
+            r'([0-9,]+\.?[0-9]*)\s*₹'
+        ]
+        
+        for pattern in patterns:
+            match = re.search(pattern, text)
+            if match:
+                price_str = match.group(1).replace(',', '')
+                try:
+                    return float(price_str)
+                except ValueError:
+                    continue
+        
+        return None
+
+    def clean_text(self, text: str) -> str:
+        """Clean scraped text"""
+        return re.sub(r'\s+', ' ', text.strip())
+
+# Example usage for real scraping implementations:
+
+class RealGoldScraper(GoldScraper):
+    """
+    Extended scraper with real implementation examples.
+
+    Platforms with a live implementation are scraped through it by the
+    engine; failures are left to the engine so circuit breakers see them and
+    serve the last good price, rather than being masked by mock data.
+    """
+
+    PLATFORM_METHODS = {
+        **GoldScraper.PLATFORM_METHODS,
+        "Paytm Gold": "scrape_paytm_gold_real",
+        "Tanishq": "scrape_tanishq_real",
+    }
+    
+    async def scrape_paytm_gold_real(self) -> GoldPrice:
+        """Real Paytm Gold scraping implementation"""
+        try:
+            url = "https://paytm.com/gold"
+            return await self.scrape_page(url, self.parse_paytm_gold, platform="Paytm Gold")
+        except Exception as e:
+            print(f"Error scraping Paytm Gold: {e}")
+            raise
+
+    def parse_paytm_gold(self, html: str) -> GoldPrice:
+        """Parse the Paytm Gold price page"""
+        # Find price element (adjust selectors in PLATFORM_SELECTORS based on actual website)
+        price_text = extract_platform_text(html, "Paytm Gold")
+        price = self.extract_price_from_text(price_text) if price_text else None
+        if price is None:
+            raise ValueError("Price element not found on Paytm Gold page")
+
+        return GoldPrice(
+            platform="Paytm Gold",
+            type="digital",
+            price_per_gram=price,
+            making_charges=0.0,
+            gst=3.0,
+            features=["No storage cost", "Instant liquidity", "SIP available"],
+            timestamp=datetime.now()
+        )
+
+    async def scrape_tanishq_real(self) -> GoldPrice:
+        """Real Tanishq scraping with Selenium"""
+        try:
+            url = "https://www.tanishq.co.in/gold-rate"
+            return await self.scrape_rendered_page(url, self.parse_tanishq, '.gold-rate-container')
+        except Exception as e:
+            print(f"Error scraping Tanishq: {e}")
+            raise
+
+    def parse_tanishq(self, html: str) -> GoldPrice:
+        """Parse the rendered Tanishq gold rate page"""
+        # Find price element
+        price_text = extract_platform_text(html, "Tanishq")
+        price = self.extract_price_from_text(price_text) if price_text else None
+        if price is None:
+            raise ValueError("Price element not found on Tanishq page")
+
+        return GoldPrice(
+            platform="Tanishq",
+            type="physical",
+            price_per_gram=price,
+            making_charges=500.0,
+            gst=3.0,
+            features=["Certified purity", "Buyback guarantee", "Physical delivery"],
+            timestamp=datetime.now()
+        )
+
+
+def create_scraper(**kwargs) -> GoldScraper:
+    """The scraper used for scrape runs: live pages with SCRAPE_LIVE_PAGES, mock data otherwise"""
+    scraper_class = RealGoldScraper if SCRAPE_LIVE_PAGES else GoldScraper
+    return scraper_class(**kwargs)
@@ -0,0 +1,163 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class HedgePolicy:
+    """
+    Opt-in hedging settings for one platform.
+
+    A second request is fired once the first has been outstanding for the
+    platform's rolling p95 latency. ``budget`` caps hedges as a fraction of
+    requests so hedging can never more than slightly increase load.
+    """
+    mirror_urls: List[str] = field(default_factory=list)
+    budget: float = 0.1
+    min_samples: int = 20
+    min_delay: float = 0.05
+    percentile: float = 0.95
+
+
+# Platforms that opt in to hedging; everything else is fetched once
+HEDGE_POLICIES: Dict[str, HedgePolicy] = {
+    "Paytm Gold": HedgePolicy(),
+}
+
+
+class PlatformHedgeState:
+    """Rolling latency window and hedge counters for one platform"""
+
+    def __init__(self, policy: HedgePolicy, window: int = 200):
+        self.policy = policy
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.budget_denied = 0
+        self._mirror_index = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there is too little history"""
+        if len(self.latencies) < self.policy.min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(int(self.policy.percentile * len(ordered)), len(ordered) - 1)
+        return max(ordered[index], self.policy.min_delay)
+
+    def can_hedge(self) -> bool:
+        # One hedge is always allowed so a cold platform can still be hedged
+        return self.hedges_fired < 1 + self.policy.budget * self.requests
+
+    def hedge_url(self, url: str) -> str:
+        mirrors = self.policy.mirror_urls
+        if not mirrors:
+            return url
+        self._mirror_index = (self._mirror_index + 1) % len(mirrors)
+        return mirrors[self._mirror_index]
+
+    def to_dict(self) -> dict:
+        delay = self.hedge_delay()
+        return {
+            "requests": self.requests,
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+            "budget_denied": self.budget_denied,
+            "hedge_rate": round(self.hedges_fired / self.requests, 4) if self.requests else 0.0,
+            "hedge_delay_ms": round(delay * 1000, 2) if delay is not None else None,
+            "budget": self.policy.budget,
+        }
+
+
+class Hedger:
+    """Runs requests for opted-in platforms with a hedged second attempt"""
+
+    def __init__(self, policies: Dict[str, HedgePolicy] = None):
+        self.policies = HEDGE_POLICIES if policies is None else policies
+        self._states: Dict[str, PlatformHedgeState] = {}
+
+    def enabled(self, platform: Optional[str]) -> bool:
+        return platform in self.policies
+
+    def state(self, platform: str) -> PlatformHedgeState:
+        state = self._states.get(platform)
+        if state is None:
+            state = PlatformHedgeState(self.policies[platform])
+            self._states[platform] = state
+        return state
+
+    async def run(self, platform: str, url: str, attempt: Callable[[str], Awaitable[T]]) -> T:
+        """
+        Call ``attempt(url)`` and hedge it with a second attempt if it is slow.
+
+        The first attempt to succeed wins and the other is cancelled. If one
+        attempt fails the other is still awaited before giving up. Attempts
+        still running when the caller is cancelled are cancelled with it.
+        """
+        state = self.state(platform)
+        state.requests += 1
+        started = time.perf_counter()
+        primary_finished: List[float] = []
+
+        async def run_primary():
+            try:
+                return await attempt(url)
+            finally:
+                primary_finished.append(time.perf_counter())
+
+        primary = asyncio.ensure_future(run_primary())
+        hedge: Optional[asyncio.Future] = None
+        try:
+            delay = state.hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done:
+                    if state.can_hedge():
+                        state.hedges_fired += 1
+                        hedge = asyncio.ensure_future(attempt(state.hedge_url(url)))
+                    else:
+                        state.budget_denied += 1
+
+            if hedge is None:
+                result = await primary
+            else:
+                result = await self._first_success(state, primary, hedge)
+            # Latency of the primary attempt, not of the winner: a hedge win
+            # records how long the primary had been outstanding, so hedging
+            # cannot drag down the p95 that sets the hedge delay
+            state.latencies.append((primary_finished[0] if primary_finished else time.perf_counter()) - started)
+            return result
+        finally:
+            pending = [task for task in (primary, hedge) if task is not None and not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _first_success(self, state: PlatformHedgeState, primary: asyncio.Future, hedge: asyncio.Future):
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        state.hedges_won += 1
+                    return task.result()
+                error = task.exception()
+        raise error
+
+    def stats(self) -> dict:
+        return {platform: state.to_dict() for platform, state in self._states.items()}
+
+
+_hedger = Hedger()
+
+
+def get_hedger() -> Hedger:
+    """Process-wide hedger, so latency history survives across scrape runs"""
+    return _hedger
@@ -18,8 +18,9 @@ celery_app.conf.update(
     enable_utc=True,
     beat_schedule={
         "scrape-gold-prices": {
-            "task": "tasks.scraping_tasks.scrape_all_gold_prices",
-            "schedule": 300.0,  # Every 5 minutes
+            "task": "tasks.scraping_tasks.scrape_due_gold_prices",
+            # Scheduler tick; each platform is scraped at its own adaptive interval
+            "schedule": float(os.getenv("SCHEDULER_TICK_SECONDS", "60")),
         },
         "calculate-daily-averages": {
             "task": "tasks.scraping_tasks.calculate_daily_averages",
@@ -0,0 +1,260 @@
+import math
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from database.db import get_price_history_since, get_last_scrape_times
+
+# Scrapes per hour the scheduler may spend across every platform. The default
+# matches the old fixed schedule: 22 platforms every 5 minutes.
+SCRAPE_REQUEST_BUDGET = float(os.getenv("SCRAPE_REQUEST_BUDGET", "264"))
+SCRAPE_MIN_INTERVAL = float(os.getenv("SCRAPE_MIN_INTERVAL", "60"))
+SCRAPE_MAX_INTERVAL = float(os.getenv("SCRAPE_MAX_INTERVAL", "21600"))
+# Interval of the fixed beat schedule the adaptive one is compared with
+FIXED_SCRAPE_INTERVAL = 300.0
+# How much history is used to learn change rates, and how often to relearn
+SCHEDULER_LOOKBACK_DAYS = int(os.getenv("SCHEDULER_LOOKBACK_DAYS", "7"))
+SCHEDULER_RELEARN_SECONDS = float(os.getenv("SCHEDULER_RELEARN_SECONDS", "3600"))
+
+
+@dataclass
+class PlatformSchedule:
+    """Learned change rate and assigned scrape interval for one platform"""
+    platform: str
+    changes: int
+    observed_seconds: float
+    interval: float = FIXED_SCRAPE_INTERVAL
+
+    @property
+    def change_rate(self) -> float:
+        """Estimated price changes per second"""
+        if self.observed_seconds <= 0:
+            return 0.0
+        # Add one pseudo-change so a platform never seen changing still gets a finite rate
+        return (self.changes + 1) / self.observed_seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "platform": self.platform,
+            "changes": self.changes,
+            "observed_hours": round(self.observed_seconds / 3600, 2),
+            "changes_per_hour": round(self.change_rate * 3600, 4),
+            "interval_seconds": round(self.interval, 1),
+            "freshness": round(expected_freshness(self.change_rate, self.interval), 4),
+            "fixed_freshness": round(expected_freshness(self.change_rate, FIXED_SCRAPE_INTERVAL), 4),
+        }
+
+
+def expected_freshness(change_rate: float, interval: float) -> float:
+    """
+    Probability that our copy of a price is current at a random moment.
+
+    Assumes changes arrive as a Poisson process with ``change_rate`` and the
+    page is re-scraped every ``interval`` seconds: (1 - e^(-λI)) / (λI).
+    """
+    x = change_rate * interval
+    if x <= 1e-9:
+        return 1.0
+    return (1 - math.exp(-x)) / x
+
+
+def learn_change_rates(rows: Iterable, platforms: Optional[Iterable[str]] = None) -> Dict[str, PlatformSchedule]:
+    """
+    Count price changes per platform in stored history.
+
+    ``rows`` are (platform, timestamp, last_confirmed_at, price_per_gram,
+    making_charges, gst) tuples ordered by platform then timestamp. Rows are
+    only written on change, so the observed span runs to the latest
+    confirmation rather than the latest row.
+    """
+    schedules: Dict[str, PlatformSchedule] = {}
+    current = None
+    previous_tuple = None
+    first_seen = last_seen = None
+
+    def flush():
+        if current is not None:
+            schedules[current].observed_seconds = (last_seen - first_seen).total_seconds()
+
+    for platform, timestamp, last_confirmed_at, price_per_gram, making_charges, gst in rows:
+        if platform != current:
+            flush()
+            current = platform
+            schedules[platform] = PlatformSchedule(platform, changes=0, observed_seconds=0.0)
+            previous_tuple = None
+            first_seen = timestamp
+        price_tuple = (price_per_gram, making_charges, gst)
+        if previous_tuple is not None and price_tuple != previous_tuple:
+            schedules[platform].changes += 1
+        previous_tuple = price_tuple
+        last_seen = max(last_confirmed_at or timestamp, timestamp)
+    flush()
+
+    for platform in platforms or []:
+        schedules.setdefault(platform, PlatformSchedule(platform, changes=0, observed_seconds=0.0))
+    return schedules
+
+
+def _freshness_gain(change_rate: float, frequency: float) -> float:
+    """Derivative of expected freshness with respect to scrape frequency"""
+    r = change_rate / frequency
+    return (1 - math.exp(-r)) / change_rate - math.exp(-r) / frequency
+
+
+def _bisect(predicate, low: float, high: float, steps: int = 60) -> float:
+    """Largest value in [low, high] for which ``predicate`` holds, assuming monotonicity"""
+    for _ in range(steps):
+        mid = (low + high) / 2
+        if predicate(mid):
+            low = mid
+        else:
+            high = mid
+    return low
+
+
+def allocate_intervals(
+    schedules: Dict[str, PlatformSchedule],
+    budget_per_hour: float = SCRAPE_REQUEST_BUDGET,
+    min_interval: float = SCRAPE_MIN_INTERVAL,
+    max_interval: float = SCRAPE_MAX_INTERVAL,
+) -> Dict[str, PlatformSchedule]:
+    """
+    Split the request budget across platforms to maximise mean freshness.
+
+    Each platform gets the scrape frequency at which one more scrape per
+    second buys the same freshness everywhere (equal marginal gain), clamped
+    to [1/max_interval, 1/min_interval], with the common gain found by
+    bisection as the lowest one whose total stays within the budget. Budget
+    left over because several platforms share that gain is split evenly
+    between them. Platforms without any history keep the fixed interval,
+    slowed down if needed so the learned ones still get their minimum, and
+    their share is taken off the budget.
+    """
+    learned = [s for s in schedules.values() if s.observed_seconds > 0]
+    unknown = [s for s in schedules.values() if s.observed_seconds <= 0]
+    min_freq, max_freq = 1 / max_interval, 1 / min_interval
+
+    budget = budget_per_hour / 3600
+    if unknown:
+        share = (budget - len(learned) * min_freq) / len(unknown)
+        unknown_freq = max(min(1 / FIXED_SCRAPE_INTERVAL, share), min_freq)
+        for schedule in unknown:
+            schedule.interval = 1 / unknown_freq
+        budget -= len(unknown) * unknown_freq
+    if not learned:
+        return schedules
+    if budget <= len(learned) * min_freq:
+        for schedule in learned:
+            schedule.interval = max_interval
+        return schedules
+
+    def frequency_for(change_rate: float, gain: float) -> float:
+        # Freshness is concave in frequency, so its gain falls as frequency rises
+        if _freshness_gain(change_rate, min_freq) <= gain:
+            return min_freq
+        if _freshness_gain(change_rate, max_freq) >= gain:
+            return max_freq
+        return _bisect(lambda f: _freshness_gain(change_rate, f) > gain, min_freq, max_freq)
+
+    def frequencies(log_gain: float) -> List[float]:
+        gain = math.exp(log_gain)
+        return [frequency_for(s.change_rate, gain) for s in learned]
+
+    # Total frequency falls as the required gain rises; search the gain in log
+    # space for the largest allocation that fits (lowest gain, negated so
+    # _bisect's "largest value" applies)
+    log_gain = -_bisect(lambda g: sum(frequencies(-g)) <= budget, -10.0, 60.0)
+    chosen = frequencies(log_gain)
+    # Where the gain curves are flat (prices changing much faster than the
+    # minimum interval) a tiny drop in gain moves platforms straight to their
+    # maximum frequency; share the remaining budget evenly among those instead.
+    # Gains within 1% count as equal, since short histories make them noisy.
+    ceilings = frequencies(log_gain - 0.01)
+    tied = [i for i in range(len(learned)) if ceilings[i] > chosen[i]]
+    spare = budget - sum(chosen)
+    while tied and spare > 0:
+        share = spare / len(tied)
+        filled = [i for i in tied if ceilings[i] - chosen[i] <= share]
+        if not filled:
+            for i in tied:
+                chosen[i] += share
+            break
+        for i in filled:
+            spare -= ceilings[i] - chosen[i]
+            chosen[i] = ceilings[i]
+        tied = [i for i in tied if i not in filled]
+
+    for schedule, frequency in zip(learned, chosen):
+        schedule.interval = 1 / frequency
+    return schedules
+
+
+class AdaptiveScheduler:
+    """
+    Decides which platforms are due for a scrape on each scheduler tick.
+
+    Change rates are relearned from ``gold_prices`` history at most every
+    ``relearn_seconds``; a platform is due once its last stored scrape (new
+    row or confirmation) is older than its assigned interval.
+    """
+
+    def __init__(
+        self,
+        budget_per_hour: float = SCRAPE_REQUEST_BUDGET,
+        lookback_days: int = SCHEDULER_LOOKBACK_DAYS,
+        relearn_seconds: float = SCHEDULER_RELEARN_SECONDS,
+    ):
+        self.budget_per_hour = budget_per_hour
+        self.lookback_days = lookback_days
+        self.relearn_seconds = relearn_seconds
+        self.schedules: Dict[str, PlatformSchedule] = {}
+        self.learned_at: Optional[datetime] = None
+
+    def learn(self, db, platforms: Iterable[str]):
+        since = datetime.now() - timedelta(days=self.lookback_days)
+        schedules = learn_change_rates(get_price_history_since(db, since), platforms)
+        self.schedules = allocate_intervals(schedules, self.budget_per_hour)
+        self.learned_at = datetime.now()
+
+    def due_platforms(self, db, platforms: Iterable[str], now: Optional[datetime] = None) -> List[str]:
+        platforms = list(platforms)
+        now = now or datetime.now()
+        if self.learned_at is None or (now - self.learned_at).total_seconds() > self.relearn_seconds:
+            self.learn(db, platforms)
+
+        last_scraped = get_last_scrape_times(db)
+        due = []
+        for platform in platforms:
+            schedule = self.schedules.get(platform)
+            interval = schedule.interval if schedule else FIXED_SCRAPE_INTERVAL
+            last = last_scraped.get(platform)
+            # Small slack so a platform is not pushed a whole tick later by jitter
+            if last is None or (now - last).total_seconds() >= interval * 0.95:
+                due.append(platform)
+        return due
+
+    def report(self) -> dict:
+        """Effective freshness of the adaptive schedule versus the fixed beat"""
+        schedules = list(self.schedules.values())
+        if not schedules:
+            return {"learned_at": None, "platforms": []}
+        adaptive = sum(expected_freshness(s.change_rate, s.interval) for s in schedules) / len(schedules)
+        fixed = sum(expected_freshness(s.change_rate, FIXED_SCRAPE_INTERVAL) for s in schedules) / len(schedules)
+        return {
+            "learned_at": self.learned_at.isoformat(),
+            "budget_per_hour": self.budget_per_hour,
+            "adaptive_requests_per_hour": round(sum(3600 / s.interval for s in schedules), 1),
+            "fixed_requests_per_hour": round(len(schedules) * 3600 / FIXED_SCRAPE_INTERVAL, 1),
+            "adaptive_mean_freshness": round(adaptive, 4),
+            "fixed_mean_freshness": round(fixed, 4),
+            "platforms": [s.to_dict() for s in sorted(schedules, key=lambda s: s.interval)],
+        }
+
+
+_scheduler = AdaptiveScheduler()
+
+
+def get_scheduler() -> AdaptiveScheduler:
+    """Per-process scheduler; state is relearned from the database"""
+    return _scheduler
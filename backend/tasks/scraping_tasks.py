@@ -3,52 +3,96 @@ from datetime import datetime, timedelta
 import asyncio
 import logging
 
-from scrapers.gold_scraper import GoldScraper
-from database.db import get_db_connection, save_gold_price, save_historical_price, cleanup_old_prices
+from scrapers.gold_scraper import GoldScraper, create_scraper
+from scrapers.conditional import get_page_cache
+from database.db import get_db_connection, save_gold_prices_on_change, save_historical_prices, ensure_gold_price_partitions
+from database.rollups import ALL_PLATFORMS, update_price_rollups
+from database.backfill import daily_aggregates
+from database.retention import apply_retention
+from database.archive import run_archive
+from database.indicator_states import update_indicators
 from tasks.celery_app import celery_app
+from tasks.scheduler import get_scheduler
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def scrape_and_save(platforms=None):
+    """Scrape ``platforms`` (default: all) and store the results"""
+    # Run async scraping in sync context
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    
+    async def run_scraping():
+        async with create_scraper() as scraper:
+            prices = await scraper.scrape_all_platforms(platforms)
+            return prices, scraper.last_report
+    
+    prices, report = loop.run_until_complete(run_scraping())
+    loop.close()
+    logger.info(f"Scrape run finished in {report.elapsed * 1000:.0f}ms: {report.summary()['outcomes']}")
+    
+    # Stale prices served by open breakers are not new observations, so they
+    # neither confirm stored rows nor feed rollups and indicators
+    fresh = [r.price for r in report.results if r.price is not None and not r.stale]
+    
+    # Write rows only for changed prices, confirm the rest
+    db = get_db_connection()
+    try:
+        saved_count, confirmed_count, failed = save_gold_prices_on_change(db, fresh)
+        update_price_rollups(db, fresh)
+        update_indicators(db, fresh)
+    finally:
+        db.close()
+    
+    for price, error in failed:
+        logger.error(f"Error saving price for {price.platform}: {error}")
+    
+    logger.info(f"Scraped {len(fresh)} gold prices: {saved_count} changed, {confirmed_count} unchanged, "
+                f"{len(prices) - len(fresh)} stale")
+    return {
+        "status": "success",
+        "prices_saved": saved_count,
+        "prices_confirmed": confirmed_count,
+        "scrape": report.summary(),
+        "conditional": get_page_cache().stats(),
+    }
+
 @celery_app.task
 def scrape_all_gold_prices():
     """
-    Periodic task to scrape gold prices from all platforms
+    Task to scrape gold prices from all platforms at once
     """
     try:
         logger.info("Starting gold price scraping task")
+        return scrape_and_save()
         
-        # Run async scraping in sync context
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        async def run_scraping():
-            async with GoldScraper() as scraper:
-                prices = await scraper.scrape_all_platforms()
-                return prices
-        
-        prices = loop.run_until_complete(run_scraping())
-        loop.close()
-        
-        # Save to database
+    except Exception as e:
+        logger.error(f"Error in scraping task: {e}")
+        return {"status": "error", "message": str(e)}
+
+@celery_app.task
+def scrape_due_gold_prices():
+    """
+    Periodic task to scrape the platforms the adaptive scheduler considers due
+    """
+    try:
         db = get_db_connection()
-        saved_count = 0
-        
-        for price in prices:
-            try:
-                save_gold_price(db, price)
-                saved_count += 1
-            except Exception as e:
-                logger.error(f"Error saving price for {price.platform}: {e}")
-        
+        scheduler = get_scheduler()
+        due = scheduler.due_platforms(db, GoldScraper.PLATFORM_METHODS.keys())
         db.close()
         
-        logger.info(f"Successfully scraped and saved {saved_count} gold prices")
-        return {"status": "success", "prices_saved": saved_count}
+        if not due:
+            return {"status": "success", "prices_saved": 0, "due": []}
+        
+        logger.info(f"Scraping {len(due)} due platforms: {', '.join(due)}")
+        result = scrape_and_save(due)
+        result["due"] = due
+        return result
         
     except Exception as e:
-        logger.error(f"Error in scraping task: {e}")
+        logger.error(f"Error in adaptive scraping task: {e}")
         return {"status": "error", "message": str(e)}
 
 @celery_app.task
@@ -60,21 +104,17 @@ def calculate_daily_averages():
         logger.info("Calculating daily averages")
         
         db = get_db_connection()
-        today = datetime.now().strftime("%Y-%m-%d")
-        
-        # Get today's prices
-        from database.db import calculate_daily_averages as calc_avg
-        avg_data = calc_avg(db, today)
-        
-        if avg_data:
-            save_historical_price(
-                db,
-                avg_data["date"],
-                avg_data["average"],
-                avg_data["highest"],
-                avg_data["lowest"]
-            )
-            logger.info(f"Saved daily average for {today}: ₹{avg_data['average']:.2f}")
+        now = datetime.now()
+        today = now.strftime("%Y-%m-%d")
+        
+        # Backfills go through the same helper, so both store the same values
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        rows = daily_aggregates(db, start, start + timedelta(days=1))
+        
+        if rows:
+            save_historical_prices(db, rows)
+            day_all = next(row for row in rows if row["platform"] == ALL_PLATFORMS)
+            logger.info(f"Saved daily average for {today}: ₹{day_all['average_price']:.2f}")
         
         db.close()
         return {"status": "success", "date": today}
@@ -86,17 +126,30 @@ def calculate_daily_averages():
 @celery_app.task
 def cleanup_old_data():
     """
-    Clean up old price data to manage database size
+    Compact old price data into hourly and daily rollups to manage database size.
+    Safe to rerun after an interruption; it resumes from the oldest remaining row.
     """
     try:
         logger.info("Starting data cleanup task")
         
-        db = get_db_connection()
-        deleted_count = cleanup_old_prices(db, days_to_keep=30)
-        db.close()
+        def report(progress):
+            logger.info(f"Retention {progress['stage']}: {progress['raw_deleted']} raw, "
+                        f"{progress['hourly_deleted']} hourly rows compacted after {progress['batches']} batches")
         
-        logger.info(f"Cleaned up {deleted_count} old price records")
-        return {"status": "success", "deleted_count": deleted_count}
+        db = get_db_connection()
+        try:
+            # Raw rows go to the columnar archive before retention can drop them
+            archive = run_archive(db)
+            logger.info(f"Archived price history: {archive}")
+            summary = apply_retention(db, progress=report)
+        finally:
+            db.close()
+        
+        # Keep upcoming monthly partitions in place (no-op unless partitioned)
+        ensure_gold_price_partitions()
+        
+        logger.info(f"Cleaned up old price records: {summary}")
+        return {"status": "success", "deleted_count": summary["raw_deleted"], "retention": summary, "archive": archive}
         
     except Exception as e:
         logger.error(f"Error in cleanup task: {e}")
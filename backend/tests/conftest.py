@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# Modules import each other as top-level packages (``from scrapers.engine import ...``)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# database.db connects and creates its tables on import; keep tests off the real server
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/goldsight-test.db")
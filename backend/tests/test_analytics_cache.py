@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta
+
+import main
+from utils.calculations import PriceBucket
+
+
+def test_analytics_follow_the_window_across_hours_without_new_ticks(monkeypatch):
+    ends = iter([datetime(2026, 1, 1, 10), datetime(2026, 1, 1, 10), datetime(2026, 1, 1, 11)])
+    loaded = []
+
+    def load_history(days, platform, end=None):
+        loaded.append(end)
+        hours = [end - timedelta(hours=h) for h in range(5, 0, -1)]
+        return [PriceBucket(hour, 1.0, 1.0, 1.0, 1.0, float(hour.hour)) for hour in hours], "hour"
+
+    monkeypatch.setattr(main, "history_window_end", lambda: next(ends))
+    monkeypatch.setattr(main, "load_history", load_history)
+    # No tick lands in between, so the series version stays the same
+    monkeypatch.setattr(main, "get_data_version", lambda db, platform: "unchanged")
+
+    first = main.get_analytics("moving_average", period="30d", platform="Cached", window=2)
+    again = main.get_analytics("moving_average", period="30d", platform="Cached", window=2)
+    next_hour = main.get_analytics("moving_average", period="30d", platform="Cached", window=2)
+
+    assert again == first
+    assert loaded == [datetime(2026, 1, 1, 10), datetime(2026, 1, 1, 11)]
+    assert next_hour["dates"][-1] == "2026-01-01T10:00:00"
+    assert first["dates"][-1] == "2026-01-01T09:00:00"
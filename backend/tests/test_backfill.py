@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from database.backfill import backfill_historical_prices
+from database.db import GoldPriceDB, HistoricalPriceDB, get_db_connection
+from database.rollups import PriceRollupDB
+
+
+def imported_row(platform, timestamp, price, confirmed=None):
+    return {"platform": platform, "type": "digital", "price_per_gram": price, "making_charges": 0.0,
+            "gst": 3.0, "features": "[]", "timestamp": timestamp, "last_confirmed_at": confirmed or timestamp}
+
+
+@pytest.fixture
+def db():
+    db = get_db_connection()
+    # Imported history: gold_prices rows only, no rollups were ever built for them
+    db.execute(insert(GoldPriceDB), [
+        imported_row("Imported", datetime(2020, 3, 1, 0), 6000.0, datetime(2020, 3, 1, 6)),
+        imported_row("Imported", datetime(2020, 3, 1, 12), 6200.0),
+        imported_row("Imported", datetime(2020, 3, 3, 0), 6400.0, datetime(2020, 3, 3, 12)),
+        imported_row("Other", datetime(2020, 2, 20), 7000.0),
+        imported_row("Other", datetime(2020, 3, 5), 7100.0),
+    ])
+    db.commit()
+    yield db
+    db.query(GoldPriceDB).filter(GoldPriceDB.timestamp < datetime(2021, 1, 1)).delete()
+    db.query(HistoricalPriceDB).filter(HistoricalPriceDB.date < "2021").delete()
+    db.commit()
+    db.close()
+
+
+def stored(db, platform):
+    rows = db.query(HistoricalPriceDB).filter(
+        HistoricalPriceDB.platform == platform, HistoricalPriceDB.date < "2021"
+    ).order_by(HistoricalPriceDB.date)
+    return {row.date: (row.average_price, row.highest_price, row.lowest_price, row.volume) for row in rows}
+
+
+@pytest.mark.parametrize("chunk_days", [31, 1])
+def test_backfill_aggregates_imported_rows_without_rollups(db, chunk_days):
+    assert db.query(PriceRollupDB).filter(PriceRollupDB.bucket_start < datetime(2021, 1, 1)).count() == 0
+
+    summary = backfill_historical_prices(db, datetime(2020, 3, 1), datetime(2020, 3, 4), chunk_days=chunk_days)
+
+    assert summary["days"] == 3
+    # Each price is weighted by how long it held, not by how often it changed
+    assert stored(db, "Imported") == {
+        "2020-03-01": (6100.0, 6200.0, 6000.0, 2),
+        "2020-03-02": (6200.0, 6200.0, 6200.0, 1),
+        "2020-03-03": (6400.0, 6400.0, 6400.0, 1),
+    }
+    # A price set before the range held until a change after it
+    assert stored(db, "Other") == {
+        "2020-03-01": (7000.0, 7000.0, 7000.0, 1),
+        "2020-03-02": (7000.0, 7000.0, 7000.0, 1),
+        "2020-03-03": (7000.0, 7000.0, 7000.0, 1),
+    }
+    assert stored(db, "all")["2020-03-02"] == (6600.0, 7000.0, 6200.0, 2)
+
+
+def test_backfill_picks_up_corrected_rows(db):
+    backfill_historical_prices(db, datetime(2020, 3, 2), datetime(2020, 3, 3), ["Imported"])
+    row = db.query(GoldPriceDB).filter(
+        GoldPriceDB.platform == "Imported", GoldPriceDB.timestamp == datetime(2020, 3, 1, 12)
+    ).one()
+    row.price_per_gram = 6300.0
+    db.commit()
+
+    backfill_historical_prices(db, datetime(2020, 3, 2), datetime(2020, 3, 3), ["Imported"])
+
+    assert stored(db, "Imported") == {"2020-03-02": (6300.0, 6300.0, 6300.0, 1)}
+
+
+def test_backfill_upserts_without_on_conflict(db, monkeypatch):
+    # Dialects other than PostgreSQL and SQLite get no ON CONFLICT statement
+    monkeypatch.setattr("database.db.historical_price_upsert", lambda dialect_name: None)
+    backfill_historical_prices(db, datetime(2020, 3, 2), datetime(2020, 3, 4), ["Imported"])
+
+    # Overlapping rerun: two days are updated in place, one is inserted
+    backfill_historical_prices(db, datetime(2020, 3, 1), datetime(2020, 3, 4), ["Imported"])
+
+    assert stored(db, "Imported") == {
+        "2020-03-01": (6100.0, 6200.0, 6000.0, 2),
+        "2020-03-02": (6200.0, 6200.0, 6200.0, 1),
+        "2020-03-03": (6400.0, 6400.0, 6400.0, 1),
+    }
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from scrapers.browser_pool import BrowserPool
+
+
+class FakeDriver:
+    """Stands in for a WebDriver; flags any call made while another thread is inside it"""
+
+    def __init__(self, load_seconds: float = 0.0):
+        self.load_seconds = load_seconds
+        self.lock = threading.Lock()
+        self.users = 0
+        self.overlapped = False
+        self.quit_called = threading.Event()
+        self.page_source = "<html></html>"
+
+    def get(self, url):
+        with self.lock:
+            self.users += 1
+            self.overlapped = self.overlapped or self.users > 1
+        time.sleep(self.load_seconds)
+        with self.lock:
+            self.users -= 1
+
+    def quit(self):
+        self.quit_called.set()
+
+
+def test_cancelled_fetch_never_shares_its_driver():
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver(load_seconds=0.3))
+        return drivers[-1]
+
+    pool = BrowserPool(size=1, driver_factory=factory)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.fetch("http://slow"), 0.05)
+        # The first driver is still loading on its thread
+        await pool.fetch("http://next")
+
+    asyncio.run(scenario())
+
+    assert len(drivers) == 2
+    assert not any(driver.overlapped for driver in drivers)
+    assert drivers[0].quit_called.wait(1)
+    assert pool.stats()["abandoned"] == 1
+    pool.close()
+
+
+def test_cancelled_acquire_releases_slot_and_quits_late_driver():
+    drivers = []
+
+    def slow_factory():
+        time.sleep(0.3)
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    pool = BrowserPool(size=1, driver_factory=slow_factory)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.fetch("http://page"), 0.05)
+        await asyncio.sleep(0.5)
+
+    asyncio.run(scenario())
+
+    assert len(drivers) == 1
+    assert drivers[0].quit_called.wait(1)
+    assert pool.stats()["live"] == 0
+    pool.close()
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from models.gold_price import GoldPrice
+from scrapers.circuit_breaker import HALF_OPEN, OPEN, CircuitBreakerRegistry
+from scrapers.engine import ScrapeEngine
+
+
+class StubPlatforms(ThreadingHTTPServer):
+    """
+    Local platform pages. ``/price/<value>?delay=<seconds>`` answers with
+    the price after the delay, ``/fail`` with a 500. Tracks how many
+    requests are in flight at once.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            path, _, query = self.path.partition("?")
+            params = dict(pair.split("=") for pair in query.split("&") if pair)
+            time.sleep(float(params.get("delay", 0)))
+            if path == "/fail":
+                self.send_response(500)
+                body = b"internal error"
+            else:
+                self.send_response(200)
+                body = path.rsplit("/", 1)[-1].encode()
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the engine abandoned the request
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = StubPlatforms()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def run_jobs(engine, paths, base_url):
+    """Scrape one stub page per platform through ``engine``"""
+
+    async def scrape():
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            def job(platform, path):
+                async def fetch():
+                    response = await client.get(path)
+                    response.raise_for_status()
+                    return GoldPrice(platform=platform, type="digital", price_per_gram=float(response.text),
+                                     timestamp=datetime.now())
+                return fetch
+
+            return await engine.run({platform: job(platform, path) for platform, path in paths.items()})
+
+    return asyncio.run(scrape())
+
+
+def test_concurrency_is_bounded(stub):
+    engine = ScrapeEngine(max_concurrency=3, platform_timeout=5, deadline=10)
+    paths = {f"platform-{i}": f"/price/{6000 + i}?delay=0.2" for i in range(9)}
+
+    report = run_jobs(engine, paths, stub.url)
+
+    assert [r.status for r in report.results] == ["ok"] * 9
+    assert stub.max_in_flight == 3
+    # Nine 0.2s requests three at a time take three rounds
+    assert report.elapsed >= 0.55
+
+
+def test_slow_platform_is_abandoned_at_its_deadline(stub):
+    engine = ScrapeEngine(max_concurrency=4, platform_timeout=0.3, deadline=10)
+    paths = {"fast": "/price/6000", "slow": "/price/6001?delay=3"}
+
+    report = run_jobs(engine, paths, stub.url)
+    results = {r.platform: r for r in report.results}
+
+    assert results["fast"].status == "ok"
+    assert results["fast"].price.price_per_gram == 6000
+    assert results["slow"].status == "timeout"
+    assert results["slow"].price is None
+    assert report.elapsed < 1.5
+
+
+def test_run_finishes_within_overall_deadline(stub):
+    engine = ScrapeEngine(max_concurrency=1, platform_timeout=5, deadline=0.5)
+    paths = {f"platform-{i}": f"/price/{6000 + i}?delay=0.3" for i in range(4)}
+
+    report = run_jobs(engine, paths, stub.url)
+    statuses = [r.status for r in report.results]
+
+    assert statuses[0] == "ok"
+    assert "timeout" in statuses
+    assert report.elapsed < 1.0
+
+
+def test_failures_are_isolated(stub):
+    engine = ScrapeEngine(max_concurrency=4, platform_timeout=5, deadline=10)
+    paths = {"broken": "/fail", "healthy": "/price/6100", "also-healthy": "/price/6200"}
+
+    report = run_jobs(engine, paths, stub.url)
+    results = {r.platform: r for r in report.results}
+
+    assert results["broken"].status == "error"
+    assert "500" in results["broken"].error
+    assert results["healthy"].status == "ok"
+    assert results["also-healthy"].status == "ok"
+    assert sorted(p.price_per_gram for p in report.prices) == [6100, 6200]
+
+
+def test_cancelled_half_open_trial_is_given_back():
+    breakers = CircuitBreakerRegistry()
+    breaker = breakers.get("platform")
+    breaker.state, breaker.open_until = OPEN, 0.0
+    engine = ScrapeEngine(max_concurrency=1, platform_timeout=5, deadline=10)
+
+    async def hang():
+        await asyncio.sleep(5)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(engine.run({"platform": hang}, breakers), 0.1)
+
+    asyncio.run(scenario())
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from scrapers.hedging import HedgePolicy, Hedger
+
+
+def warmed_hedger(latency: float) -> Hedger:
+    """Hedger for "platform" whose hedge delay is already ``latency``"""
+    hedger = Hedger({"platform": HedgePolicy(min_samples=1, min_delay=0.01)})
+    hedger.state("platform").latencies.extend([latency] * 5)
+    return hedger
+
+
+def test_cancelled_caller_cancels_outstanding_attempts():
+    hedger = warmed_hedger(0.05)
+    running = set()
+
+    async def attempt(url):
+        running.add(url)
+        try:
+            await asyncio.sleep(1)
+        finally:
+            running.discard(url)
+
+    async def scenario():
+        # Cancelled while waiting for the hedge delay, and again after hedging
+        for timeout in (0.02, 0.1):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(hedger.run("platform", "primary", attempt), timeout)
+            assert running == set()
+
+    asyncio.run(scenario())
+
+
+def test_hedge_win_records_primary_latency():
+    hedger = warmed_hedger(0.05)
+    cancelled = []
+
+    async def attempt(url):
+        try:
+            await asyncio.sleep(0.3 if url == "primary" else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+        return url
+
+    async def scenario():
+        return await hedger.run("platform", "primary", attempt)
+
+    # Without mirrors the hedge goes to the same URL, so tell the attempts apart
+    hedger.policies["platform"].mirror_urls = ["mirror"]
+    assert asyncio.run(scenario()) == "mirror"
+
+    state = hedger.state("platform")
+    assert state.hedges_won == 1
+    assert cancelled == ["primary"]
+    # The primary was outstanding for the hedge delay plus the hedge's own time
+    assert state.latencies[-1] >= 0.055
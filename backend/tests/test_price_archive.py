@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+import main
+from database.archive import run_archive
+from database.db import GoldPriceDB, get_db_connection
+from database.retention import apply_retention
+from database.rollups import PriceRollupDB
+from utils import price_archive
+from utils.calculations import load_archived_buckets
+
+PLATFORM = "Archived Gold"
+
+
+def change(timestamp, price, confirmed):
+    return {"platform": PLATFORM, "type": "digital", "price_per_gram": price, "making_charges": 0.0,
+            "gst": 3.0, "features": "[]", "timestamp": timestamp, "last_confirmed_at": confirmed}
+
+
+@pytest.fixture
+def archived(tmp_path, monkeypatch):
+    """Two days of changes 400 days ago, archived and then past both raw and hourly retention"""
+    monkeypatch.setattr(price_archive, "PRICE_ARCHIVE_DIR", str(tmp_path))
+    day = (datetime.now() - timedelta(days=400)).replace(hour=0, minute=0, second=0, microsecond=0)
+    db = get_db_connection()
+    db.execute(insert(GoldPriceDB), [
+        change(day, 6000.0, day + timedelta(hours=5)),
+        change(day + timedelta(hours=6), 6100.0, day + timedelta(hours=9)),
+        change(day + timedelta(hours=9, minutes=30), 6150.0, day + timedelta(hours=23)),
+        change(day + timedelta(days=1), 6200.0, day + timedelta(days=1, hours=12)),
+    ])
+    db.commit()
+
+    run_archive(db, str(tmp_path))
+    apply_retention(db)
+    yield db, day
+
+    db.query(GoldPriceDB).filter(GoldPriceDB.platform == PLATFORM).delete()
+    db.query(PriceRollupDB).filter(PriceRollupDB.bucket_start < datetime.now() - timedelta(days=300)).delete()
+    db.commit()
+    db.close()
+
+
+def test_history_past_retention_is_served_from_the_archive(archived):
+    db, day = archived
+    # Retention kept only the latest row and no hourly rollups for those days
+    assert db.query(GoldPriceDB).filter(GoldPriceDB.platform == PLATFORM).count() == 1
+    assert db.query(PriceRollupDB).filter(
+        PriceRollupDB.platform == PLATFORM, PriceRollupDB.granularity == "hour"
+    ).count() == 0
+
+    points, granularity, _ = main.get_historical_prices(1825, PLATFORM, max_points=0)
+    by_hour = {point["date"]: point for point in points}
+
+    assert granularity == "hour"
+    assert by_hour[(day + timedelta(hours=3)).isoformat()]["price"] == 6000.0
+    # A change half way through the hour
+    assert by_hour[(day + timedelta(hours=9)).isoformat()] == {
+        "date": (day + timedelta(hours=9)).isoformat(), "price": 6125.0,
+        "open": 6100.0, "high": 6150.0, "low": 6100.0, "close": 6150.0,
+    }
+    assert by_hour[(day + timedelta(days=1, hours=5)).isoformat()]["price"] == 6200.0
+
+
+def test_archived_buckets_hold_prices_between_changes(archived):
+    _, day = archived
+    buckets = load_archived_buckets(None, day - timedelta(hours=2), day + timedelta(hours=8))
+
+    # Nothing was priced before the first change
+    assert [b.bucket_start for b in buckets] == [day + timedelta(hours=h) for h in range(8)]
+    assert [b.close for b in buckets] == [6000.0] * 6 + [6100.0] * 2
@@ -0,0 +1,53 @@
+import asyncio
+from datetime import datetime
+
+from models.gold_price import GoldPrice
+from utils.price_cache import PriceSnapshot
+from utils.price_stream import PriceBroadcaster
+
+
+def snapshot(version, price):
+    prices = [GoldPrice(platform="platform", type="digital", price_per_gram=price, timestamp=datetime(2026, 1, 1))]
+    return PriceSnapshot(version, prices)
+
+
+def first_message(broadcaster, last_event_id):
+    async def read():
+        stream = broadcaster.stream(last_event_id)
+        try:
+            return await stream.__anext__()
+        finally:
+            await stream.aclose()
+
+    return asyncio.run(read())
+
+
+def restarted_worker():
+    """A broadcaster that has published versions 1-3, as every fresh process does"""
+    broadcaster = PriceBroadcaster(heartbeat=0.05)
+    for version, price in enumerate([6000.0, 6010.0, 6020.0], start=1):
+        broadcaster.publish(snapshot(version, price))
+    return broadcaster
+
+
+def test_resume_within_the_same_stream_sends_only_missed_changes():
+    broadcaster = restarted_worker()
+
+    message = first_message(broadcaster, broadcaster.event_id(1))
+
+    assert message.startswith(f"id: {broadcaster.stream_id}:2\nevent: prices")
+    assert f"id: {broadcaster.stream_id}:3\nevent: prices" in message
+    assert broadcaster.resumes == 1
+
+
+def test_ids_from_another_process_get_a_full_snapshot():
+    before_restart = PriceBroadcaster()
+    before_restart.publish(snapshot(1, 5000.0))
+    broadcaster = restarted_worker()
+
+    # Version 1 exists in both streams but means different prices
+    for last_event_id in (before_restart.event_id(1), "1", "garbage", broadcaster.event_id(99)):
+        message = first_message(broadcaster, last_event_id)
+        assert message.startswith(f"id: {broadcaster.stream_id}:3\nevent: snapshot"), last_event_id
+        assert "6020.0" in message
+    assert broadcaster.resumes == 0
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from database import rollups
+from database.db import get_db_connection
+from database.rollups import PriceRollupDB, get_rollups, insert_missing_rollups, update_price_rollups
+from models.gold_price import GoldPrice
+
+
+def tick(platform, minute, price):
+    return GoldPrice(platform=platform, type="digital", price_per_gram=price,
+                     timestamp=datetime(2019, 6, 1, 10, minute))
+
+
+def hour_bucket(db, platform):
+    (bucket,) = get_rollups(db, "hour", datetime(2019, 6, 1), datetime(2019, 6, 2), platform)
+    return bucket.open, bucket.high, bucket.low, bucket.close, bucket.price_sum, bucket.tick_count
+
+
+@pytest.fixture
+def db():
+    db = get_db_connection()
+    yield db
+    db.query(PriceRollupDB).filter(PriceRollupDB.bucket_start < datetime(2020, 1, 1)).delete()
+    db.commit()
+    db.close()
+
+
+def batches(platform):
+    """Scrape batches arriving out of order within one hour"""
+    return [
+        [tick(platform, 30, 6000.0)],
+        [tick(platform, 10, 5900.0), tick(platform, 50, 6100.0)],
+        [tick(platform, 40, 6050.0)],
+    ]
+
+
+def test_rollups_merge_the_same_without_on_conflict(db, monkeypatch):
+    for batch in batches("Native"):
+        update_price_rollups(db, batch)
+
+    # Dialects other than PostgreSQL and SQLite get no ON CONFLICT statement
+    monkeypatch.setattr(rollups, "_insert_statement", lambda dialect_name: None)
+    for batch in batches("Generic"):
+        update_price_rollups(db, batch)
+
+    assert hour_bucket(db, "Generic") == hour_bucket(db, "Native") == (5900.0, 6100.0, 5900.0, 6100.0, 24050.0, 4)
+
+    # Filling gaps leaves stored buckets alone and adds the missing ones
+    day = {"granularity": "day", "platform": "Generic", "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0,
+           "price_sum": 1.0, "tick_count": 1, "open_at": datetime(2019, 6, 1), "close_at": datetime(2019, 6, 1)}
+    insert_missing_rollups(db, [{**day, "bucket_start": datetime(2019, 6, 1)},
+                                {**day, "bucket_start": datetime(2019, 6, 2)}])
+    db.commit()
+    days = get_rollups(db, "day", datetime(2019, 6, 1), datetime(2019, 6, 3), "Generic")
+    assert [(b.bucket_start.day, b.tick_count) for b in days] == [(1, 4), (2, 1)]
@@ -0,0 +1,46 @@
+import pytest
+
+from tasks.scheduler import PlatformSchedule, allocate_intervals
+
+BUDGET = 264.0
+
+
+def requests_per_hour(schedules) -> float:
+    return sum(3600 / s.interval for s in schedules.values())
+
+
+def schedules(observations):
+    """PlatformSchedule per (changes, observed_seconds) pair"""
+    return {
+        f"platform-{i}": PlatformSchedule(f"platform-{i}", changes=changes, observed_seconds=seconds)
+        for i, (changes, seconds) in enumerate(observations)
+    }
+
+
+@pytest.mark.parametrize("observations", [
+    # Flat: a second of history makes every change rate look huge
+    [(0, 1.0)] * 22,
+    [(0, 1.0 + i * 0.01) for i in range(22)],
+    # Skewed: a few volatile platforms among quiet ones
+    [(i * i, 86400.0) for i in range(22)],
+    # Cold start: half the platforms have no history yet
+    [(3, 3600.0)] * 11 + [(0, 0.0)] * 11,
+    [(0, 0.0)] * 22,
+])
+def test_allocation_stays_within_budget(observations):
+    allocated = allocate_intervals(schedules(observations), BUDGET)
+
+    assert requests_per_hour(allocated) <= BUDGET + 1e-9
+
+
+def test_equal_gains_share_the_budget_evenly():
+    allocated = allocate_intervals(schedules([(0, 1.0)] * 22), BUDGET)
+
+    assert requests_per_hour(allocated) == pytest.approx(BUDGET)
+    assert {round(s.interval, 6) for s in allocated.values()} == {300.0}
+
+
+def test_cold_start_platforms_are_slowed_to_fit_a_small_budget():
+    allocated = allocate_intervals(schedules([(3, 3600.0)] * 2 + [(0, 0.0)] * 20), 60.0)
+
+    assert requests_per_hour(allocated) <= 60.0 + 1e-9
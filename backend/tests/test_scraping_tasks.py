@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from database.db import GoldPriceDB, get_db_connection, save_gold_prices_on_change
+from models.gold_price import GoldPrice
+from scrapers.engine import PlatformResult, ScrapeReport
+from tasks import scraping_tasks
+
+
+class FakeScraper:
+    """Returns a prepared report instead of scraping"""
+
+    def __init__(self, report):
+        self.last_report = report
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def scrape_all_platforms(self, platforms=None):
+        return self.last_report.prices
+
+
+def price(platform, value, timestamp):
+    return GoldPrice(platform=platform, type="digital", price_per_gram=value, timestamp=timestamp)
+
+
+@pytest.fixture
+def db():
+    db = get_db_connection()
+    yield db
+    db.query(GoldPriceDB).filter(GoldPriceDB.platform.in_(["Breaker", "Live"])).delete()
+    db.commit()
+    db.close()
+
+
+def test_stale_prices_do_not_confirm_stored_rows(db, monkeypatch):
+    scraped_at = datetime.now() - timedelta(minutes=10)
+    save_gold_prices_on_change(db, [price("Breaker", 6000.0, scraped_at)])
+    report = ScrapeReport(results=[
+        # An open breaker serving its last good price, as the engine does
+        PlatformResult("Breaker", "circuit_open", price=price("Breaker", 6000.0, datetime.now()), stale=True),
+        PlatformResult("Live", "ok", price=price("Live", 6100.0, datetime.now())),
+    ])
+    monkeypatch.setattr(scraping_tasks, "create_scraper", lambda: FakeScraper(report))
+
+    result = scraping_tasks.scrape_and_save()
+
+    assert result["prices_saved"] == 1
+    assert result["prices_confirmed"] == 0
+    db.expire_all()
+    breaker_row = db.query(GoldPriceDB).filter(GoldPriceDB.platform == "Breaker").one()
+    assert breaker_row.last_confirmed_at == scraped_at
+    assert db.query(GoldPriceDB).filter(GoldPriceDB.platform == "Live").count() == 1
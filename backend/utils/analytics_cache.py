@@ -0,0 +1,172 @@
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Entries kept by the in-process tier
+ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", "512"))
+# Optional shared tier, e.g. redis://localhost:6379/1
+ANALYTICS_CACHE_REDIS_URL = os.getenv("ANALYTICS_CACHE_REDIS_URL")
+# Seconds entries live in external tiers; versioned keys make them stale anyway
+ANALYTICS_CACHE_REDIS_TTL = int(os.getenv("ANALYTICS_CACHE_REDIS_TTL", "3600"))
+
+# (platform, range as (period, window end), indicator, params, data version)
+AnalyticsKey = Tuple[str, tuple, str, tuple, str]
+
+
+class CacheTier:
+    """
+    A cache level. ``get`` returns None on a miss; values are JSON-compatible.
+    Tiers are consulted in order, so faster ones come first.
+    """
+
+    name = "tier"
+
+    def get(self, key: AnalyticsKey) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: AnalyticsKey, value: Any):
+        raise NotImplementedError
+
+    def invalidate_platform(self, platform: str):
+        """Drop entries of ``platform``; optional for tiers that expire on their own"""
+
+
+class LRUTier(CacheTier):
+    """Bounded in-process least-recently-used tier"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = ANALYTICS_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[AnalyticsKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: AnalyticsKey) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: AnalyticsKey, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_platform(self, platform: str):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == platform]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisTier(CacheTier):
+    """Shared tier in Redis, so API workers reuse each other's results"""
+
+    name = "redis"
+
+    def __init__(self, url: str, ttl: int = ANALYTICS_CACHE_REDIS_TTL, prefix: str = "analytics:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, key: AnalyticsKey) -> str:
+        return self.prefix + json.dumps(key, separators=(",", ":"))
+
+    def get(self, key: AnalyticsKey) -> Optional[Any]:
+        raw = self.client.get(self._key(key))
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: AnalyticsKey, value: Any):
+        self.client.set(self._key(key), json.dumps(value), ex=self.ttl)
+
+
+class AnalyticsCache:
+    """
+    Memoizes analytics results across cache tiers.
+
+    Keys carry the data version of the platform's series, so new ticks make
+    old entries unreachable; when a newer version is seen, the platform's
+    entries are also dropped from tiers that support it. A failing tier is
+    logged and skipped, never fatal.
+    """
+
+    def __init__(self, tiers: Optional[List[CacheTier]] = None):
+        self.tiers = tiers if tiers is not None else default_tiers()
+        self._versions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = {tier.name: 0 for tier in self.tiers}
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def _note_version(self, platform: str, version: str):
+        with self._lock:
+            previous = self._versions.get(platform)
+            self._versions[platform] = version
+        if previous is not None and previous != version:
+            self.invalidations += 1
+            for tier in self.tiers:
+                tier.invalidate_platform(platform)
+
+    def get(self, key: AnalyticsKey, compute: Callable[[], Any]) -> Any:
+        """Return the cached result for ``key``, computing and storing it on a miss"""
+        self._note_version(key[0], key[4])
+        for index, tier in enumerate(self.tiers):
+            try:
+                value = tier.get(key)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Analytics cache tier {tier.name} failed: {e}")
+                continue
+            if value is not None:
+                with self._lock:
+                    self.hits[tier.name] += 1
+                # Promote into the faster tiers in front of this one
+                for faster in self.tiers[:index]:
+                    faster.set(key, value)
+                return value
+
+        value = compute()
+        with self._lock:
+            self.misses += 1
+        for tier in self.tiers:
+            try:
+                tier.set(key, value)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Analytics cache tier {tier.name} failed: {e}")
+        return value
+
+    def stats(self) -> dict:
+        hits = sum(self.hits.values())
+        lookups = hits + self.misses
+        return {
+            "tiers": [tier.name for tier in self.tiers],
+            "entries": len(self.tiers[0]) if self.tiers and isinstance(self.tiers[0], LRUTier) else None,
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+
+def default_tiers() -> List[CacheTier]:
+    tiers: List[CacheTier] = [LRUTier()]
+    if ANALYTICS_CACHE_REDIS_URL:
+        tiers.append(RedisTier(ANALYTICS_CACHE_REDIS_URL))
+    return tiers
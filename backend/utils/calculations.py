@@ -1,7 +1,11 @@
-from typing import List, Dict, Tuple
+from dataclasses import dataclass
+import warnings
+from typing import Iterable, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import numpy as np
 from models.gold_price import GoldPrice, ProfitAnalysis, ComparisonResult
+from utils.indicators import momentum, returns, rolling_mean, rolling_std, rolling_support_resistance, rsi
+from utils.price_archive import archived_months, archived_platforms, read_series
 
 def calculate_total_cost(price: GoldPrice, weight_grams: float) -> float:
     """
@@ -80,6 +84,47 @@ def calculate_best_deal(prices: List[GoldPrice], weight_grams: float) -> List[Co
     
     return sorted_results
 
+def calculate_cost_matrix(
+    prices: List[GoldPrice],
+    weights: List[float],
+    gst_rates: Optional[List[Optional[float]]] = None,
+    making_charge_factors: Optional[List[float]] = None
+) -> np.ndarray:
+    """
+    Calculate total costs for every scenario, weight and platform at once.
+    
+    Scenario s overrides every platform's GST with gst_rates[s] (None keeps
+    the platform's own) and scales its making charges by
+    making_charge_factors[s]. Returns an array of shape
+    (scenarios, weights, platforms); with no scenarios there is one, the
+    prices as scraped.
+    """
+    if gst_rates and making_charge_factors and len(gst_rates) != len(making_charge_factors):
+        raise ValueError("gst_rates and making_charge_factors must describe the same scenarios")
+    scenarios = max(len(gst_rates or []), len(making_charge_factors or []), 1)
+    gst_rates = gst_rates or [None] * scenarios
+    making_charge_factors = making_charge_factors or [1.0] * scenarios
+    
+    price_per_gram = np.array([p.price_per_gram for p in prices], dtype=np.float64)
+    making_charges = np.array([p.making_charges for p in prices], dtype=np.float64)
+    platform_gst = np.array([p.gst for p in prices], dtype=np.float64)
+    
+    # (scenarios, 1, platforms) per-gram cost and GST multiplier
+    per_gram = price_per_gram + np.outer(making_charge_factors, making_charges)
+    gst = np.array([platform_gst if rate is None else np.full_like(platform_gst, rate) for rate in gst_rates])
+    per_gram_with_gst = (per_gram * (1 + gst / 100))[:, np.newaxis, :]
+    
+    return per_gram_with_gst * np.asarray(weights, dtype=np.float64)[np.newaxis, :, np.newaxis]
+
+def rank_cost_matrix(costs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Order platforms by cost along the last axis of ``costs``.
+    Returns (order, savings_vs_highest), both shaped like ``costs``.
+    """
+    order = np.argsort(costs, axis=-1, kind="stable")
+    savings = costs.max(axis=-1, keepdims=True) - costs
+    return order, savings
+
 def calculate_compound_growth(
     initial_price: float,
     final_price: float,
@@ -94,6 +139,19 @@ def calculate_compound_growth(
     cagr = ((final_price / initial_price) ** (1 / years)) - 1
     return round(cagr * 100, 2)
 
+def _round_cents(values: np.ndarray, exact) -> List[float]:
+    """
+    Round vectorized results to 2 decimals. Values within float error of a
+    half-cent tie round either way depending on summation order, so those
+    few are recomputed with ``exact(i)`` the way the original loops did.
+    """
+    scaled = values * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    rounded = np.round(values, 2).tolist()
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(exact(i), 2)
+    return rounded
+
 def calculate_volatility(prices: List[float]) -> float:
     """
     Calculate price volatility (standard deviation of returns)
@@ -101,14 +159,18 @@ def calculate_volatility(prices: List[float]) -> float:
     if len(prices) < 2:
         return 0.0
     
-    returns = []
-    for i in range(1, len(prices)):
-        return_rate = (prices[i] - prices[i-1]) / prices[i-1]
-        returns.append(return_rate)
-    
-    volatility = np.std(returns) * 100  # Convert to percentage
+    volatility = np.std(returns(prices)) * 100  # Convert to percentage
     return round(volatility, 2)
 
+def calculate_rolling_volatility(prices: List[float], window: int = 20) -> List[float]:
+    """
+    Calculate volatility over each trailing window of returns
+    """
+    if len(prices) < window + 1:
+        return []
+    
+    return np.round(rolling_std(returns(prices), window) * 100, 2).tolist()
+
 def calculate_moving_average(prices: List[float], window: int) -> List[float]:
     """
     Calculate moving average for given window
@@ -116,54 +178,35 @@ def calculate_moving_average(prices: List[float], window: int) -> List[float]:
     if len(prices) < window:
         return prices
     
-    moving_averages = []
-    for i in range(len(prices)):
-        if i < window - 1:
-            moving_averages.append(prices[i])
-        else:
-            avg = sum(prices[i-window+1:i+1]) / window
-            moving_averages.append(round(avg, 2))
+    def exact(i):
+        return sum(prices[i:i + window]) / window
     
-    return moving_averages
+    # The first window - 1 points have no full window and keep their price
+    return list(prices[:window - 1]) + _round_cents(rolling_mean(prices, window), exact)
 
-def calculate_rsi(prices: List[float], period: int = 14) -> List[float]:
+def calculate_rsi(prices: List[float], period: int = 14, smoothing: str = "simple") -> List[float]:
     """
-    Calculate Relative Strength Index (RSI)
+    Calculate Relative Strength Index (RSI) with simple or Wilder smoothing
     """
     if len(prices) < period + 1:
         return [50.0] * len(prices)  # Neutral RSI
     
-    gains = []
-    losses = []
-    
-    # Calculate gains and losses
-    for i in range(1, len(prices)):
-        change = prices[i] - prices[i-1]
-        if change > 0:
-            gains.append(change)
-            losses.append(0)
-        else:
-            gains.append(0)
-            losses.append(abs(change))
-    
-    rsi_values = []
-    
-    for i in range(len(gains)):
-        if i < period - 1:
-            rsi_values.append(50.0)  # Neutral RSI for insufficient data
-        else:
-            avg_gain = sum(gains[i-period+1:i+1]) / period
-            avg_loss = sum(losses[i-period+1:i+1]) / period
-            
-            if avg_loss == 0:
-                rsi = 100.0
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-            
-            rsi_values.append(round(rsi, 2))
-    
-    return rsi_values
+    values = rsi(prices, period, smoothing)
+    if smoothing == "simple":
+        changes = np.diff(np.asarray(prices, dtype=np.float64)).tolist()
+        
+        def exact(i):
+            window = changes[i:i + period]
+            avg_gain = sum(c for c in window if c > 0) / period
+            avg_loss = sum(-c for c in window if c <= 0) / period
+            return 100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss))
+        
+        rounded = _round_cents(values, exact)
+    else:
+        rounded = np.round(values, 2).tolist()
+    
+    # Neutral RSI for insufficient data
+    return [50.0] * (period - 1) + rounded
 
 def calculate_support_resistance(prices: List[float], window: int = 20) -> Tuple[float, float]:
     """
@@ -172,11 +215,21 @@ def calculate_support_resistance(prices: List[float], window: int = 20) -> Tuple
     if len(prices) < window:
         return min(prices), max(prices)
     
-    recent_prices = prices[-window:]
-    support = min(recent_prices)
-    resistance = max(recent_prices)
+    recent_prices = np.asarray(prices[-window:], dtype=np.float64)
+    support = recent_prices.min()
+    resistance = recent_prices.max()
+    
+    return round(float(support), 2), round(float(resistance), 2)
+
+def calculate_rolling_support_resistance(prices: List[float], window: int = 20) -> Tuple[List[float], List[float]]:
+    """
+    Calculate support and resistance levels for each trailing window
+    """
+    if len(prices) < window:
+        return [], []
     
-    return round(support, 2), round(resistance, 2)
+    support, resistance = rolling_support_resistance(prices, window)
+    return np.round(support, 2).tolist(), np.round(resistance, 2).tolist()
 
 def calculate_price_momentum(prices: List[float], period: int = 10) -> float:
     """
@@ -191,6 +244,15 @@ def calculate_price_momentum(prices: List[float], period: int = 10) -> float:
     momentum = ((current_price - past_price) / past_price) * 100
     return round(momentum, 2)
 
+def calculate_momentum_series(prices: List[float], period: int = 10) -> List[float]:
+    """
+    Calculate price momentum at every point with a full period behind it
+    """
+    if len(prices) < period + 1:
+        return []
+    
+    return np.round(momentum(prices, period), 2).tolist()
+
 def calculate_investment_score(
     price: GoldPrice,
     weight_grams: float,
@@ -263,4 +325,115 @@ def calculate_diversification_score(selected_platforms: List[str]) -> float:
     deviation = abs(digital_ratio - ideal_digital) + abs(physical_ratio - ideal_physical)
     diversification_score = max(0, 100 - (deviation * 100))
     
-    return round(diversification_score, 2)
\ No newline at end of file
+    return round(diversification_score, 2)
+
+def load_price_history(
+    platforms: Iterable[str],
+    start: datetime,
+    end: datetime,
+    root: Optional[str] = None
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Load archived (timestamps, prices) per platform for [start, end).
+    The arrays are memory-mapped views of the archive files.
+    """
+    return read_series(platforms, start, end, root=root)
+
+@dataclass
+class PriceBucket:
+    """OHLC bucket rebuilt from archived prices, shaped like a price rollup"""
+    bucket_start: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    mean: float
+
+def bucket_price_series(timestamps: np.ndarray, prices: np.ndarray, starts: np.ndarray, step: timedelta) -> Dict[str, np.ndarray]:
+    """
+    OHLC and time-weighted mean of a change-point series per bucket.
+
+    Each price holds until the next change, so a bucket without changes
+    still gets the price in force. ``starts`` are datetime64[us] bucket
+    starts; buckets before the first change are NaN.
+    """
+    nan = np.full(len(starts), np.nan)
+    if len(prices) == 0:
+        return {"open": nan, "high": nan, "low": nan, "close": nan, "mean": nan}
+    ts = timestamps.astype("datetime64[us]").astype(np.int64) / 1e6
+    edges = starts.astype("datetime64[us]").astype(np.int64) / 1e6
+    ends = edges + step.total_seconds()
+
+    # Last change at or before each bucket start, and before each bucket end
+    in_force = np.searchsorted(ts, edges, side="right") - 1
+    last = np.searchsorted(ts, ends, side="left") - 1
+    valid = last >= 0
+    opens = np.where(valid, prices[np.clip(in_force, 0, None)], np.nan)
+    closes = np.where(valid, prices[np.clip(last, 0, None)], np.nan)
+
+    highs, lows = opens.copy(), opens.copy()
+    bucket_of = np.searchsorted(ends, ts, side="right")
+    inside = (bucket_of < len(starts)) & (ts >= edges[np.clip(bucket_of, 0, len(starts) - 1)])
+    np.fmax.at(highs, bucket_of[inside], prices[inside])
+    np.fmin.at(lows, bucket_of[inside], prices[inside])
+
+    # Integral of the step function up to each change, then up to any time t
+    integral = np.concatenate(([0.0], np.cumsum(prices[:-1] * np.diff(ts))))
+
+    def integrate(t):
+        k = np.clip(np.searchsorted(ts, t, side="right") - 1, 0, None)
+        return integral[k] + prices[k] * (t - ts[k])
+
+    lower = np.maximum(edges, ts[0])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(valid, (integrate(ends) - integrate(lower)) / (ends - lower), np.nan)
+    return {"open": opens, "high": highs, "low": lows, "close": closes, "mean": means}
+
+def load_archived_buckets(
+    platform: Optional[str],
+    start: datetime,
+    end: datetime,
+    step: timedelta = timedelta(hours=1),
+    root: Optional[str] = None
+) -> List[PriceBucket]:
+    """
+    Price buckets of ``step`` in [start, end) rebuilt from the columnar archive,
+    for history past rollup retention. ``platform`` None averages every
+    archived platform, like the "all" rollups. Buckets without any price in
+    force are left out.
+    """
+    months = archived_months(root=root)
+    if not months or end <= start:
+        return []
+    platforms = [platform] if platform else archived_platforms(root=root)
+    # Read from the first archived month so the price in force at ``start`` is known
+    series = load_price_history(platforms, min(datetime.strptime(months[0], "%Y-%m"), start), end, root)
+
+    count = int((end - start) / step)
+    starts = np.datetime64(start, "us") + np.arange(count) * np.timedelta64(int(step.total_seconds() * 1e6), "us")
+    columns = [bucket_price_series(ts, prices, starts, step) for ts, prices in series.values()]
+    if not columns:
+        return []
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        # All-NaN buckets (no platform priced yet) are dropped below
+        warnings.simplefilter("ignore", RuntimeWarning)
+        combined = {
+            "open": np.nanmean([c["open"] for c in columns], axis=0),
+            "high": np.nanmax([c["high"] for c in columns], axis=0),
+            "low": np.nanmin([c["low"] for c in columns], axis=0),
+            "close": np.nanmean([c["close"] for c in columns], axis=0),
+            "mean": np.nanmean([c["mean"] for c in columns], axis=0),
+        }
+
+    return [
+        PriceBucket(
+            bucket_start=starts[i].item(),
+            open=float(combined["open"][i]),
+            high=float(combined["high"][i]),
+            low=float(combined["low"][i]),
+            close=float(combined["close"][i]),
+            mean=float(combined["mean"][i]),
+        )
+        for i in np.flatnonzero(~np.isnan(combined["mean"]))
+    ]
+
@@ -0,0 +1,65 @@
+from typing import List, Sequence
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of at most ``threshold`` points that keep the visual
+    shape of the series: the first and last points, plus from each bucket
+    the point forming the largest triangle with the previously selected
+    point and the average of the next bucket.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    selected = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            avg_x, avg_y = xs[n - 1], ys[n - 1]
+        else:
+            count = next_end - next_start
+            avg_x = sum(xs[next_start:next_end]) / count
+            avg_y = sum(ys[next_start:next_end]) / count
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+
+    selected.append(n - 1)
+    return selected
+
+
+def min_max(ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    Min/max bucketing: keep the lowest and highest point of each bucket, in
+    order, so spikes survive downsampling. Returns at most ``threshold`` indices.
+    """
+    n = len(ys)
+    if threshold >= n or threshold < 2:
+        return list(range(n))
+
+    buckets = threshold // 2
+    bucket_size = n / buckets
+    selected = []
+    for i in range(buckets):
+        start, end = int(i * bucket_size), int((i + 1) * bucket_size)
+        if start >= end:
+            continue
+        low = min(range(start, end), key=ys.__getitem__)
+        high = max(range(start, end), key=ys.__getitem__)
+        selected.extend(sorted({low, high}))
+    return selected
@@ -0,0 +1,48 @@
+import hashlib
+import os
+from typing import Optional
+
+from fastapi import Response
+
+# Cache-Control policy per endpoint. Prices move with every snapshot, so
+# clients revalidate them quickly; hourly history changes far less often.
+GOLD_PRICES_CACHE_CONTROL = os.getenv("GOLD_PRICES_CACHE_CONTROL", "public, max-age=15, must-revalidate")
+COMPARE_CACHE_CONTROL = os.getenv("COMPARE_CACHE_CONTROL", "public, max-age=15, must-revalidate")
+HISTORY_CACHE_CONTROL = os.getenv("HISTORY_CACHE_CONTROL", "public, max-age=300, stale-while-revalidate=600")
+# Responses that must never be reused, e.g. forced re-scrapes
+NO_STORE = "no-store"
+
+
+def make_etag(*parts) -> str:
+    """
+    Strong ETag for the representation identified by ``parts``: the data
+    version it was built from plus every request parameter that shapes it.
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:24]}"'
+
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag hashing the response body itself"""
+    return f'"{hashlib.sha1(body).hexdigest()[:24]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches ``etag`` (weak comparison, as RFC 9110 specifies for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def set_validators(response: Response, etag: str, cache_control: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Empty 304 response carrying the validators a cache needs to refresh its copy"""
+    response = Response(status_code=304)
+    set_validators(response, etag, cache_control)
+    return response
@@ -0,0 +1,109 @@
+import numpy as np
+
+# Block length of the exponential smoothing recurrence; keeps the per-block
+# growth factor (1 - alpha) ** -block far away from overflow
+_EWM_BLOCK = 256
+# Points per cumulative sum in rolling windows; restarting the sum keeps its
+# magnitude, and so its rounding error, small on long series
+_ROLLING_BLOCK = 1 << 16
+
+
+def _rolling(values: np.ndarray, window: int, func) -> np.ndarray:
+    """Apply ``func`` to overlapping blocks, each yielding one value per full window"""
+    out = np.empty(len(values) - window + 1)
+    for start in range(0, len(out), _ROLLING_BLOCK):
+        out[start:start + _ROLLING_BLOCK] = func(values[start:start + _ROLLING_BLOCK + window - 1])
+    return out
+
+
+def rolling_mean(prices, window: int) -> np.ndarray:
+    """
+    Trailing mean over ``window`` points for every index >= window - 1,
+    from cumulative sums. Returns len(prices) - window + 1 values.
+    """
+    def means(segment):
+        # Centre on the first value so the running sum stays small
+        base = segment[0]
+        sums = np.cumsum(np.concatenate(([0.0], segment - base)))
+        return (sums[window:] - sums[:-window]) / window + base
+
+    return _rolling(np.asarray(prices, dtype=np.float64), window, means)
+
+
+def rolling_std(values, window: int) -> np.ndarray:
+    """Trailing population standard deviation over ``window`` points"""
+    def stds(segment):
+        shifted = segment - segment.mean()
+        sums = np.cumsum(np.concatenate(([0.0], shifted)))
+        squares = np.cumsum(np.concatenate(([0.0], shifted * shifted)))
+        mean = (sums[window:] - sums[:-window]) / window
+        variance = (squares[window:] - squares[:-window]) / window - mean * mean
+        return np.sqrt(np.maximum(variance, 0.0))
+
+    return _rolling(np.asarray(values, dtype=np.float64), window, stds)
+
+
+def returns(prices) -> np.ndarray:
+    """Simple returns between consecutive prices"""
+    values = np.asarray(prices, dtype=np.float64)
+    return (values[1:] - values[:-1]) / values[:-1]
+
+
+def wilder_smooth(values, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing of ``values[period - 1:]``: seeded with the mean of
+    the first ``period`` values, then avg = (avg * (period - 1) + x) / period.
+
+    The recurrence is solved in closed form one block at a time, so there is
+    a Python iteration per block rather than per value.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    decay = (period - 1) / period
+    out = np.empty(len(values) - period + 1)
+    out[0] = values[:period].mean()
+
+    rest = values[period:] / period
+    powers = decay ** -np.arange(1, _EWM_BLOCK + 1)
+    last = out[0]
+    for start in range(0, len(rest), _EWM_BLOCK):
+        block = rest[start:start + _EWM_BLOCK]
+        n = len(block)
+        # avg_k = decay^k * (last + sum_{j<=k} x_j * decay^-j)
+        smoothed = (last + np.cumsum(block * powers[:n])) / powers[:n]
+        out[1 + start:1 + start + n] = smoothed
+        last = smoothed[-1]
+    return out
+
+
+def rsi(prices, period: int = 14, smoothing: str = "simple") -> np.ndarray:
+    """
+    Relative Strength Index for each price change from index period - 1 on.
+
+    ``smoothing`` is "simple" (mean gain/loss over the last ``period``
+    changes) or "wilder" (Wilder's recursive smoothing).
+    """
+    changes = np.diff(np.asarray(prices, dtype=np.float64))
+    gains = np.where(changes > 0, changes, 0.0)
+    losses = np.where(changes > 0, 0.0, -changes)
+    if smoothing == "wilder":
+        avg_gain, avg_loss = wilder_smooth(gains, period), wilder_smooth(losses, period)
+    elif smoothing == "simple":
+        avg_gain, avg_loss = rolling_mean(gains, period), rolling_mean(losses, period)
+    else:
+        raise ValueError(f"Unknown RSI smoothing: {smoothing}")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100 - 100 / (1 + avg_gain / avg_loss)
+    return np.where(avg_loss == 0, 100.0, values)
+
+
+def momentum(prices, period: int = 10) -> np.ndarray:
+    """Percentage change over ``period`` points, for every index >= period"""
+    values = np.asarray(prices, dtype=np.float64)
+    return (values[period:] - values[:-period]) / values[:-period] * 100
+
+
+def rolling_support_resistance(prices, window: int = 20):
+    """Trailing (min, max) over ``window`` points for every index >= window - 1"""
+    windows = np.lib.stride_tricks.sliding_window_view(np.asarray(prices, dtype=np.float64), window)
+    return windows.min(axis=1), windows.max(axis=1)
@@ -0,0 +1,144 @@
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+# Root directory of the columnar price archive
+PRICE_ARCHIVE_DIR = os.getenv("PRICE_ARCHIVE_DIR", "archive")
+
+PART_PATTERN = re.compile(r"^part-(\d+)\.arrow$")
+COMPACTED_PATTERN = re.compile(r"^compacted-(\d+)\.arrow$")
+
+
+def platform_slug(platform: str) -> str:
+    """File-system safe name for a platform"""
+    return re.sub(r"[^A-Za-z0-9]+", "_", platform).strip("_").lower() or "unknown"
+
+
+def month_key(timestamp: datetime) -> str:
+    return f"{timestamp:%Y-%m}"
+
+
+def months_between(start: datetime, end: datetime) -> List[str]:
+    """YYYY-MM keys of every month overlapping [start, end)"""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) < (end.year, end.month) or (
+        (year, month) == (end.year, end.month) and end > datetime(end.year, end.month, 1)
+    ):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = year + month // 12, month % 12 + 1
+    return months
+
+
+def partition_dir(root: str, table: str, month: str, platform: str) -> str:
+    return os.path.join(root, table, f"month={month}", f"platform={platform_slug(platform)}")
+
+
+def write_arrow(path: str, table: pa.Table):
+    """Write ``table`` as an uncompressed Arrow IPC file, atomically"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def open_arrow(path: str) -> pa.Table:
+    """Memory-map an Arrow IPC file; column buffers point into the mapping, nothing is copied"""
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+def partition_files(directory: str) -> List[str]:
+    """
+    Files currently holding a partition's rows.
+
+    A ``compacted-N.arrow`` file replaces every part whose first id is <= N,
+    so parts left behind by an interrupted compaction are never read twice.
+    """
+    if not os.path.isdir(directory):
+        return []
+    compacted = []
+    parts = []
+    for name in os.listdir(directory):
+        match = COMPACTED_PATTERN.match(name)
+        if match:
+            compacted.append((int(match.group(1)), name))
+            continue
+        match = PART_PATTERN.match(name)
+        if match:
+            parts.append((int(match.group(1)), name))
+
+    covered = -1
+    files = []
+    if compacted:
+        covered, name = max(compacted)
+        files.append(name)
+    files.extend(name for first_id, name in sorted(parts) if first_id > covered)
+    return [os.path.join(directory, name) for name in files]
+
+
+def archived_months(table: str = "gold_prices", root: Optional[str] = None) -> List[str]:
+    """YYYY-MM keys of every archived month, oldest first"""
+    table_dir = os.path.join(root or PRICE_ARCHIVE_DIR, table)
+    if not os.path.isdir(table_dir):
+        return []
+    return sorted(name[len("month="):] for name in os.listdir(table_dir) if name.startswith("month="))
+
+
+def archived_platforms(table: str = "gold_prices", root: Optional[str] = None) -> List[str]:
+    """Slugs of every platform with archived rows; read_series accepts them as platform names"""
+    table_dir = os.path.join(root or PRICE_ARCHIVE_DIR, table)
+    platforms = set()
+    for month in archived_months(table, root):
+        for name in os.listdir(os.path.join(table_dir, f"month={month}")):
+            if name.startswith("platform="):
+                platforms.add(name[len("platform="):])
+    return sorted(platforms)
+
+
+def read_series(
+    platforms: Iterable[str],
+    start: datetime,
+    end: datetime,
+    value: str = "price_per_gram",
+    table: str = "gold_prices",
+    root: Optional[str] = None,
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Load (timestamps, values) NumPy arrays per platform for [start, end).
+
+    Each archive file is memory-mapped and viewed as NumPy without copying;
+    a series spanning several files is joined with one concatenation.
+    Timestamps are datetime64[us] and sorted.
+    """
+    root = root or PRICE_ARCHIVE_DIR
+    lower, upper = np.datetime64(start, "us"), np.datetime64(end, "us")
+    series = {}
+    for platform in platforms:
+        timestamps, values = [], []
+        for month in months_between(start, end):
+            for path in partition_files(partition_dir(root, table, month, platform)):
+                data = open_arrow(path)
+                ts = data.column("timestamp").combine_chunks().to_numpy(zero_copy_only=True)
+                vs = data.column(value).combine_chunks().to_numpy(zero_copy_only=True)
+                # Files are written sorted by timestamp, so the range is a slice (a view)
+                lo, hi = np.searchsorted(ts, lower), np.searchsorted(ts, upper)
+                timestamps.append(ts[lo:hi])
+                values.append(vs[lo:hi])
+
+        if not timestamps:
+            series[platform] = (np.array([], dtype="datetime64[us]"), np.array([], dtype=np.float64))
+        elif len(timestamps) == 1:
+            series[platform] = (timestamps[0], values[0])
+        else:
+            ts, vs = np.concatenate(timestamps), np.concatenate(values)
+            if np.any(ts[1:] < ts[:-1]):
+                order = np.argsort(ts, kind="stable")
+                ts, vs = ts[order], vs[order]
+            series[platform] = (ts, vs)
+    return series
@@ -0,0 +1,206 @@
+import os
+import threading
+import time
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from models.gold_price import GoldPrice
+
+logger = logging.getLogger(__name__)
+
+# Seconds a snapshot is served as fresh before a background refresh is triggered
+PRICE_CACHE_TTL = float(os.getenv("PRICE_CACHE_TTL", "60"))
+# Extra seconds a stale snapshot may still be served while it is being refreshed
+PRICE_CACHE_MAX_STALE = float(os.getenv("PRICE_CACHE_MAX_STALE", "600"))
+# Seconds a computed historical series is reused
+HISTORY_CACHE_TTL = float(os.getenv("HISTORY_CACHE_TTL", "60"))
+
+
+@dataclass
+class PriceSnapshot:
+    """Immutable view of the latest scraped prices"""
+    version: int
+    prices: List[GoldPrice]
+    created_at: float = field(default_factory=time.monotonic)
+    fetched_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+
+class PriceSnapshotCache:
+    """
+    In-process snapshot cache with TTL and stale-while-revalidate.
+
+    Requests are always answered from the current snapshot. Once it is older
+    than ``ttl`` a single background refresh is started and the stale snapshot
+    keeps being served until the new one is swapped in. Only a cold cache, or
+    a snapshot older than ``ttl + max_stale``, makes the caller wait.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], List[GoldPrice]],
+        ttl: float = PRICE_CACHE_TTL,
+        max_stale: float = PRICE_CACHE_MAX_STALE,
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._snapshot: Optional[PriceSnapshot] = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+        self._listeners: List[Callable[[PriceSnapshot], None]] = []
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def subscribe(self, listener: Callable[[PriceSnapshot], None]):
+        """Register a callback invoked with every newly published snapshot"""
+        self._listeners.append(listener)
+
+    def get(self) -> PriceSnapshot:
+        """Return the current snapshot, refreshing it if needed"""
+        snapshot = self._snapshot
+
+        if snapshot is None:
+            with self._lock:
+                self.misses += 1
+            return self.refresh()
+
+        age = snapshot.age
+        if age <= self.ttl:
+            with self._lock:
+                self.hits += 1
+            return snapshot
+
+        if age > self.ttl + self.max_stale:
+            with self._lock:
+                self.misses += 1
+            return self.refresh()
+
+        with self._lock:
+            self.stale_hits += 1
+        self._refresh_in_background()
+        return snapshot
+
+    def refresh(self) -> PriceSnapshot:
+        """Load new prices synchronously and publish them as a new snapshot"""
+        current = self._snapshot
+        with self._load_lock:
+            # Another caller may have refreshed while we were waiting
+            if self._snapshot is not current and self._snapshot.age <= self.ttl:
+                return self._snapshot
+            prices = self.loader()
+            return self.publish(prices)
+
+    def publish(self, prices: List[GoldPrice]) -> PriceSnapshot:
+        """Install ``prices`` as the current snapshot under a new version"""
+        with self._lock:
+            self._version += 1
+            snapshot = PriceSnapshot(version=self._version, prices=list(prices))
+            self._snapshot = snapshot
+            self.refreshes += 1
+
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"Snapshot listener failed: {e}")
+
+        return snapshot
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                with self._lock:
+                    self.refresh_errors += 1
+                logger.error(f"Background price refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="price-cache-refresh", daemon=True).start()
+
+    def stats(self) -> dict:
+        """Counters and snapshot metadata for observability"""
+        snapshot = self._snapshot
+        return {
+            "version": self._version,
+            "age_seconds": round(snapshot.age, 3) if snapshot else None,
+            "fetched_at": snapshot.fetched_at.isoformat() if snapshot else None,
+            "platforms": len(snapshot.prices) if snapshot else 0,
+            "ttl_seconds": self.ttl,
+            "max_stale_seconds": self.max_stale,
+            "refreshing": self._refreshing,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+class ResultCache:
+    """
+    Small TTL cache for computed responses keyed by their request parameters.
+
+    Concurrent misses for the same key may each compute the value; the last
+    one wins. The oldest entry is evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, ttl: float = HISTORY_CACHE_TTL, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, calling ``loader`` if it is missing or expired"""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+            with self._lock:
+                self.hits += 1
+            return entry[1]
+
+        value = loader()
+        with self._lock:
+            self.misses += 1
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key] = (time.monotonic(), value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
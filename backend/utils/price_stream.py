@@ -0,0 +1,193 @@
+import asyncio
+import json
+import os
+import threading
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+
+from models.gold_price import GoldPriceResponse
+from utils.price_cache import PRICE_CACHE_TTL, PriceSnapshot
+
+# Seconds between keep-alive comments on an idle stream
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+# Snapshot versions kept for resuming; older clients get a full snapshot
+STREAM_HISTORY = int(os.getenv("STREAM_HISTORY", "256"))
+
+HEARTBEAT = ": heartbeat\n\n"
+
+
+@dataclass
+class StreamEvent:
+    """Changes published under one snapshot version, pre-rendered once for every subscriber"""
+    version: int
+    payload: Optional[str]  # None when no platform changed
+
+
+def sse_message(event: str, event_id: str, data: dict) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def price_key(price: dict) -> Tuple:
+    """Fields whose change is worth pushing; the scrape timestamp alone is not"""
+    return price["type"], price["price_per_gram"], price["making_charges"], price["gst"]
+
+
+class PriceBroadcaster:
+    """
+    Fans price snapshot changes out to any number of SSE subscribers.
+
+    Each published snapshot is diffed against the previous one and the
+    changed platforms are rendered to a single SSE message. Subscribers
+    share one wake-up event per loop and copy already rendered messages,
+    so a publish costs the same whether 10 or 10,000 clients listen.
+
+    Event ids are ``<stream_id>:<version>``. Snapshot versions are per
+    process and restart at 1, so an id from before a restart or from
+    another worker carries a different stream id and gets a full snapshot
+    instead of deltas against a state the client never had.
+    """
+
+    def __init__(
+        self,
+        refresh: Optional[Callable[[], object]] = None,
+        refresh_interval: float = PRICE_CACHE_TTL,
+        heartbeat: float = STREAM_HEARTBEAT_SECONDS,
+        history: int = STREAM_HISTORY,
+        stream_id: Optional[str] = None,
+    ):
+        self.stream_id = stream_id or uuid.uuid4().hex[:12]
+        self.refresh = refresh
+        self.refresh_interval = refresh_interval
+        self.heartbeat = heartbeat
+        self._events: Deque[StreamEvent] = deque(maxlen=history)
+        self._prices: Dict[str, dict] = {}
+        self._version = 0
+        self._snapshot_message: Optional[Tuple[int, str]] = None
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self.subscribers = 0
+        self.published = 0
+        self.snapshots_sent = 0
+        self.resumes = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def event_id(self, version: int) -> str:
+        return f"{self.stream_id}:{version}"
+
+    def parse_event_id(self, event_id: Optional[str]) -> Optional[int]:
+        """Version a client last saw, or None when the id is missing or from another stream"""
+        if not event_id:
+            return None
+        stream_id, _, version = event_id.rpartition(":")
+        if stream_id != self.stream_id or not version.isdigit():
+            return None
+        return int(version)
+
+    def publish(self, snapshot: PriceSnapshot):
+        """Snapshot cache listener; may be called from any thread"""
+        prices = {p.platform: GoldPriceResponse.from_gold_price(p).model_dump() for p in snapshot.prices}
+        with self._lock:
+            changed = [
+                price for platform, price in prices.items()
+                if platform not in self._prices or price_key(self._prices[platform]) != price_key(price)
+            ]
+            removed = [platform for platform in self._prices if platform not in prices]
+            payload = None
+            if changed or removed:
+                payload = sse_message("prices", self.event_id(snapshot.version),
+                                      {"version": snapshot.version, "changed": changed, "removed": removed})
+            self._events.append(StreamEvent(snapshot.version, payload))
+            self._prices = prices
+            self._version = snapshot.version
+            self.published += 1
+            loop = self._loop
+
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        if wakeup is not None:
+            wakeup.set()
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            if self.refresh is not None:
+                loop.create_task(self._refresh_periodically())
+
+    async def _refresh_periodically(self):
+        # Keep snapshots coming while clients stream instead of polling
+        loop = asyncio.get_running_loop()
+        while self._loop is loop:
+            await asyncio.sleep(self.refresh_interval)
+            if self.subscribers:
+                try:
+                    await loop.run_in_executor(None, self.refresh)
+                except Exception:
+                    pass
+
+    def catch_up(self, since: Optional[int]) -> Tuple[int, str]:
+        """
+        Messages taking a client from version ``since`` to the current one:
+        the missed change events when they are still kept, otherwise a full
+        snapshot. Returns (current version, messages).
+        """
+        with self._lock:
+            version = self._version
+            if since is not None and since == version:
+                return version, ""
+
+            oldest = self._events[0].version - 1 if self._events else version
+            if since is not None and oldest <= since < version:
+                self.resumes += 1
+                return version, "".join(e.payload for e in self._events if e.version > since and e.payload)
+
+            if version == 0:
+                return version, ""
+            if self._snapshot_message is None or self._snapshot_message[0] != version:
+                data = {"version": version, "prices": list(self._prices.values())}
+                self._snapshot_message = (version, sse_message("snapshot", self.event_id(version), data))
+            self.snapshots_sent += 1
+            return version, self._snapshot_message[1]
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        """SSE messages for one subscriber, starting after event id ``last_event_id``"""
+        self._bind_loop()
+        self.subscribers += 1
+        try:
+            version = self.parse_event_id(last_event_id)
+            while True:
+                # Take the wake-up event before catching up so no publish is missed
+                wakeup = self._wakeup
+                version, messages = self.catch_up(version)
+                if messages:
+                    yield messages
+                    continue
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+        finally:
+            self.subscribers -= 1
+
+    def stats(self) -> dict:
+        return {
+            "stream_id": self.stream_id,
+            "version": self._version,
+            "subscribers": self.subscribers,
+            "published": self.published,
+            "snapshots_sent": self.snapshots_sent,
+            "resumes": self.resumes,
+            "history": len(self._events),
+            "heartbeat_seconds": self.heartbeat,
+        }
@@ -0,0 +1,75 @@
+from typing import Dict, List
+
+from models.gold_price import ComparisonResult, GoldPrice
+from utils.calculations import calculate_total_cost
+
+GOLD_TYPES = ("both", "physical", "digital")
+
+
+def unit_cost(price: GoldPrice) -> float:
+    """Cost of one gram including making charges and GST"""
+    return (price.price_per_gram + price.making_charges) * (1 + price.gst / 100)
+
+
+class RankingIndex:
+    """
+    Best-deal orderings of one price snapshot, per gold type.
+
+    Total cost is linear in weight (weight x unit cost), so one ordering per
+    gold type is valid for every weight and no per-weight buckets are needed;
+    lookups only price each platform at the requested weight. Built once per
+    snapshot version.
+    """
+
+    def __init__(self, version: int, prices: List[GoldPrice]):
+        self.version = version
+        self._orders: Dict[str, List[GoldPrice]] = {}
+        for gold_type in GOLD_TYPES:
+            self._orders[gold_type] = sorted(
+                (p for p in prices if gold_type == "both" or p.type == gold_type),
+                key=unit_cost
+            )
+
+    def _order(self, gold_type: str) -> List[GoldPrice]:
+        # An unknown gold type matches no platform, as filter_prices does
+        return self._orders.get(gold_type, [])
+
+    def compare(self, gold_type: str, weight: float) -> List[dict]:
+        """Platforms for ``gold_type`` ordered by total cost at ``weight``, cheapest first"""
+        ranked = self._order(gold_type)
+        totals = [calculate_total_cost(price, weight) for price in ranked]
+        highest_total = totals[-1] if totals else 0.0
+        return [
+            {
+                "platform": price.platform,
+                "type": price.type,
+                "price_per_gram": price.price_per_gram,
+                "making_charges": price.making_charges,
+                "gst": price.gst,
+                "total_cost": cost,
+                "features": price.features,
+                "rank": rank,
+                "savings_vs_highest": round(highest_total - cost, 2)
+            }
+            for rank, (price, cost) in enumerate(zip(ranked, totals), start=1)
+        ]
+
+    def best_deal(self, gold_type: str, weight: float) -> List[ComparisonResult]:
+        """Same ranking as ``calculate_best_deal``, without re-sorting"""
+        ranked = self._order(gold_type)
+        highest_total = calculate_total_cost(ranked[-1], weight) if ranked else 0.0
+        results = []
+        for rank, price in enumerate(ranked, start=1):
+            cost = calculate_total_cost(price, weight)
+            results.append(ComparisonResult(
+                platform=price.platform,
+                type=price.type,
+                price_per_gram=price.price_per_gram,
+                making_charges=price.making_charges,
+                gst=price.gst,
+                total_cost=cost,
+                features=price.features,
+                rank=rank,
+                savings_vs_highest=round(highest_total - cost, 2)
+            ))
+        return results
@@ -0,0 +1,45 @@
+from typing import Dict, List
+
+import orjson
+
+from models.gold_price import GoldPrice, GoldPriceResponse
+from utils.http_cache import content_etag
+from utils.ranking_index import GOLD_TYPES
+
+EMPTY_PAYLOAD = b"[]"
+EMPTY_ETAG = content_etag(EMPTY_PAYLOAD)
+
+
+class SnapshotPayloads:
+    """
+    ``/api/gold-prices`` response bodies of one price snapshot, one per gold
+    type filter.
+
+    Every price is converted to its response shape once and encoded with
+    orjson when the snapshot is published, so requests only pick the bytes
+    for their filter instead of validating and serializing models each time.
+    ETags hash the bytes, not the snapshot version: versions are per process
+    and restart at 1, content is the same in every worker.
+    """
+
+    def __init__(self, version: int, prices: List[GoldPrice]):
+        self.version = version
+        rows = [(price.type, GoldPriceResponse.from_gold_price(price).model_dump()) for price in prices]
+        self._payloads: Dict[str, bytes] = {
+            gold_type: orjson.dumps([row for type_, row in rows if gold_type == "both" or type_ == gold_type])
+            for gold_type in GOLD_TYPES
+        }
+        self._etags: Dict[str, str] = {gold_type: content_etag(payload) for gold_type, payload in self._payloads.items()}
+        # Identifies every price and timestamp of the snapshot
+        self.fingerprint = self._etags["both"]
+
+    def get(self, gold_type: str) -> bytes:
+        """Encoded prices for ``gold_type``; an unknown type matches nothing, as ``filter_prices`` does"""
+        return self._payloads.get(gold_type, EMPTY_PAYLOAD)
+
+    def etag(self, gold_type: str) -> str:
+        """Strong ETag of the body ``get(gold_type)`` returns"""
+        return self._etags.get(gold_type, EMPTY_ETAG)
+
+    def size(self) -> int:
+        return sum(len(payload) for payload in self._payloads.values())
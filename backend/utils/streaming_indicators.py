@@ -0,0 +1,319 @@
+import math
+from collections import deque
+from typing import Dict, Optional
+
+
+class RollingSum:
+    """
+    Sum of the last ``window`` values in O(1) per update.
+
+    The running total is rebuilt from the window every ``window`` updates so
+    floating-point error cannot accumulate over a long stream.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self._since_resync = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.window
+
+    def push(self, value: float):
+        if self.full:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self.total = math.fsum(self.values)
+            self._since_resync = 0
+
+    def to_dict(self) -> dict:
+        return {"window": self.window, "values": list(self.values)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RollingSum":
+        rolling = cls(data["window"])
+        rolling.values.extend(data["values"])
+        rolling.total = math.fsum(rolling.values)
+        return rolling
+
+
+class MovingAverage:
+    """Trailing mean of the last ``window`` prices"""
+
+    kind = "moving_average"
+
+    def __init__(self, window: int = 20):
+        self.sum = RollingSum(window)
+
+    def update(self, price: float) -> Optional[float]:
+        self.sum.push(price)
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.sum.total / self.sum.window if self.sum.full else None
+
+    def to_dict(self) -> dict:
+        return {"sum": self.sum.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MovingAverage":
+        indicator = cls(data["sum"]["window"])
+        indicator.sum = RollingSum.from_dict(data["sum"])
+        return indicator
+
+
+class RSI:
+    """
+    Relative Strength Index over ``period`` price changes, with "simple"
+    (rolling mean) or "wilder" (recursive) smoothing, matching
+    ``utils.indicators.rsi``.
+    """
+
+    kind = "rsi"
+
+    def __init__(self, period: int = 14, smoothing: str = "simple"):
+        if smoothing not in ("simple", "wilder"):
+            raise ValueError(f"Unknown RSI smoothing: {smoothing}")
+        self.period = period
+        self.smoothing = smoothing
+        self.last_price: Optional[float] = None
+        self.gains = RollingSum(period)
+        self.losses = RollingSum(period)
+        # Wilder averages, set once the first ``period`` changes are seen
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+
+    def update(self, price: float) -> Optional[float]:
+        if self.last_price is None:
+            self.last_price = price
+            return None
+        change = price - self.last_price
+        self.last_price = price
+        gain, loss = (change, 0.0) if change > 0 else (0.0, -change)
+
+        if self.smoothing == "wilder" and self.avg_gain is not None:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+            return self.value
+
+        self.gains.push(gain)
+        self.losses.push(loss)
+        if self.smoothing == "wilder" and self.gains.full:
+            self.avg_gain = self.gains.total / self.period
+            self.avg_loss = self.losses.total / self.period
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.smoothing == "wilder":
+            avg_gain, avg_loss = self.avg_gain, self.avg_loss
+        elif self.gains.full:
+            avg_gain, avg_loss = self.gains.total / self.period, self.losses.total / self.period
+        else:
+            avg_gain = avg_loss = None
+        if avg_gain is None:
+            return None
+        if avg_loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+    def to_dict(self) -> dict:
+        return {
+            "period": self.period,
+            "smoothing": self.smoothing,
+            "last_price": self.last_price,
+            "gains": self.gains.to_dict(),
+            "losses": self.losses.to_dict(),
+            "avg_gain": self.avg_gain,
+            "avg_loss": self.avg_loss,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RSI":
+        indicator = cls(data["period"], data["smoothing"])
+        indicator.last_price = data["last_price"]
+        indicator.gains = RollingSum.from_dict(data["gains"])
+        indicator.losses = RollingSum.from_dict(data["losses"])
+        indicator.avg_gain = data["avg_gain"]
+        indicator.avg_loss = data["avg_loss"]
+        return indicator
+
+
+class Volatility:
+    """Population standard deviation of the last ``window`` returns, in percent"""
+
+    kind = "volatility"
+
+    def __init__(self, window: int = 20):
+        self.window = window
+        self.last_price: Optional[float] = None
+        self.returns = RollingSum(window)
+        self.squares = RollingSum(window)
+
+    def update(self, price: float) -> Optional[float]:
+        if self.last_price is not None and self.last_price != 0:
+            r = (price - self.last_price) / self.last_price
+            self.returns.push(r)
+            self.squares.push(r * r)
+        self.last_price = price
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if not self.returns.full:
+            return None
+        mean = self.returns.total / self.window
+        variance = self.squares.total / self.window - mean * mean
+        return math.sqrt(max(variance, 0.0)) * 100
+
+    def to_dict(self) -> dict:
+        return {"window": self.window, "last_price": self.last_price, "returns": self.returns.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Volatility":
+        indicator = cls(data["window"])
+        indicator.last_price = data["last_price"]
+        for r in data["returns"]["values"]:
+            indicator.returns.push(r)
+            indicator.squares.push(r * r)
+        return indicator
+
+
+class Momentum:
+    """Percentage change over the last ``period`` prices"""
+
+    kind = "momentum"
+
+    def __init__(self, period: int = 10):
+        self.period = period
+        self.prices = deque(maxlen=period + 1)
+
+    def update(self, price: float) -> Optional[float]:
+        self.prices.append(price)
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if len(self.prices) <= self.period or self.prices[0] == 0:
+            return None
+        return (self.prices[-1] - self.prices[0]) / self.prices[0] * 100
+
+    def to_dict(self) -> dict:
+        return {"period": self.period, "prices": list(self.prices)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Momentum":
+        indicator = cls(data["period"])
+        indicator.prices.extend(data["prices"])
+        return indicator
+
+
+class SupportResistance:
+    """
+    Rolling (min, max) of the last ``window`` prices with monotonic queues,
+    amortised O(1) per update.
+    """
+
+    kind = "support_resistance"
+
+    def __init__(self, window: int = 20):
+        self.window = window
+        self.count = 0
+        # (index, price) pairs; prices increase along lows and decrease along highs
+        self.lows = deque()
+        self.highs = deque()
+
+    def update(self, price: float):
+        index = self.count
+        self.count += 1
+        while self.lows and self.lows[-1][1] >= price:
+            self.lows.pop()
+        while self.highs and self.highs[-1][1] <= price:
+            self.highs.pop()
+        self.lows.append((index, price))
+        self.highs.append((index, price))
+        oldest = index - self.window + 1
+        if self.lows[0][0] < oldest:
+            self.lows.popleft()
+        if self.highs[0][0] < oldest:
+            self.highs.popleft()
+        return self.value
+
+    @property
+    def value(self):
+        if not self.lows:
+            return None
+        return self.lows[0][1], self.highs[0][1]
+
+    def to_dict(self) -> dict:
+        return {
+            "window": self.window,
+            "count": self.count,
+            "lows": [list(pair) for pair in self.lows],
+            "highs": [list(pair) for pair in self.highs],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SupportResistance":
+        indicator = cls(data["window"])
+        indicator.count = data["count"]
+        indicator.lows.extend(tuple(pair) for pair in data["lows"])
+        indicator.highs.extend(tuple(pair) for pair in data["highs"])
+        return indicator
+
+
+INDICATOR_TYPES = {cls.kind: cls for cls in (MovingAverage, RSI, Volatility, Momentum, SupportResistance)}
+
+
+class IndicatorSet:
+    """The streaming indicators kept for one platform"""
+
+    def __init__(self, indicators: Optional[Dict[str, object]] = None, last_timestamp: Optional[str] = None):
+        self.indicators = indicators if indicators is not None else {
+            "sma_20": MovingAverage(20),
+            "rsi_14": RSI(14),
+            "rsi_14_wilder": RSI(14, "wilder"),
+            "volatility_20": Volatility(20),
+            "momentum_10": Momentum(10),
+            "support_resistance_20": SupportResistance(20),
+        }
+        # ISO timestamp of the latest price consumed; older ones are ignored
+        self.last_timestamp = last_timestamp
+
+    def update(self, price: float, timestamp: Optional[str] = None) -> bool:
+        """Feed one price to every indicator; returns False if it is not newer than the last one"""
+        if timestamp is not None and self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return False
+        for indicator in self.indicators.values():
+            indicator.update(price)
+        if timestamp is not None:
+            self.last_timestamp = timestamp
+        return True
+
+    def values(self) -> dict:
+        values = {name: indicator.value for name, indicator in self.indicators.items()}
+        values["last_timestamp"] = self.last_timestamp
+        return values
+
+    def to_dict(self) -> dict:
+        return {
+            "last_timestamp": self.last_timestamp,
+            "indicators": {
+                name: {"kind": indicator.kind, "state": indicator.to_dict()}
+                for name, indicator in self.indicators.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IndicatorSet":
+        indicators = {
+            name: INDICATOR_TYPES[entry["kind"]].from_dict(entry["state"])
+            for name, entry in data["indicators"].items()
+        }
+        return cls(indicators, data.get("last_timestamp"))
@@ -0,0 +1,118 @@
+import gzip
+import os
+from datetime import datetime
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always offered
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "6"))
+
+FORMATS = ("json", "compact")
+COMPACT_VERSION = 1
+# Compact prices are integers in 1/PRICE_SCALE rupees
+PRICE_SCALE = 100
+
+HISTORY_COLUMNS = ("price", "open", "high", "low", "close")
+COMPARISON_COLUMNS = ("platform", "type", "price_per_gram", "making_charges", "gst", "total_cost", "features",
+                      "savings_vs_highest")
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Content codings we can produce, most preferred first"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """
+    Pick the content coding for an Accept-Encoding header: the supported one
+    with the highest q-value, brotli winning ties. "identity" if none fits.
+    """
+    if not accept_encoding:
+        return "identity"
+    weights = {}
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+
+    best, best_q = "identity", 0.0
+    for coding in supported_encodings():
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> Tuple[bytes, str]:
+    """Compress ``body`` with ``encoding``; returns the bytes and the coding actually applied"""
+    if encoding == "identity" or len(body) < COMPRESS_MIN_BYTES:
+        return body, "identity"
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY), "br"
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0), "gzip"
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+
+def delta_encode(values) -> list:
+    """First value as is, then differences to the previous one"""
+    values = np.asarray(values, dtype=np.int64)
+    return np.diff(values, prepend=0).tolist()
+
+
+def quantize(values) -> np.ndarray:
+    return np.rint(np.asarray(values, dtype=np.float64) * PRICE_SCALE).astype(np.int64)
+
+
+def encode_history(payload: dict) -> dict:
+    """
+    Compact form of a /api/historical-data payload: one array per field
+    instead of a dict per point, with dates as delta-encoded epoch seconds
+    and prices as delta-encoded integers of 1/PRICE_SCALE rupees. Prices are
+    already rounded to paise, so only open/high/low/close lose precision
+    beyond it. Clients opt in with format=compact.
+    """
+    points = payload["data"]
+    dates = [int((datetime.fromisoformat(point["date"]) - EPOCH).total_seconds()) for point in points]
+    columns = {"date": delta_encode(dates)}
+    for name in HISTORY_COLUMNS:
+        columns[name] = delta_encode(quantize([point[name] for point in points]))
+    return {
+        "format": "compact",
+        "version": COMPACT_VERSION,
+        "scale": PRICE_SCALE,
+        **{key: value for key, value in payload.items() if key != "data"},
+        "columns": columns,
+    }
+
+
+def encode_comparison(payload: dict) -> dict:
+    """
+    Compact form of a /api/compare payload: one array per field in rank
+    order. Rank is the position and the best deal is the first entry, so
+    neither is sent.
+    """
+    rows = payload["comparison"]
+    return {
+        "format": "compact",
+        "version": COMPACT_VERSION,
+        "weight": payload["weight"],
+        "timestamp": payload["timestamp"],
+        "columns": {name: [row[name] for row in rows] for name in COMPARISON_COLUMNS},
+    }